@@ -0,0 +1,57 @@
+"""Client HTTP partagé pour l'API de prédiction.
+
+Une seule ``requests.Session`` par processus : les connexions (et la poignée
+de main TLS) sont réutilisées d'un appel à l'autre, chaque appel a un délai
+maximal, et les réponses 502/503/504 sont rejouées avec un recul exponentiel.
+"""
+import logging
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+API_URL = os.environ.get("API_URL", "https://ilkan77-openclassroom.hf.space/predict")
+CONNECT_TIMEOUT = float(os.environ.get("API_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.environ.get("API_READ_TIMEOUT", 30))
+MAX_RETRIES = int(os.environ.get("API_MAX_RETRIES", 3))
+BACKOFF_FACTOR = float(os.environ.get("API_BACKOFF_FACTOR", 0.5))
+POOL_MAXSIZE = int(os.environ.get("API_POOL_MAXSIZE", 16))
+RETRY_STATUSES = (502, 503, 504)
+
+
+def build_session(max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                  pool_maxsize=POOL_MAXSIZE):
+    retry = Retry(
+        total=None,
+        connect=max_retries,
+        # Un délai de lecture dépassé n'est pas rejoué : le worker resterait bloqué
+        # plusieurs fois READ_TIMEOUT
+        read=False,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        # /predict n'a pas d'effet de bord, on peut rejouer le POST
+        allowed_methods=frozenset({"POST"}),
+        # Après le dernier essai on rend la réponse, raise_for_status() lève HTTPError
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def post_prediction(session, url, payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+    # Renvoie la réponse et la latence de l'appel (retries compris), en secondes
+    start = time.perf_counter()
+    try:
+        response = session.post(url, json=payload, timeout=timeout)
+    finally:
+        latency = time.perf_counter() - start
+        logger.info("POST %s en %.0f ms", url, latency * 1000)
+    return response, latency
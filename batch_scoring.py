@@ -0,0 +1,177 @@
+"""Scoring par lot d'une liste de SK_ID_CURR contre l'API de prédiction.
+
+Les payloads sont construits à partir de l'index client (mêmes valeurs et
+mêmes imputations que le chargement par ID du dashboard), envoyés en
+parallèle avec un nombre de requêtes simultanées borné, et chaque bloc de
+résultats est ajouté à un fichier de reprise ``<sortie>.partial.csv``. En cas
+d'interruption, relancer la même commande ne rescore que les IDs manquants ou
+en erreur. Le fichier final (CSV ou Parquet selon l'extension) est écrit à la
+fin.
+
+Utilisation en ligne de commande ::
+
+    python batch_scoring.py ids.csv -o scores.parquet --workers 8
+"""
+import argparse
+import csv
+import hashlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import requests
+
+from api_client import API_URL, build_session, post_prediction
+from data_store import CACHE_DIR, ClientLookup, load_dataset
+from features import DATA_COLUMNS
+from prediction_cache import PredictionCache, is_valid_result
+
+RESULT_COLUMNS = ["SK_ID_CURR", "probability_default", "prediction_class",
+                  "optimal_threshold_used", "error"]
+DEFAULT_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 256
+BATCH_DIR = os.path.join(CACHE_DIR, "batch_scoring")
+
+
+def read_ids(source):
+    ids_df = pd.read_csv(source)
+    column = "SK_ID_CURR" if "SK_ID_CURR" in ids_df.columns else ids_df.columns[0]
+    ids = pd.to_numeric(ids_df[column], errors="coerce").dropna().astype("int64")
+    return ids.drop_duplicates().tolist()
+
+
+def batch_output_path(ids, *keys, directory=BATCH_DIR):
+    # Même liste d'IDs et mêmes clés (URL, version de la base) : même fichier, donc même
+    # fichier de reprise, là où un répertoire temporaire repartirait de zéro à chaque essai
+    digest = hashlib.sha256("\n".join([*map(str, keys), ",".join(map(str, ids))]).encode())
+    return os.path.join(directory, f"scores-{digest.hexdigest()[:16]}.csv")
+
+
+def checkpoint_path(output_path):
+    return output_path + ".partial.csv"
+
+
+def _completed_ids(checkpoint):
+    if not os.path.exists(checkpoint):
+        return set()
+    done = pd.read_csv(checkpoint, usecols=["SK_ID_CURR", "error"])
+    return set(done.loc[done["error"].isna(), "SK_ID_CURR"].astype("int64"))
+
+
+def score_payload(session, url, payload, cache):
+    result = cache.get(payload, namespace=url) if cache is not None else None
+    if result is None:
+        response, _ = post_prediction(session, url, payload)
+        response.raise_for_status()
+        result = response.json()
+        if not is_valid_result(result):
+            # Une réponse 200 sans probabilité n'est pas un succès : l'ID sera rescoré à la reprise
+            raise ValueError("Réponse de l'API sans probabilité de défaut valide")
+        if cache is not None:
+            cache.set(payload, result, namespace=url)
+    return result
+
+
+def _result_row(client_id, result=None, error=None):
+    result = result or {}
+    return {"SK_ID_CURR": client_id,
+            "probability_default": result.get("probability_default"),
+            "prediction_class": result.get("prediction_class"),
+            "optimal_threshold_used": result.get("optimal_threshold_used"),
+            "error": error}
+
+
+def finalize_output(checkpoint, output_path):
+    results = pd.read_csv(checkpoint)
+    # Un ID rescoré après une erreur apparaît deux fois : on garde le dernier essai
+    results = results.drop_duplicates(subset="SK_ID_CURR", keep="last").reset_index(drop=True)
+    if output_path.endswith(".parquet"):
+        results.to_parquet(output_path, index=False)
+    else:
+        results.to_csv(output_path, index=False)
+    os.remove(checkpoint)
+    return results
+
+
+def score_ids(ids, lookup, output_path, url=API_URL, session=None, cache=None,
+              max_workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, resume=True,
+              progress=None):
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    checkpoint = checkpoint_path(output_path)
+    if not resume and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    done = _completed_ids(checkpoint)
+    todo = [client_id for client_id in ids if client_id not in done]
+    total = len(ids)
+    completed = total - len(todo)
+    if progress is not None:
+        progress(completed, total)
+
+    if session is None:
+        session = build_session(pool_maxsize=max_workers)
+    write_header = not os.path.exists(checkpoint)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool, \
+            open(checkpoint, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        for start in range(0, len(todo), chunk_size):
+            chunk = todo[start:start + chunk_size]
+            rows = []
+            futures = {}
+            for client_id, payload in zip(chunk, lookup.get_many(chunk)):
+                if payload is None:
+                    rows.append(_result_row(client_id, error="ID client inconnu"))
+                else:
+                    futures[pool.submit(score_payload, session, url, payload, cache)] = client_id
+            for future in as_completed(futures):
+                client_id = futures[future]
+                try:
+                    rows.append(_result_row(client_id, result=future.result()))
+                # ValueError couvre aussi json.JSONDecodeError
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    rows.append(_result_row(client_id, error=str(e)))
+            writer.writerows(rows)
+            # Le bloc est sur disque avant de passer au suivant : c'est le point de reprise
+            f.flush()
+            os.fsync(f.fileno())
+            completed += len(chunk)
+            if progress is not None:
+                progress(completed, total)
+
+    return finalize_output(checkpoint, output_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score un fichier de SK_ID_CURR via l'API.")
+    parser.add_argument("ids", help="CSV contenant une colonne SK_ID_CURR (ou les IDs en 1re colonne)")
+    parser.add_argument("-o", "--output", required=True, help="Fichier de sortie (.csv ou .parquet)")
+    parser.add_argument("--data", default="application_train.csv", help="Jeu de données clients")
+    parser.add_argument("--url", default=API_URL)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore un éventuel fichier de reprise et repart de zéro")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="N'utilise pas le cache partagé des prédictions")
+    args = parser.parse_args(argv)
+
+    lookup = ClientLookup(load_dataset(args.data, DATA_COLUMNS))
+    ids = read_ids(args.ids)
+
+    def report(done, total):
+        print(f"\r{done}/{total} clients scorés", end="", file=sys.stderr, flush=True)
+
+    cache = None if args.no_cache else PredictionCache()
+    results = score_ids(ids, lookup, args.output, url=args.url, cache=cache,
+                        max_workers=args.workers,
+                        chunk_size=args.chunk_size, resume=not args.no_resume, progress=report)
+    print(file=sys.stderr)
+    n_errors = int(results["error"].notna().sum())
+    print(f"{len(results)} résultats écrits dans {args.output} ({n_errors} en erreur).")
+    return 1 if n_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""Banc de mesure hors ligne du dashboard.
+
+* ``bench.stub_server`` : faux serveur ``/predict`` à latence réglable ;
+* ``bench.synthetic_data`` : base clients synthétique au schéma
+  d'``application_train.csv`` ;
+* ``bench.run`` : scénarios de reruns via ``AppTest`` et sessions
+  concurrentes, avec rapport de latence, de temps de chargement et de mémoire.
+"""
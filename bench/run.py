@@ -0,0 +1,310 @@
+"""Scénarios de mesure du dashboard, sans réseau ni données réelles.
+
+Pour chaque taille de base demandée, un processus séparé (mémoire et caches
+Streamlit vierges) :
+
+1. génère une base synthétique et démarre le faux serveur ``/predict`` ;
+2. mesure le premier affichage puis le temps de chargement complet de la base
+   (à froid : conversion Parquet comprise, puis à chaud depuis le cache) ;
+3. rejoue via ``AppTest`` des reruns complets du script : rerun à vide, calcul
+   du score, chargement par ID, changement d'histogramme, changement d'axe
+   bi-varié ;
+4. lance plusieurs sessions ``AppTest`` en parallèle pour estimer le débit
+   sous charge.
+
+``AppTest`` réexécute toujours le script entier : pour les widgets placés
+dans un fragment, les temps mesurés sont donc un majorant.
+
+Utilisation ::
+
+    python -m bench.run --rows 10000 100000 --reruns 20 --sessions 4 \\
+        --report bench_report.json --max-p95-ms 1500
+
+Avec ``--max-p95-ms``, le code de sortie vaut 1 si une interaction dépasse le
+seuil au 95e percentile, ce qui permet de bloquer une version en CI.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(REPO_ROOT, "streamlit_app.py")
+# Nom du fichier lu par le dashboard, relatif au répertoire courant
+DATA_FILE = "application_train.csv"
+
+DEFAULT_ROWS = (10000, 100000)
+DEFAULT_RERUNS = 20
+DEFAULT_SESSIONS = 4
+DEFAULT_SESSION_RERUNS = 10
+DEFAULT_LATENCY_MS = 50.0
+LOAD_TIMEOUT = 900
+
+
+def latency_stats(samples_ms):
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if len(samples) == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"count": int(len(samples)), "mean_ms": float(samples.mean()), "p50_ms": float(p50),
+            "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(samples.max())}
+
+
+def peak_rss_mb():
+    # ru_maxrss est en kilo-octets sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"Exception dans le dashboard : {at.exception[0].value}")
+    return elapsed_ms
+
+
+def _dataset_loading(at):
+    return any("Chargement de la base clients" in info.value for info in at.info)
+
+
+def wait_for_dataset(at, timeout=LOAD_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while _dataset_loading(at):
+        if time.monotonic() > deadline:
+            raise TimeoutError("La base clients n'est pas chargée dans le délai imparti")
+        time.sleep(0.2)
+        at.run()
+
+
+def _widget(widgets, label_part):
+    return next(w for w in widgets if label_part in str(w.label))
+
+
+# Interactions rejouées : chacune modifie l'état puis déclenche un rerun complet
+def interact_rerun(at, i):
+    return _timed_run(at)
+
+
+def interact_submit(at, i):
+    # Un montant différent à chaque fois pour ne pas être servi par le cache des prédictions
+    _widget(at.number_input, "Montant du crédit").set_value(200000.0 + 1000 * i)
+    _widget(at.button, "Calculer").click()
+    return _timed_run(at)
+
+
+def interact_load_by_id(at, i, client_ids):
+    client_id = int(client_ids[(i * 7919) % len(client_ids)])
+    _widget(at.sidebar.number_input, "ID Client").set_value(client_id)
+    _widget(at.sidebar.button, "Charger données client").click()
+    return _timed_run(at)
+
+
+def interact_histogram(at, i):
+    selectbox = _widget(at.selectbox, "Histogramme")
+    selectbox.set_value(selectbox.options[i % len(selectbox.options)])
+    return _timed_run(at)
+
+
+def interact_bivariate(at, i):
+    selectbox = _widget(at.selectbox, "Axe X")
+    selectbox.set_value(selectbox.options[(i * 3) % len(selectbox.options)])
+    return _timed_run(at)
+
+
+def _new_app():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP_SCRIPT, default_timeout=LOAD_TIMEOUT)
+
+
+def _session_workload(n_reruns, session_index):
+    # Une session « chargé de clientèle » : score, puis exploration des graphiques
+    at = _new_app()
+    timings = [_timed_run(at)]
+    timings.append(interact_submit(at, session_index))
+    steps = (interact_histogram, interact_bivariate, interact_rerun)
+    for i in range(n_reruns):
+        timings.append(steps[i % len(steps)](at, session_index * n_reruns + i))
+    return timings
+
+
+def run_concurrent_sessions(n_sessions, n_reruns):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions, thread_name_prefix="bench-session") as pool:
+        futures = [pool.submit(_session_workload, n_reruns, s) for s in range(n_sessions)]
+        timings = [t for future in futures for t in future.result()]
+    wall = time.perf_counter() - start
+    return {"sessions": n_sessions, "reruns": len(timings), "wall_s": wall,
+            "reruns_per_s": len(timings) / wall, "latency": latency_stats(timings)}
+
+
+def run_scenario(n_rows, n_reruns=DEFAULT_RERUNS, n_sessions=DEFAULT_SESSIONS,
+                 session_reruns=DEFAULT_SESSION_RERUNS, latency_ms=DEFAULT_LATENCY_MS,
+                 api_url=None, seed=0):
+    from bench.stub_server import StubPredictionServer
+    from bench.synthetic_data import generate_application_data
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.chdir(workdir)
+    os.environ["DASHBOARD_CACHE_DIR"] = os.path.join(workdir, ".cache")
+    os.environ["PREDICTION_CACHE_PATH"] = os.path.join(workdir, "predictions.sqlite3")
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    start = time.perf_counter()
+    df = generate_application_data(n_rows, seed=seed)
+    df.to_csv(DATA_FILE, index=False)
+    # Le formulaire ne sait pas afficher une profession manquante (remplacée par "XNA") :
+    # le chargement par ID est mesuré sur les clients dont la profession est renseignée
+    client_ids = df.loc[df["OCCUPATION_TYPE"].notna(), "SK_ID_CURR"].to_numpy()
+    del df
+    result = {"rows": n_rows, "generate_s": time.perf_counter() - start,
+              "csv_mb": os.path.getsize(DATA_FILE) / 2 ** 20}
+
+    stub = None
+    if api_url is None:
+        stub = StubPredictionServer(latency_ms=latency_ms, jitter_ms=latency_ms / 5, seed=seed)
+        api_url = stub.start().url
+    # Lu par api_client à l'import, donc avant le premier run du script
+    os.environ["API_URL"] = api_url
+    rss_before = peak_rss_mb()
+
+    at = _new_app()
+    result["first_paint_ms"] = _timed_run(at)
+    start = time.perf_counter()
+    wait_for_dataset(at)
+    result["cold_load_s"] = time.perf_counter() - start
+
+    from dataset import Dataset
+    from dtype_plan import memory_report
+    start = time.perf_counter()
+    warm = Dataset.load(DATA_FILE)
+    result["warm_load_s"] = time.perf_counter() - start
+    result["df_full_mb"] = float(memory_report(warm.df_full)["bytes"].sum() / 2 ** 20)
+    del warm
+
+    interact_submit(at, -1)
+    interactions = {
+        "rerun": interact_rerun,
+        "submit": interact_submit,
+        "load_by_id": lambda at, i: interact_load_by_id(at, i, client_ids),
+        "histogram": interact_histogram,
+        "bivariate": interact_bivariate,
+    }
+    result["interactions"] = {}
+    for name, interact in interactions.items():
+        result["interactions"][name] = latency_stats(
+            [interact(at, i) for i in range(n_reruns)])
+
+    if n_sessions:
+        result["concurrent"] = run_concurrent_sessions(n_sessions, session_reruns)
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["rss_growth_mb"] = result["peak_rss_mb"] - rss_before
+    if stub is not None:
+        result["api_requests"] = stub.request_count
+        stub.stop()
+    return result
+
+
+def _run_in_subprocess(n_rows, args):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+    command = [sys.executable, "-m", "bench.run", "--single", str(n_rows),
+               "--result", result_path, "--reruns", str(args.reruns),
+               "--sessions", str(args.sessions), "--session-reruns", str(args.session_reruns),
+               "--latency-ms", str(args.latency_ms), "--seed", str(args.seed)]
+    if args.api_url:
+        command += ["--api-url", args.api_url]
+    try:
+        subprocess.run(command, cwd=REPO_ROOT, check=True)
+        with open(result_path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+
+
+def format_report(results):
+    lines = []
+    for result in results:
+        lines.append(f"\n=== {result['rows']} lignes ({result['csv_mb']:.0f} Mo de CSV) ===")
+        lines.append(f"premier affichage  {result['first_paint_ms']:8.0f} ms")
+        lines.append(f"chargement à froid {result['cold_load_s']:8.2f} s   "
+                     f"à chaud {result['warm_load_s']:.2f} s")
+        lines.append(f"df_full            {result['df_full_mb']:8.1f} Mo   "
+                     f"pic RSS {result['peak_rss_mb']:.0f} Mo")
+        lines.append(f"{'interaction':<18} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+        for name, stats in result["interactions"].items():
+            lines.append(f"{name:<18} {stats['p50_ms']:8.0f} {stats['p95_ms']:8.0f} "
+                         f"{stats['p99_ms']:8.0f} {stats['max_ms']:8.0f}")
+        concurrent = result.get("concurrent")
+        if concurrent:
+            stats = concurrent["latency"]
+            lines.append(f"{concurrent['sessions']} sessions       {stats['p50_ms']:8.0f} "
+                         f"{stats['p95_ms']:8.0f} {stats['p99_ms']:8.0f} {stats['max_ms']:8.0f}"
+                         f"  -> {concurrent['reruns_per_s']:.1f} reruns/s")
+    return "\n".join(lines)
+
+
+def slow_interactions(results, max_p95_ms):
+    slow = []
+    for result in results:
+        for name, stats in result["interactions"].items():
+            if stats["p95_ms"] > max_p95_ms:
+                slow.append((result["rows"], name, stats["p95_ms"]))
+        concurrent = result.get("concurrent")
+        if concurrent and concurrent["latency"]["p95_ms"] > max_p95_ms:
+            slow.append((result["rows"], "concurrent", concurrent["latency"]["p95_ms"]))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance du dashboard.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                        help="Tailles de base à tester (un scénario par taille)")
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS,
+                        help="Répétitions de chaque interaction")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help="Sessions simultanées pour le test de charge (0 pour l'ignorer)")
+    parser.add_argument("--session-reruns", type=int, default=DEFAULT_SESSION_RERUNS)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                        help="Latence moyenne du faux serveur /predict")
+    parser.add_argument("--api-url", help="Utilise ce serveur au lieu du faux serveur intégré")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="Écrit les résultats détaillés dans ce fichier JSON")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Échoue si une interaction dépasse ce p95")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        result = run_scenario(args.single, args.reruns, args.sessions, args.session_reruns,
+                              args.latency_ms, args.api_url, args.seed)
+        with open(args.result, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return 0
+
+    results = [_run_in_subprocess(n_rows, args) for n_rows in args.rows]
+    print(format_report(results))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version,
+                       "scenarios": results}, f, indent=2)
+    if args.max_p95_ms is not None:
+        slow = slow_interactions(results, args.max_p95_ms)
+        for n_rows, name, p95 in slow:
+            print(f"ÉCHEC : {name} ({n_rows} lignes) p95 = {p95:.0f} ms > {args.max_p95_ms:.0f} ms",
+                  file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Faux serveur de prédiction pour les mesures hors ligne.
+
+Il répond sur ``POST /predict`` avec le même format que l'API réelle
+(``probability_default``, ``prediction_class``, ``optimal_threshold_used``,
+``shap_values``, ``shap_expected_value``). La probabilité est une fonction
+déterministe du payload : le même client obtient toujours le même score. La
+latence simulée suit une loi normale tronquée (moyenne et écart-type réglables)
+et une fraction des requêtes peut répondre 503 pour exercer les reprises.
+
+Utilisation ::
+
+    python -m bench.stub_server --port 8000 --latency-ms 80 --jitter-ms 20
+    API_URL=http://127.0.0.1:8000/predict streamlit run streamlit_app.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OPTIMAL_THRESHOLD = 0.35
+SHAP_EXPECTED_VALUE = -2.4
+MAX_PAYLOAD_BYTES = 1 << 20
+
+
+def _unit_hash(text):
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big") / 2 ** 64
+
+
+def fake_prediction(payload, threshold=OPTIMAL_THRESHOLD):
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    probability = round(0.02 + 0.9 * _unit_hash(canonical) ** 2, 6)
+    shap_values = {}
+    for feature, value in payload.items():
+        if feature == "SK_ID_CURR" or isinstance(value, str):
+            continue
+        # Contribution signée, stable pour un couple (variable, valeur)
+        shap_values[feature] = round((_unit_hash(f"{feature}={value}") - 0.5) * 0.4, 6)
+    return {"probability_default": probability,
+            "prediction_class": int(probability >= threshold),
+            "optimal_threshold_used": threshold,
+            "shap_values": shap_values,
+            "shap_expected_value": SHAP_EXPECTED_VALUE}
+
+
+class StubPredictionServer:
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/predict"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/predict":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                if length > MAX_PAYLOAD_BYTES:
+                    self.send_error(413)
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(length))
+                except json.JSONDecodeError:
+                    self.send_error(400, "JSON invalide")
+                    return
+                delay, fail = stub._draw()
+                time.sleep(delay)
+                if fail:
+                    self.send_error(503, "Service indisponible (simulé)")
+                    return
+                self._send_json(fake_prediction(payload))
+
+            def _send_json(self, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _draw(self):
+        with self._lock:
+            self.request_count += 1
+            delay = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            fail = self._random.random() < self.error_rate
+        return delay, fail
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="stub-predict-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Faux serveur /predict à latence réglable.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction des requêtes qui répondent 503")
+    args = parser.parse_args(argv)
+    server = StubPredictionServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                                  args.error_rate)
+    print(f"Serveur de test sur {server.url} (Ctrl+C pour arrêter)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Base clients synthétique au schéma d'``application_train.csv``.
+
+Seules les colonnes lues par le dashboard (``features.DATA_COLUMNS``) plus
+``TARGET`` sont générées, avec des distributions et des taux de valeurs
+manquantes proches de la base réelle : montants log-normaux, scores externes
+dans [0, 1], jours négatifs, 18 % de « sans emploi » (365243), moyennes
+d'indicateurs one-hot majoritairement nulles. Les valeurs restent dans les
+bornes des champs du formulaire, pour que le chargement par ID fonctionne. La
+génération est déterministe pour une graine donnée.
+
+Utilisation ::
+
+    python -m bench.synthetic_data 300000 -o application_train.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from features import DATA_COLUMNS
+
+CATEGORIES = {
+    "CODE_GENDER": (["F", "M", "XNA"], [0.658, 0.342, 0.00001]),
+    "NAME_EDUCATION_TYPE": (["Secondary / secondary special", "Higher education",
+                             "Incomplete higher", "Lower secondary", "Academic degree"],
+                            [0.710, 0.243, 0.033, 0.012, 0.002]),
+    "NAME_FAMILY_STATUS": (["Married", "Single / not married", "Civil marriage", "Separated",
+                            "Widow"], [0.639, 0.148, 0.097, 0.064, 0.052]),
+    "FLAG_OWN_CAR": (["N", "Y"], [0.66, 0.34]),
+    "FLAG_OWN_REALTY": (["Y", "N"], [0.694, 0.306]),
+    "OCCUPATION_TYPE": (["Laborers", "Sales staff", "Core staff", "Managers", "Drivers",
+                         "High skill tech staff", "Accountants", "Medicine staff",
+                         "Security staff", "Cooking staff", None],
+                        [0.179, 0.104, 0.090, 0.069, 0.060, 0.037, 0.032, 0.028, 0.022,
+                         0.019, 0.360]),
+    "NAME_CONTRACT_TYPE": (["Cash loans", "Revolving loans"], [0.905, 0.095]),
+    "NAME_TYPE_SUITE": (["Unaccompanied", "Family", "Spouse, partner", "Children", None],
+                        [0.808, 0.130, 0.037, 0.021, 0.004]),
+    "NAME_INCOME_TYPE": (["Working", "Commercial associate", "Pensioner", "State servant"],
+                         [0.516, 0.233, 0.180, 0.071]),
+    "NAME_HOUSING_TYPE": (["House / apartment", "With parents", "Municipal apartment",
+                           "Rented apartment", "Office apartment"],
+                          [0.888, 0.048, 0.036, 0.016, 0.012]),
+    "WEEKDAY_APPR_PROCESS_START": (["TUESDAY", "WEDNESDAY", "MONDAY", "THURSDAY", "FRIDAY",
+                                    "SATURDAY", "SUNDAY"],
+                                   [0.175, 0.169, 0.165, 0.164, 0.164, 0.110, 0.053]),
+    "ORGANIZATION_TYPE": (["Business Entity Type 3", "XNA", "Self-employed", "Other",
+                           "Medicine", "Government", "School", "Trade: type 7"],
+                          [0.290, 0.180, 0.160, 0.070, 0.050, 0.060, 0.040, 0.150]),
+    "FONDKAPREMONT_MODE": (["reg oper account", "reg oper spec account", "not specified",
+                            "org spec account", None], [0.240, 0.039, 0.019, 0.018, 0.684]),
+    "HOUSETYPE_MODE": (["block of flats", "specific housing", "terraced house", None],
+                       [0.490, 0.005, 0.004, 0.501]),
+    "WALLSMATERIAL_MODE": (["Panel", "Stone, brick", "Block", "Wooden", None],
+                           [0.215, 0.211, 0.030, 0.017, 0.527]),
+    "EMERGENCYSTATE_MODE": (["No", "Yes", None], [0.518, 0.008, 0.474]),
+}
+DAYS_EMPLOYED_UNEMPLOYED = 365243
+
+
+def _with_missing(rng, values, rate):
+    if rate:
+        values = values.astype(np.float64)
+        values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def _categorical(rng, n_rows, column):
+    labels, weights = CATEGORIES[column]
+    weights = np.asarray(weights) / np.sum(weights)
+    return np.asarray(labels, dtype=object)[rng.choice(len(labels), n_rows, p=weights)]
+
+
+def _aggregate(rng, n_rows, column):
+    # Colonnes agrégées des tables secondaires (préfixe SK_ID_CURR_)
+    missing_rate = 0.15
+    if column.endswith(("_mean", "_mean_x", "_mean_y")) \
+            and not any(tag in column for tag in ("AMT_", "CNT_", "DPD", "DBD", "RATE_")):
+        # Moyenne d'un indicateur one-hot : le plus souvent 0
+        values = np.where(rng.random(n_rows) < 0.85, 0.0, rng.random(n_rows).round(4))
+    elif "AMT_" in column:
+        values = rng.lognormal(11, 1.2, n_rows).round(2)
+        if column.endswith("_sum") and "DEBT" in column:
+            values[rng.random(n_rows) < 0.5] = 0.0
+    elif "DAYS_" in column or "MONTHS_" in column:
+        scale = 30 if "MONTHS_" in column else 3000
+        values = -rng.integers(0, scale, n_rows).astype(np.float64)
+        if "ENDDATE" in column:
+            values = values + rng.integers(0, 2 * scale, n_rows)
+    elif "DPD" in column or "DBD" in column:
+        values = np.where(rng.random(n_rows) < 0.9, 0.0, rng.exponential(10, n_rows).round())
+    elif "RATE_" in column:
+        values = rng.uniform(0.03, 0.9, n_rows).round(6)
+        missing_rate = 0.99
+    else:
+        values = np.minimum(rng.gamma(2.0, 6.0, n_rows).round(2), 100.0)
+    return _with_missing(rng, values, missing_rate)
+
+
+def _column(rng, n_rows, column):
+    if column in CATEGORIES:
+        return _categorical(rng, n_rows, column)
+    if column.startswith("SK_ID_CURR_"):
+        return _aggregate(rng, n_rows, column)
+    if column.startswith("EXT_SOURCE_"):
+        rate = {"EXT_SOURCE_1": 0.56, "EXT_SOURCE_2": 0.002, "EXT_SOURCE_3": 0.20}[column]
+        return _with_missing(rng, rng.beta(4, 3, n_rows).round(6), rate)
+    if column == "AMT_INCOME_TOTAL":
+        return np.minimum(rng.lognormal(11.9, 0.5, n_rows).round(-2), 4.5e6)
+    if column == "AMT_CREDIT":
+        return np.minimum(rng.lognormal(13.2, 0.65, n_rows).round(1), 4.05e6)
+    if column == "AMT_ANNUITY":
+        annuity = np.minimum(rng.lognormal(10.0, 0.5, n_rows).round(1), 2e5)
+        return _with_missing(rng, annuity, 0.00004)
+    if column == "DAYS_BIRTH":
+        return -rng.integers(7489, 25229, n_rows)
+    if column == "DAYS_EMPLOYED":
+        days = -np.minimum(rng.gamma(1.3, 1800, n_rows), 17912).astype(np.int64)
+        return np.where(rng.random(n_rows) < 0.18, DAYS_EMPLOYED_UNEMPLOYED, days)
+    if column == "DAYS_ID_PUBLISH":
+        return -rng.integers(1, 7198, n_rows)
+    if column == "CNT_CHILDREN":
+        return rng.choice(5, n_rows, p=[0.70, 0.20, 0.087, 0.012, 0.001])
+    if column == "HOUR_APPR_PROCESS_START":
+        return np.clip(rng.normal(12, 3.3, n_rows).round(), 0, 23).astype(np.int64)
+    if column == "REGION_POPULATION_RELATIVE":
+        return rng.choice([0.00029, 0.0035, 0.010006, 0.018801, 0.025164, 0.035792, 0.072508],
+                          n_rows).astype(np.float64)
+    if column.startswith("REGION_RATING_CLIENT"):
+        return rng.choice([1, 2, 3], n_rows, p=[0.10, 0.74, 0.16])
+    if column == "YEARS_BEGINEXPLUATATION_AVG":
+        return _with_missing(rng, rng.beta(40, 1.5, n_rows).round(4), 0.49)
+    return _with_missing(rng, rng.random(n_rows), 0.1)
+
+
+def generate_application_data(n_rows, seed=0, first_id=100002):
+    rng = np.random.default_rng(seed)
+    data = {"SK_ID_CURR": np.arange(first_id, first_id + n_rows),
+            "TARGET": (rng.random(n_rows) < 0.081).astype(np.int64)}
+    for column in DATA_COLUMNS:
+        if column not in data:
+            data[column] = _column(rng, n_rows, column)
+    return pd.DataFrame(data)
+
+
+def write_application_csv(path, n_rows, seed=0):
+    generate_application_data(n_rows, seed=seed).to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère une base clients synthétique.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("-o", "--output", default="application_train.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_application_csv(args.output, args.rows, seed=args.seed)
+    print(f"{args.rows} lignes écrites dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Cache colonnaire (Parquet) de application_train.csv.
+
+Le CSV est converti une seule fois en Parquet typé selon le plan de types de
+``dtype_plan`` (numériques réduits, chaînes en catégories). Le dashboard ne
+relit ensuite que les colonnes dont il a besoin. Le cache est reconstruit dès
+que la somme de contrôle du CSV change.
+
+Avec ``DASHBOARD_DATA_BACKEND=mmap``, la base prête à l'emploi (colonnes
+dérivées comprises) est en plus écrite une fois dans un fichier Arrow IPC non
+compressé, que chaque processus projette en mémoire : les colonnes numériques
+de ``df_full`` sont des vues sur ce fichier, sans copie, et leurs pages sont
+partagées par tous les processus Streamlit du nœud via le cache du système.
+Placer ``DASHBOARD_CACHE_DIR`` sur ``/dev/shm`` revient à un segment de
+mémoire partagée.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from derived_features import add_derived_features
+from dtype_plan import apply_dtype_plan, log_memory_report
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow absent : on retombe sur une lecture CSV projetée
+    pa = pq = None
+
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", ".cache")
+# "memory" : copie privée par processus ; "mmap" : fichier Arrow partagé entre processus
+DATA_BACKEND = os.environ.get("DASHBOARD_DATA_BACKEND", "memory")
+CHECKSUM_CHUNK_SIZE = 1 << 20
+
+
+def file_checksum(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(csv_path):
+    base = os.path.splitext(os.path.basename(csv_path))[0]
+    return (os.path.join(CACHE_DIR, f"{base}.parquet"),
+            os.path.join(CACHE_DIR, f"{base}.meta.json"))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _unique_tmp_path(path):
+    # Un fichier temporaire par écrivain : des processus qui construisent le même cache
+    # en même temps n'écrivent pas dans le même fichier, le dernier renommage l'emporte
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def _replace_from_tmp(path, write):
+    tmp_path = _unique_tmp_path(path)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    _replace_from_tmp(meta_path, write)
+
+
+def convert_csv_to_parquet(csv_path, parquet_path):
+    df = apply_dtype_plan(pd.read_csv(csv_path, low_memory=False), allow_sparse=False)
+    # Écriture dans un fichier temporaire puis renommage : un lecteur concurrent
+    # ne voit jamais un Parquet à moitié écrit
+    _replace_from_tmp(parquet_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+
+def ensure_columnar_cache(csv_path):
+    stat = os.stat(csv_path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    parquet_path, meta_path = _cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+
+    if os.path.exists(parquet_path) and meta:
+        # Taille et date identiques : inutile de relire les 166 Mo pour le hash
+        if meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+            return parquet_path
+        checksum = file_checksum(csv_path)
+        if meta.get("sha256") == checksum:
+            meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            _write_meta(meta_path, meta)
+            return parquet_path
+    else:
+        checksum = file_checksum(csv_path)
+
+    convert_csv_to_parquet(csv_path, parquet_path)
+    _write_meta(meta_path, {"sha256": checksum, "size": stat.st_size,
+                            "mtime_ns": stat.st_mtime_ns})
+    return parquet_path
+
+
+def dataset_version(csv_path):
+    # Somme de contrôle du CSV, lue dans les métadonnées du cache quand il est à jour
+    if pq is not None:
+        ensure_columnar_cache(csv_path)
+        sha256 = _read_meta(_cache_paths(csv_path)[1]).get("sha256")
+        if sha256:
+            return sha256
+    return file_checksum(csv_path)
+
+
+def read_projected(csv_path, columns):
+    wanted = list(dict.fromkeys(columns))
+    if pq is None:
+        wanted_set = set(wanted)
+        return apply_dtype_plan(pd.read_csv(csv_path, usecols=lambda c: c in wanted_set,
+                                            low_memory=False), allow_sparse=False)
+
+    parquet_path = ensure_columnar_cache(csv_path)
+    available = set(pq.read_schema(parquet_path).names)
+    return pd.read_parquet(parquet_path, columns=[c for c in wanted if c in available])
+
+
+def _mapped_path(csv_path, columns):
+    base = os.path.splitext(os.path.basename(csv_path))[0]
+    fingerprint = hashlib.sha256("\n".join(columns).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{base}-{dataset_version(csv_path)[:16]}-{fingerprint}.arrow")
+
+
+def write_mapped_frame(df, path):
+    # Les NaN restent des NaN (et non des valeurs nulles Arrow) : la relecture
+    # peut alors exposer les tableaux du fichier tels quels
+    arrays = [pa.array(df[col].array if isinstance(df[col].dtype, pd.CategoricalDtype)
+                       else df[col].to_numpy(), from_pandas=False)
+              for col in df.columns]
+    table = pa.Table.from_arrays(arrays, names=list(df.columns))
+
+    def write(tmp_path):
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    # Plusieurs processus peuvent construire le même fichier au démarrage : chacun écrit
+    # le sien, le renommage atomique ne publie qu'un fichier complet
+    _replace_from_tmp(path, write)
+
+
+def read_mapped_frame(path):
+    # Colonnes numériques : vues en lecture seule sur le fichier projeté
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _remove_stale_mapped_files(path):
+    # Anciennes versions de la base : un processus qui les projette encore garde
+    # ses pages jusqu'à la fermeture, la suppression ne libère que le nom
+    directory, name = os.path.split(path)
+    base, _, fingerprint = name[:-len(".arrow")].rsplit("-", 2)
+    for other in os.listdir(directory or "."):
+        if (other != name and other.startswith(base + "-")
+                and other.endswith(f"-{fingerprint}.arrow")):
+            try:
+                os.remove(os.path.join(directory, other))
+            except OSError:
+                pass
+
+
+def load_dataset(file_path, columns, backend=None):
+    backend = DATA_BACKEND if backend is None else backend
+    if backend == "mmap" and pa is not None:
+        path = _mapped_path(file_path, list(dict.fromkeys(columns)))
+        if not os.path.exists(path):
+            # Pas de stockage sparse ici : il imposerait une copie privée par processus
+            df = apply_dtype_plan(add_derived_features(read_projected(file_path, columns)),
+                                  allow_sparse=False)
+            write_mapped_frame(df, path)
+            _remove_stale_mapped_files(path)
+        df = read_mapped_frame(path)
+    else:
+        df = add_derived_features(read_projected(file_path, columns))
+        # Le Parquet est déjà typé ; restent les colonnes dérivées et le stockage sparse
+        df = apply_dtype_plan(df)
+    log_memory_report(df, "Base clients chargée")
+    return df
+
+
+# Valeurs de remplacement des NaN pour les colonnes texte/catégorielles
+CATEGORICAL_NA_DEFAULTS = {"CODE_GENDER": "XNA", "OCCUPATION_TYPE": "XNA"}
+DEFAULT_CATEGORICAL_NA = "Unknown"
+
+
+def _python_scalar(value):
+    # Un float32 est rendu par son écriture décimale la plus courte (0.5069 et non
+    # 0.5069000124...), pour envoyer à l'API les valeurs telles qu'elles sont dans le CSV
+    if isinstance(value, np.float32):
+        return float(str(value))
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _python_values(values):
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64).tolist()
+    return values.tolist()
+
+
+class ClientLookup:
+    """Accès direct à la ligne d'un client par SK_ID_CURR.
+
+    Les identifiants sont triés une seule fois (recherche par ``searchsorted``).
+    Les colonnes numériques sont gardées telles quelles (pas de copie de la
+    base, qui peut être projetée en mémoire) et leurs NaN sont remplacés par 0
+    au moment de la lecture, sur les seules lignes demandées.
+    """
+
+    def __init__(self, df, id_column="SK_ID_CURR"):
+        if id_column in df.columns:
+            ids = df[id_column].to_numpy(dtype=np.int64)
+        else:  # jeu de données absent : index vide
+            ids = np.empty(0, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[order]
+        self._row_positions = order
+        self._numeric = {}
+        self._with_nans = set()
+        self._categorical = {}
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+                if isinstance(series.dtype, pd.SparseDtype):
+                    # Les colonnes sparse restent sparse : pas de copie dense de la base
+                    self._numeric[col] = series.fillna(0).array
+                else:
+                    self._numeric[col] = series.to_numpy()
+                    if series.hasnans:
+                        self._with_nans.add(col)
+            else:
+                default = CATEGORICAL_NA_DEFAULTS.get(col, DEFAULT_CATEGORICAL_NA)
+                cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+                if cat.hasnans:
+                    if default not in cat.cat.categories:
+                        cat = cat.cat.add_categories([default])
+                    cat = cat.fillna(default)
+                self._categorical[col] = (cat.cat.codes.to_numpy(),
+                                          cat.cat.categories.to_numpy(dtype=object))
+        self._columns = list(df.columns)
+
+    def __len__(self):
+        return len(self._sorted_ids)
+
+    def __contains__(self, client_id):
+        return self._locate(client_id) is not None
+
+    def _locate(self, client_id):
+        pos = np.searchsorted(self._sorted_ids, client_id)
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == client_id:
+            return self._row_positions[pos]
+        return None
+
+    def row_of(self, client_id):
+        # Position du client dans le DataFrame indexé (None si inconnu)
+        row = self._locate(client_id)
+        return None if row is None else int(row)
+
+    def get(self, client_id):
+        row = self._locate(client_id)
+        if row is None:
+            return None
+        record = {}
+        for col in self._columns:
+            if col in self._numeric:
+                value = self._numeric[col][row]
+                if col in self._with_nans and np.isnan(value):
+                    value = type(value)(0)
+                record[col] = _python_scalar(value)
+            else:
+                codes, categories = self._categorical[col]
+                record[col] = categories[codes[row]]
+        return record
+
+    def get_many(self, client_ids):
+        # Version vectorisée de get() : une liste de dicts (None pour un ID inconnu)
+        ids = np.asarray(client_ids, dtype=np.int64)
+        if len(self._sorted_ids) == 0:
+            return [None] * len(ids)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        found = self._sorted_ids[pos] == ids
+        rows = self._row_positions[pos[found]]
+
+        column_values = []
+        for col in self._columns:
+            if col in self._numeric:
+                values = self._numeric[col][rows]
+                if col in self._with_nans:
+                    values = np.where(np.isnan(values), values.dtype.type(0), values)
+                column_values.append(_python_values(values))
+            else:
+                codes, categories = self._categorical[col]
+                column_values.append(categories[codes[rows]].tolist())
+        records = (dict(zip(self._columns, values)) for values in zip(*column_values))
+        return [next(records) if is_found else None for is_found in found]
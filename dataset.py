@@ -0,0 +1,186 @@
+"""Jeu de données du dashboard et structures calculées une fois au chargement.
+
+Le chargement complet (lecture, colonnes dérivées, index client, index de
+percentiles, index des clients similaires, résumés de distribution,
+échantillon de référence) peut tourner dans un thread en arrière-plan :
+l'interface et le formulaire de scoring n'en dépendent pas et s'affichent
+immédiatement.
+
+``DatasetManager`` surveille ensuite le CSV (taille et date, puis somme de
+contrôle) et construit en arrière-plan la nouvelle version quand il change.
+Seules les structures dont les colonnes sources ont changé sont recalculées ;
+les autres sont reprises de la version précédente. La nouvelle version
+remplace l'ancienne d'un seul coup : un rerun déjà commencé garde la version
+qu'il a lue, les suivants voient la nouvelle, sans redémarrage.
+"""
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_store import ClientLookup, dataset_version, load_dataset
+from features import DATA_COLUMNS, FEATURE_DESCRIPTIONS
+from percentile_index import PercentileIndex
+from population_stats import compute_distribution_summaries
+from similar_clients import SimilarClientsIndex
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+REF_SAMPLE_SIZE = 1000
+# Intervalle de surveillance du CSV en secondes (0 : pas de rechargement à chaud)
+RELOAD_INTERVAL = float(os.environ.get("DASHBOARD_RELOAD_INTERVAL", 30))
+
+
+def column_fingerprint(series):
+    # Empreinte du contenu d'une colonne (valeurs et ordre des lignes)
+    digest = hashlib.blake2b(str(series.dtype).encode(), digest_size=16)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        digest.update(np.ascontiguousarray(series.cat.codes.to_numpy()).data)
+        digest.update("\x00".join(map(str, series.cat.categories)).encode())
+    else:
+        digest.update(np.ascontiguousarray(series.to_numpy()).data)
+    return digest.hexdigest()
+
+
+class Dataset:
+
+    def __init__(self, df_full, version=None, previous=None):
+        self.df_full = df_full
+        self.version = version
+        with span("dataset.fingerprint", rows=len(df_full)):
+            self.fingerprints = {col: column_fingerprint(df_full[col]) for col in df_full.columns}
+        unchanged = set() if previous is None else {
+            col for col, fingerprint in self.fingerprints.items()
+            if previous.fingerprints.get(col) == fingerprint}
+
+        self.client_lookup = ClientLookup(df_full)
+        self.percentile_index = PercentileIndex(df_full, reuse=None if previous is None else {
+            col: percentiles for col, percentiles in previous.percentile_index.columns.items()
+            if col in unchanged})
+        summary_features = [col for col in df_full.columns
+                            if col in FEATURE_DESCRIPTIONS or col == "_EMPLOYED_YEARS_CAT"]
+        self.distribution_summaries = {} if previous is None else {
+            feature: summary for feature, summary in previous.distribution_summaries.items()
+            if feature in unchanged and feature in summary_features}
+        self.distribution_summaries.update(compute_distribution_summaries(
+            df_full, [f for f in summary_features if f not in self.distribution_summaries]))
+        relevant_cols_for_sample = list(FEATURE_DESCRIPTIONS.keys()) + ['_EMPLOYED_YEARS_CAT']
+        ref_columns = df_full.columns.intersection(relevant_cols_for_sample)
+        if (previous is not None and set(ref_columns) <= unchanged
+                and list(previous.df_ref.columns) == list(ref_columns)):
+            self.df_ref = previous.df_ref
+        else:
+            self.df_ref = df_full[ref_columns].sample(min(REF_SAMPLE_SIZE, len(df_full)),
+                                                      random_state=42)
+        self.similar_clients = None
+        if len(df_full):
+            previous_index = None if previous is None else previous.similar_clients
+            if previous_index is not None and self._index_unchanged(previous_index, unchanged):
+                self.similar_clients = previous_index
+            else:
+                with span("similar_clients.index"):
+                    self.similar_clients = SimilarClientsIndex.load_or_build(df_full, version)
+
+    @staticmethod
+    def _index_unchanged(index, unchanged):
+        encoder = index.encoder
+        sources = ["SK_ID_CURR"] + encoder.numeric_features + encoder.categorical_features
+        return all(col in unchanged for col in sources)
+
+    @classmethod
+    def load(cls, file_path, previous=None):
+        with span("dataset.read", file=file_path):
+            df_full = load_dataset(file_path, DATA_COLUMNS)
+        with span("dataset.prepare", rows=len(df_full)):
+            return cls(df_full, version=dataset_version(file_path), previous=previous)
+
+    @classmethod
+    def empty(cls):
+        return cls(pd.DataFrame())
+
+
+def start_background_load(file_path):
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-loader")
+    future = executor.submit(Dataset.load, file_path)
+    # Le thread se termine avec la tâche, sans bloquer l'appelant
+    executor.shutdown(wait=False)
+    return future
+
+
+def _file_stamp(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DatasetManager:
+    """Version courante du jeu de données, rechargée à chaud quand le CSV change."""
+
+    def __init__(self, file_path, reload_interval=RELOAD_INTERVAL):
+        self.file_path = file_path
+        self.reload_interval = reload_interval
+        self.reload_count = 0
+        self.last_error = None
+        self._stamp = _file_stamp(file_path)
+        self._pending_stamp = None
+        self._future = start_background_load(file_path)
+        self._current = None
+        self._stopped = threading.Event()
+        if reload_interval > 0:
+            threading.Thread(target=self._watch, name="dataset-watcher", daemon=True).start()
+
+    def ready(self):
+        return self._current is not None or self._future.done()
+
+    def current(self):
+        # None tant que le premier chargement est en cours ; relève son éventuelle erreur
+        if self._current is None:
+            if not self._future.done():
+                return None
+            self._current = self._future.result()
+        return self._current
+
+    def stop(self):
+        self._stopped.set()
+
+    def _watch(self):
+        while not self._stopped.wait(self.reload_interval):
+            try:
+                self.check_for_update()
+            except Exception as e:  # le thread ne doit pas mourir : on garde l'ancienne version
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Rechargement de %s impossible", self.file_path)
+
+    def check_for_update(self):
+        stamp = _file_stamp(self.file_path)
+        if stamp is None or stamp == self._stamp:
+            self._pending_stamp = None
+            return False
+        # Le fichier doit être stable sur deux passages : pas de lecture d'un CSV en cours d'écriture
+        if stamp != self._pending_stamp:
+            self._pending_stamp = stamp
+            return False
+        if not self._future.done():
+            return False
+        try:
+            previous = self.current()
+        except FileNotFoundError:  # le CSV est apparu après le démarrage
+            previous = None
+        self._stamp, self._pending_stamp = stamp, None
+        if previous is not None and dataset_version(self.file_path) == previous.version:
+            return False
+        with span("dataset.reload", file=self.file_path):
+            dataset = Dataset.load(self.file_path, previous=previous)
+        # Simple affectation : les reruns en cours gardent leur référence à l'ancienne version
+        self._current = dataset
+        self.reload_count += 1
+        self.last_error = None
+        logger.info("Nouvelle version de %s chargée (%s)", self.file_path, dataset.version[:12])
+        return True
@@ -0,0 +1,63 @@
+"""Caractéristiques dérivées (préfixe ``_``) calculées à partir des colonnes brutes.
+
+Chaque caractéristique est déclarée une seule fois, sous la forme colonne
+source et fonction vectorisée sur un tableau NumPy. La même définition sert à
+remplir la base complète au chargement et à calculer la valeur du client
+affiché, de sorte que les deux restent toujours cohérentes.
+"""
+import numpy as np
+import pandas as pd
+
+DAYS_PER_YEAR = 365.25
+# Valeur de DAYS_EMPLOYED utilisée dans la base pour les clients sans emploi
+DAYS_EMPLOYED_UNEMPLOYED = 365243
+UNEMPLOYED_LABEL = "Non-employé"
+UNKNOWN_LABEL = "Inconnu"
+
+
+def years_from_days(days):
+    return np.abs(days) / DAYS_PER_YEAR
+
+
+def employed_years_category(days_employed):
+    years = years_from_days(days_employed)
+    unknown = np.isnan(years)
+    unemployed = days_employed == DAYS_EMPLOYED_UNEMPLOYED
+    # np.round arrondit au pair le plus proche, comme round() sur un float Python
+    rounded = np.where(unknown, 0, np.round(years)).astype(np.int64)
+    employed = ~(unknown | unemployed)
+
+    year_values = np.unique(rounded[employed])
+    labels = [f"{y} ans" for y in year_values] + [UNEMPLOYED_LABEL, UNKNOWN_LABEL]
+    codes = np.searchsorted(year_values, rounded)
+    codes = np.where(unemployed, len(year_values), codes)
+    codes = np.where(unknown, len(year_values) + 1, codes)
+    categorical = pd.Categorical.from_codes(codes, categories=labels)
+    return categorical.remove_unused_categories()
+
+
+# nom de la caractéristique -> (colonne source, fonction vectorisée)
+DERIVED_FEATURES = {
+    "_AGE_YEARS": ("DAYS_BIRTH", years_from_days),
+    "_EMPLOYED_YEARS": ("DAYS_EMPLOYED", years_from_days),
+    "_EMPLOYED_YEARS_CAT": ("DAYS_EMPLOYED", employed_years_category),
+}
+
+
+def add_derived_features(df):
+    for name, (source, compute) in DERIVED_FEATURES.items():
+        if source in df.columns:
+            df[name] = compute(df[source].to_numpy(dtype=np.float64, na_value=np.nan))
+    return df
+
+
+def client_feature_value(feature, client_data):
+    # Valeur d'une caractéristique (brute ou dérivée) pour le client affiché
+    if feature not in DERIVED_FEATURES:
+        return client_data.get(feature)
+    source, compute = DERIVED_FEATURES[feature]
+    source_value = client_data.get(source)
+    if source_value is None:
+        return None
+    value = np.asarray(compute(np.array([source_value], dtype=np.float64)), dtype=object)[0]
+    return value.item() if isinstance(value, np.generic) else value
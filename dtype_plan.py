@@ -0,0 +1,121 @@
+"""Plan de types compacts pour df_full.
+
+Le plan est déduit colonne par colonne à partir du contenu :
+
+* chaînes de caractères -> ``category`` ;
+* entiers sans valeur manquante -> plus petit type parmi int8/int16/int32 ;
+* autres numériques -> ``float32`` lorsque la conversion est exacte (aller-retour
+  float64 -> float32 -> float64 sans perte), ``float64`` sinon ;
+* colonnes presque toujours nulles (indicateurs 0/1, moyennes de modalités
+  rares) -> ``Sparse`` avec 0 comme valeur de remplissage.
+
+``memory_report`` permet de vérifier le gain ; ``python dtype_plan.py
+application_train.csv`` compare la base chargée brute et la base typée.
+"""
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Une colonne dont moins de 10 % des valeurs sont non nulles est stockée en sparse
+SPARSE_MAX_DENSITY = 0.1
+SPARSE_MIN_ROWS = 1000
+# Les entiers sont représentés exactement en float32 jusqu'à 2**24
+FLOAT32_MAX_EXACT_INT = 2 ** 24
+INTEGER_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _smallest_int_dtype(min_value, max_value):
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.float64)
+
+
+def infer_column_dtype(series, allow_sparse=True):
+    if isinstance(series.dtype, (pd.CategoricalDtype, pd.SparseDtype)):
+        return series.dtype
+    if pd.api.types.is_bool_dtype(series):
+        return np.dtype(bool)
+    if not pd.api.types.is_numeric_dtype(series):
+        return pd.CategoricalDtype()
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(values)
+    finite = values[~missing]
+    if len(finite) == 0:
+        return np.dtype(np.float32)
+    min_value, max_value = finite.min(), finite.max()
+    is_integral = bool(np.all(np.mod(finite, 1) == 0))
+
+    if is_integral and not missing.any():
+        dense_dtype = _smallest_int_dtype(min_value, max_value)
+    elif is_integral and max(abs(min_value), abs(max_value)) < FLOAT32_MAX_EXACT_INT:
+        dense_dtype = np.dtype(np.float32)
+    else:
+        as_float32 = finite.astype(np.float32).astype(np.float64)
+        # Valeurs envoyées telles quelles à l'API : pas d'arrondi toléré
+        exact = np.array_equal(as_float32, finite)
+        dense_dtype = np.dtype(np.float32) if exact else np.dtype(np.float64)
+
+    if allow_sparse and len(values) >= SPARSE_MIN_ROWS:
+        density = np.count_nonzero(values) / len(values)  # les NaN comptent comme non nuls
+        if density <= SPARSE_MAX_DENSITY:
+            return pd.SparseDtype(dense_dtype, fill_value=dense_dtype.type(0))
+    return dense_dtype
+
+
+def infer_dtype_plan(df, allow_sparse=True):
+    return {col: infer_column_dtype(df[col], allow_sparse=allow_sparse) for col in df.columns}
+
+
+def apply_dtype_plan(df, plan=None, allow_sparse=True):
+    if plan is None:
+        plan = infer_dtype_plan(df, allow_sparse=allow_sparse)
+    for col, dtype in plan.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def memory_report(df):
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(index=False, deep=True),
+    }).sort_values("bytes", ascending=False)
+    report.index.name = "column"
+    return report
+
+
+def log_memory_report(df, label):
+    total_mb = memory_report(df)["bytes"].sum() / 2 ** 20
+    logger.info("%s : %d lignes x %d colonnes, %.1f Mo en mémoire", label, len(df),
+                len(df.columns), total_mb)
+    return total_mb
+
+
+def main(argv=None):
+    from data_store import load_dataset
+    from features import DATA_COLUMNS
+
+    argv = sys.argv[1:] if argv is None else argv
+    file_path = argv[0] if argv else "application_train.csv"
+    wanted = set(DATA_COLUMNS)
+    raw = pd.read_csv(file_path, usecols=lambda c: c in wanted, low_memory=False)
+    planned = load_dataset(file_path, DATA_COLUMNS)
+
+    raw_mb = memory_report(raw)["bytes"].sum() / 2 ** 20
+    report = memory_report(planned)
+    planned_mb = report["bytes"].sum() / 2 ** 20
+    print(report.assign(megabytes=(report["bytes"] / 2 ** 20).round(2)).to_string())
+    print(f"\nCSV brut (colonnes du dashboard) : {raw_mb:.1f} Mo")
+    print(f"Après plan de types (avec colonnes dérivées) : {planned_mb:.1f} Mo "
+          f"({planned_mb / raw_mb:.0%} du brut)")
+
+
+if __name__ == "__main__":
+    main()
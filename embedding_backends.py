@@ -0,0 +1,175 @@
+"""Moteurs d'inférence du modèle d'embeddings du notebook de veille.
+
+Le notebook chargeait le modèle en float16 puis retombait sur le CPU sans
+MPS : sur x86, le float16 est émulé et c'est le cas le plus lent. Les
+moteurs disponibles :
+
+* ``mps-fp16`` : PyTorch float16 sur GPU Apple (comportement d'origine) ;
+* ``fp32`` : PyTorch float32 sur CPU, la référence ;
+* ``int8`` : PyTorch float32 dont les couches linéaires sont quantifiées
+  dynamiquement en int8 (poids int8, activations quantifiées à la volée) ;
+* ``onnx`` : graphe ONNX exporté une fois depuis le modèle float32 et
+  exécuté par ONNX Runtime, nombre de threads réglable.
+
+Tous renvoient un objet appelable comme le modèle Hugging Face
+(``model(**features).last_hidden_state``), utilisable tel quel par
+``embedding_batching.encode_texts``. ``benchmark_backends`` compare leur
+débit, leur fidélité aux embeddings float32 (similarité cosinus ligne à
+ligne) et les scores de clustering obtenus avec chacun.
+"""
+import gc
+import hashlib
+import os
+import re
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score, silhouette_score
+from transformers import AutoModel
+
+from embedding_batching import DEFAULT_MAX_LENGTH, DEFAULT_MAX_TOKENS, encode_texts
+
+try:
+    import onnxruntime as ort
+except ImportError:  # onnxruntime absent : moteur "onnx" indisponible
+    ort = None
+
+BACKENDS = ("mps-fp16", "fp32", "int8", "onnx")
+ONNX_CACHE_DIR = os.environ.get("ONNX_CACHE_DIR", os.path.join(".cache", "onnx"))
+ONNX_OPSET = 17
+
+
+def default_backend():
+    return "mps-fp16" if torch.backends.mps.is_available() else "fp32"
+
+
+def _load_fp32(model_name):
+    return AutoModel.from_pretrained(model_name, torch_dtype=torch.float32).eval()
+
+
+class _LastHiddenState(torch.nn.Module):
+    # Entrées positionnelles dans l'ordre du tokenizer, sortie unique pour l'export
+    def __init__(self, model, input_names):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs))).last_hidden_state
+
+
+def export_onnx(model, tokenizer, path, opset=ONNX_OPSET):
+    sample = tokenizer(["exemple de description produit"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with torch.no_grad():
+        torch.onnx.export(_LastHiddenState(model, input_names), tuple(sample.values()), tmp_path,
+                          input_names=input_names, output_names=["last_hidden_state"],
+                          dynamic_axes=dynamic_axes, opset_version=opset)
+    os.replace(tmp_path, path)
+    return path
+
+
+class OnnxEncoder:
+    """Session ONNX Runtime présentée comme un modèle Hugging Face."""
+
+    def __init__(self, path, config, num_threads=None):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads or 0  # 0 : un thread par cœur physique
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.config = config
+
+    def __call__(self, **features):
+        feeds = {name: value.cpu().numpy().astype(np.int64)
+                 for name, value in features.items() if name in self.input_names}
+        (hidden,) = self.session.run(["last_hidden_state"], feeds)
+        return SimpleNamespace(last_hidden_state=torch.from_numpy(hidden))
+
+
+def _onnx_path(model_name, config):
+    revision = getattr(config, "_commit_hash", None) or "main"
+    fingerprint = hashlib.sha256(f"{revision}:{ONNX_OPSET}".encode()).hexdigest()[:12]
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    return os.path.join(ONNX_CACHE_DIR, f"{slug}-{fingerprint}", "model.onnx")
+
+
+def load_backend(name, model_name, tokenizer, num_threads=None):
+    """Modèle, périphérique et nom du moteur (``auto`` : MPS si présent, sinon fp32)."""
+    if name == "auto":
+        name = default_backend()
+    if name not in BACKENDS:
+        raise ValueError(f"Moteur inconnu : {name} (choix : auto, {', '.join(BACKENDS)})")
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if name == "mps-fp16":
+        model = AutoModel.from_pretrained(model_name, torch_dtype=torch.float16,
+                                          device_map="auto").eval()
+        return model, torch.device("mps"), name
+    model = _load_fp32(model_name)
+    if name == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear},
+                                                       dtype=torch.qint8)
+    elif name == "onnx":
+        if ort is None:
+            raise ImportError("Le moteur « onnx » nécessite onnxruntime (pip install onnxruntime)")
+        path = _onnx_path(model_name, model.config)
+        if not os.path.exists(path):
+            export_onnx(model, tokenizer, path)
+        model = OnnxEncoder(path, model.config, num_threads)
+    return model, torch.device("cpu"), name
+
+
+def row_cosine(reference, embeddings):
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.einsum("ij,ij->i", reference, embeddings)
+
+
+def clustering_scores(embeddings, labels, n_clusters, n_components=384, random_state=42):
+    # Même chaîne que le notebook : PCA puis MiniBatchKMeans
+    n_components = min(n_components, *embeddings.shape)
+    reduced = PCA(n_components=n_components, random_state=random_state).fit_transform(embeddings)
+    clusters = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                               n_init=10).fit_predict(reduced)
+    return {"ari": adjusted_rand_score(labels, clusters),
+            "nmi": normalized_mutual_info_score(labels, clusters),
+            "silhouette": (silhouette_score(reduced, clusters)
+                           if len(set(clusters)) > 1 else float("nan"))}
+
+
+def benchmark_backends(texts, labels, model_name, tokenizer, backends=("fp32", "int8", "onnx"),
+                       num_threads=None, n_components=384, max_tokens=DEFAULT_MAX_TOKENS,
+                       max_length=DEFAULT_MAX_LENGTH):
+    """Débit, fidélité à fp32 et scores de clustering de chaque moteur (un DataFrame).
+
+    fp32 est toujours mesuré en premier : c'est la référence des similarités
+    cosinus. Les embeddings sont recalculés (le cache disque est ignoré).
+    """
+    backends = ["fp32"] + [name for name in backends if name != "fp32"]
+    n_clusters = len(set(labels))
+    rows, reference = [], None
+    for name in backends:
+        model, device, _ = load_backend(name, model_name, tokenizer, num_threads)
+        embeddings, stats = encode_texts(texts, model, tokenizer, device, max_tokens=max_tokens,
+                                         max_length=max_length, show_progress=False)
+        del model
+        gc.collect()
+        if reference is None:
+            reference = embeddings
+        cosine = row_cosine(reference, embeddings)
+        rows.append({"backend": name, "seconds": stats["seconds"],
+                     "tokens_per_second": stats["tokens_per_second"],
+                     "texts_per_second": len(texts) / stats["seconds"],
+                     "cosine_mean": float(cosine.mean()), "cosine_min": float(cosine.min()),
+                     **clustering_scores(embeddings, labels, n_clusters, n_components)})
+    return pd.DataFrame(rows).set_index("backend")
@@ -0,0 +1,106 @@
+"""Encodage de textes par lots de longueurs homogènes, pour le notebook de veille.
+
+Découper les textes dans leur ordre d'origine en lots de taille fixe oblige à
+compléter chaque lot jusqu'à la longueur de son texte le plus long : avec des
+descriptions produits de longueurs très inégales, l'essentiel du calcul part
+dans les tokens de remplissage. Ici, tous les textes sont tokenisés une
+seule fois, triés par longueur, puis regroupés en lots sous un budget de
+tokens (lignes x longueur du plus long) plutôt qu'un nombre de lignes fixe.
+Les embeddings sont replacés dans l'ordre d'origine à la fin.
+
+``encode_texts`` renvoie aussi le taux de remplissage et le débit en tokens
+par seconde, à comparer avec ``padding_stats`` sur les lots fixes d'origine.
+"""
+import time
+
+import numpy as np
+import torch
+from tqdm.auto import tqdm
+
+DEFAULT_MAX_LENGTH = 512
+# Même pic mémoire que les lots fixes de 16 textes de 512 tokens
+DEFAULT_MAX_TOKENS = 16 * DEFAULT_MAX_LENGTH
+DEFAULT_MAX_ROWS = 256
+
+
+def plan_batches(lengths, max_tokens=DEFAULT_MAX_TOKENS, max_rows=DEFAULT_MAX_ROWS):
+    # Lots d'indices, du plus long au plus court : un dépassement mémoire se voit au 1er lot
+    order = np.argsort(-np.asarray(lengths), kind="stable")
+    batches, batch, batch_width = [], [], 0
+    for index in order:
+        width = max(batch_width, int(lengths[index]))
+        if batch and ((len(batch) + 1) * width > max_tokens or len(batch) >= max_rows):
+            batches.append(batch)
+            batch, width = [], int(lengths[index])
+        batch.append(int(index))
+        batch_width = width
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def fixed_batches(n_texts, batch_size):
+    # Découpage d'origine : lots consécutifs de batch_size textes
+    return [list(range(start, min(start + batch_size, n_texts)))
+            for start in range(0, n_texts, batch_size)]
+
+
+def padding_stats(lengths, batches):
+    lengths = np.asarray(lengths)
+    real = int(sum(lengths[batch].sum() for batch in batches))
+    padded = int(sum(len(batch) * lengths[batch].max() for batch in batches))
+    return {"batches": len(batches), "real_tokens": real, "padded_tokens": padded,
+            "padding_ratio": 1 - real / padded if padded else 0.0}
+
+
+def mean_pool(last_hidden_state, attention_mask):
+    # Somme en float32, comme la boucle d'origine, même si le modèle tourne en float16
+    mask = attention_mask.unsqueeze(-1).float()
+    pooled = torch.sum(last_hidden_state.float() * mask, dim=1) / torch.clamp(mask.sum(1), min=1e-9)
+    return torch.nn.functional.normalize(pooled, p=2, dim=1)
+
+
+def encode_texts(texts, model, tokenizer, device, max_tokens=DEFAULT_MAX_TOKENS,
+                 max_length=DEFAULT_MAX_LENGTH, max_rows=DEFAULT_MAX_ROWS, show_progress=True,
+                 out=None):
+    """Embeddings normalisés (float32) de ``texts``, dans leur ordre, et statistiques.
+
+    Même calcul que la boucle d'origine (mean pooling masqué puis normalisation
+    L2) ; seul le regroupement des textes en lots change. Avec ``out`` (un
+    ``EmbeddingWriter``), chaque lot est écrit directement dans la matrice sur
+    disque, seules ses lignes manquantes sont encodées (reprise après
+    interruption) et la matrice projetée en mémoire est renvoyée.
+    """
+    texts = [str(t) for t in texts]
+    rows = np.arange(len(texts)) if out is None else out.missing_rows()
+    if out is not None and not len(rows):  # matrice déjà complète
+        return out.array(), dict(padding_stats([], []), seconds=0.0,
+                                 tokens_per_second=float("nan"))
+    encoded = tokenizer([texts[i] for i in rows], truncation=True, max_length=max_length)
+    lengths = np.array([len(ids) for ids in encoded["input_ids"]], dtype=np.int64)
+    batches = plan_batches(lengths, max_tokens, max_rows)
+    stats = padding_stats(lengths, batches)
+
+    embeddings = None
+    start = time.perf_counter()
+    for batch in tqdm(batches, desc="Génération des embeddings", disable=not show_progress):
+        features = tokenizer.pad({key: [encoded[key][i] for i in batch] for key in encoded.keys()},
+                                 return_tensors="pt").to(device)
+        with torch.no_grad():
+            outputs = model(**features)
+            batch_embeddings = mean_pool(outputs.last_hidden_state,
+                                         features["attention_mask"]).cpu().numpy()
+        if out is not None:
+            out.write(rows[batch], batch_embeddings)
+            continue
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+        embeddings[rows[batch]] = batch_embeddings
+    elapsed = time.perf_counter() - start
+    stats.update(seconds=elapsed,
+                 tokens_per_second=stats["real_tokens"] / elapsed if elapsed > 0 else float("nan"))
+    if out is not None:
+        return out.array(), stats
+    if embeddings is None:
+        embeddings = np.empty((0, model.config.hidden_size), dtype=np.float32)
+    return embeddings, stats
@@ -0,0 +1,161 @@
+"""Cache disque des embeddings de textes, adressé par le contenu.
+
+Utilisé par le notebook de veille (``veille.ipynb``) : l'encodage des
+descriptions produits par le modèle est de loin l'étape la plus coûteuse sur
+CPU, et relancer l'expérience de clustering sur le même catalogue (ou sur un
+catalogue avec quelques produits en plus) ne doit réencoder que les textes
+nouveaux.
+
+Un répertoire de cache correspond à une configuration d'encodage (modèle,
+révision, longueur maximale, pooling, variante d'inférence, type des
+vecteurs stockés) ; chaque ligne y est identifiée par le sha256 du texte
+normalisé (Unicode NFC, espaces fusionnés). Le répertoire contient :
+
+* ``vectors.bin`` : matrice float32 (ou float16) brute, une ligne par texte,
+  complétée par ajout en fin de fichier et relue en mémoire projetée ;
+* ``keys.txt`` : les empreintes des textes, une par ligne, dans l'ordre des
+  lignes de la matrice ;
+* ``meta.json`` : la configuration et la dimension des vecteurs.
+
+Les vecteurs sont écrits avant leurs clés : après une interruption, une
+ligne sans clé est simplement ignorée.
+"""
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", os.path.join(".cache", "embeddings"))
+
+
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def text_key(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def corpus_key(texts):
+    # Empreinte d'un corpus : ses textes et leur ordre
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(bytes.fromhex(text_key(text)))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+
+    def __init__(self, model_name, revision="main", max_length=512, pooling="mean",
+                 variant=None, dtype="float32", cache_dir=EMBEDDING_CACHE_DIR):
+        # variant : précision ou moteur d'inférence (les vecteurs en dépendent légèrement)
+        self.config = {"model_name": model_name, "revision": revision or "main",
+                       "max_length": int(max_length), "pooling": pooling,
+                       "variant": variant, "dtype": np.dtype(dtype).name}
+        self.dtype = np.dtype(dtype)
+        fingerprint = hashlib.sha256(
+            json.dumps(self.config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(cache_dir, f"{slug}-{fingerprint}")
+        self._vectors_path = os.path.join(self.directory, "vectors.bin")
+        self._keys_path = os.path.join(self.directory, "keys.txt")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self.dim = None
+        self._rows = {}
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+            with open(self._keys_path, encoding="utf-8") as f:
+                keys = [line.strip() for line in f if line.strip()]
+        except (OSError, ValueError, KeyError):
+            return
+        try:
+            n_vectors = os.path.getsize(self._vectors_path) // (self.dim * self.dtype.itemsize)
+        except OSError:  # vecteurs supprimés ou jamais écrits : les clés ne pointent sur rien
+            n_vectors = 0
+        # Lignes complètes et indexées seulement (interruption entre les deux écritures)
+        self._rows = {key: row for row, key in enumerate(keys[:n_vectors])}
+        if n_vectors != len(self._rows) or len(keys) != len(self._rows):
+            self._truncate(len(self._rows))
+
+    def _truncate(self, n_rows):
+        # "a+b" : crée le fichier des vecteurs s'il manque
+        with open(self._vectors_path, "a+b") as f:
+            f.truncate(n_rows * self.dim * self.dtype.itemsize)
+        with open(self._keys_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key, _ in sorted(self._rows.items(), key=lambda kv: kv[1]))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, text):
+        return text_key(text) in self._rows
+
+    def vectors(self):
+        # Matrice complète en lecture seule, projetée en mémoire
+        if not self._rows:
+            return np.empty((0, self.dim or 0), dtype=self.dtype)
+        return np.memmap(self._vectors_path, dtype=self.dtype, mode="r",
+                         shape=(len(self._rows), self.dim))
+
+    def add(self, keys, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._meta_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({**self.config, "dim": self.dim}, f, indent=1)
+            os.replace(tmp_path, self._meta_path)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimension {vectors.shape[1]} reçue, {self.dim} attendue")
+        new = [(key, i) for i, key in enumerate(keys) if key not in self._rows]
+        if not new:
+            return
+        with open(self._vectors_path, "ab") as f:
+            f.write(vectors[[i for _, i in new]].tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self._keys_path, "a", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key, _ in new)
+        start = len(self._rows)
+        self._rows.update({key: start + n for n, (key, _) in enumerate(new)})
+
+    def get_or_compute(self, texts, encode, chunk_size=1024, out=None):
+        """Embeddings (float32) de ``texts`` dans leur ordre, en n'encodant que les absents.
+
+        ``encode(liste de textes)`` renvoie la matrice de leurs embeddings. Les
+        textes manquants (dédoublonnés) sont encodés par blocs de ``chunk_size``
+        et ajoutés au cache au fur et à mesure : un encodage interrompu reprend
+        au dernier bloc enregistré.
+
+        Avec ``out`` (un ``EmbeddingWriter`` de ``len(texts)`` lignes), les
+        lignes encore manquantes y sont recopiées bloc par bloc et la matrice
+        projetée en mémoire est renvoyée, sans copie complète en mémoire vive.
+        """
+        texts = list(texts)
+        keys = [text_key(text) for text in texts]
+        positions = range(len(keys)) if out is None else out.missing_rows()
+        missing = {}
+        for i in positions:
+            if keys[i] not in self._rows and keys[i] not in missing:
+                missing[keys[i]] = str(texts[i])
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), chunk_size):
+            chunk = missing_keys[start:start + chunk_size]
+            self.add(chunk, encode([missing[key] for key in chunk]))
+        if out is not None:
+            for start in range(0, len(positions), chunk_size):
+                rows = positions[start:start + chunk_size]
+                out.write(rows, self.vectors()[[self._rows[keys[i]] for i in rows]])
+            return out.array()
+        if not keys:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        rows = np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+        return np.asarray(self.vectors()[rows], dtype=np.float32)
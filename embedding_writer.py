@@ -0,0 +1,98 @@
+"""Matrice d'embeddings d'un corpus, écrite lot par lot dans un ``.npy`` projeté.
+
+La matrice (textes x dimension, float32, dans l'ordre du corpus) est allouée
+une fois sur disque ; chaque lot encodé y est recopié directement, sans liste
+intermédiaire ni copie finale : la mémoire vive ne contient jamais plus d'un
+lot. Le répertoire contient :
+
+* ``embeddings.npy`` : la matrice, ouverte avec ``open_memmap`` ;
+* ``done.npy`` : un booléen par ligne, vrai une fois la ligne écrite ;
+* ``meta.json`` : forme de la matrice et empreinte du corpus.
+
+Après chaque lot, la matrice puis le masque sont écrits sur disque : un
+encodage interrompu reprend aux lignes manquantes, tant que l'empreinte du
+corpus n'a pas changé (sinon tout est réalloué). Les étapes suivantes (PCA,
+clustering) lisent la matrice par blocs avec ``iter_chunks``.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class EmbeddingWriter:
+
+    def __init__(self, directory, n_rows, dim, fingerprint=None, resume=True):
+        self.directory = directory
+        meta = {"n_rows": int(n_rows), "dim": int(dim), "fingerprint": fingerprint}
+        if not resume or _read_meta(directory) != meta:
+            self._allocate(meta)
+        self._embeddings = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r+")
+        self._done = np.load(os.path.join(directory, "done.npy"), mmap_mode="r+")
+
+    def _allocate(self, meta):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+        shape = (meta["n_rows"], meta["dim"])
+        embeddings = np.lib.format.open_memmap(os.path.join(self.directory, "embeddings.npy"),
+                                               mode="w+", dtype=np.float32, shape=shape)
+        done = np.lib.format.open_memmap(os.path.join(self.directory, "done.npy"), mode="w+",
+                                         dtype=np.bool_, shape=(shape[0],))
+        for array in (embeddings, done):
+            array.flush()
+        # meta.json en dernier : un répertoire sans lui est réalloué à la prochaine ouverture
+        tmp_path = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, "meta.json"))
+
+    @property
+    def shape(self):
+        return self._embeddings.shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def missing_rows(self):
+        return np.flatnonzero(~self._done)
+
+    def complete(self):
+        return bool(self._done.all())
+
+    def write(self, rows, vectors):
+        self._embeddings[rows] = vectors
+        self._embeddings.flush()
+        # Masque après les données : une ligne marquée faite est toujours sur disque
+        self._done[rows] = True
+        self._done.flush()
+
+    def array(self):
+        # Matrice complète en lecture seule, projetée en mémoire
+        return np.load(os.path.join(self.directory, "embeddings.npy"), mmap_mode="r")
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Blocs ``(première ligne, matrice float32 en mémoire)`` dans l'ordre du corpus.
+
+        Les blocs ont des tailles presque égales (au plus ``chunk_size``
+        lignes) : pas de dernier bloc minuscule, que ``IncrementalPCA``
+        refuserait s'il avait moins de lignes que de composantes.
+        """
+        if not self.complete():
+            raise RuntimeError(f"{len(self.missing_rows())} lignes d'embeddings pas encore écrites")
+        matrix = self.array()
+        n_chunks = max(1, -(-len(matrix) // chunk_size))
+        start = 0
+        for size in np.diff(np.linspace(0, len(matrix), n_chunks + 1).astype(np.int64)):
+            yield start, np.array(matrix[start:start + size])
+            start += int(size)
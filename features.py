@@ -0,0 +1,229 @@
+"""Description des caractéristiques client affichées par le dashboard."""
+
+FEATURE_DESCRIPTIONS = {
+    "EXT_SOURCE_1": "Score Source Externe 1 (information financière externe)",
+    "EXT_SOURCE_3": "Score Source Externe 3 (information financière externe)",
+    "AMT_CREDIT": "Montant du crédit demandé",
+    "DAYS_BIRTH": "Âge du client (en jours, négatif)",
+    "EXT_SOURCE_2": "Score Source Externe 2 (information financière externe)",
+    "AMT_ANNUITY": "Montant des annuités du prêt",
+    "SK_ID_CURR_CNT_INSTALMENT_FUTURE_mean": "Moyenne des échéances futures impayées (crédits précédents)",
+    "DAYS_ID_PUBLISH": "Ancienneté de la dernière mise à jour de l'ID (en jours, négatif)",
+    "SK_ID_CURR_DAYS_CREDIT_ENDDATE_max": "Date de fin maximale des crédits passés (en jours)",
+    "DAYS_EMPLOYED": "Ancienneté d'emploi actuelle (en jours, négatif, 365243 si non employé)",
+    "CODE_GENDER": "Genre",
+    "NAME_EDUCATION_TYPE": "Niveau d'éducation",
+    "NAME_FAMILY_STATUS": "Statut familial",
+    "AMT_INCOME_TOTAL": "Revenu annuel total",
+    "CNT_CHILDREN": "Nombre d'enfants",
+    "FLAG_OWN_CAR": "Possède une voiture",
+    "FLAG_OWN_REALTY": "Possède un bien immobilier",
+    "OCCUPATION_TYPE": "Type d'emploi",
+    "REGION_POPULATION_RELATIVE": "Densité de population de la région de résidence",
+    "HOUR_APPR_PROCESS_START": "Heure de début de la demande",
+    "SK_ID_CURR_AMT_GOODS_PRICE_mean": "Moyenne du prix des biens des anciens crédits",
+    "SK_ID_CURR_AMT_PAYMENT_CURRENT_mean": "Moyenne des paiements actuels des crédits",
+    "SK_ID_CURR_AMT_INSTALMENT_mean": "Moyenne des montants d'échéances des anciens crédits",
+    "SK_ID_CURR_AMT_CREDIT_SUM_DEBT_sum": "Somme des dettes des anciens crédits",
+    "SK_ID_CURR_AMT_ANNUITY_mean": "Moyenne des annuités des anciens crédits",
+    "SK_ID_CURR_AMT_TOTAL_RECEIVABLE_sum": "Somme des montants totaux à recevoir des anciens crédits",
+    "SK_ID_CURR_AMT_TOTAL_RECEIVABLE_max": "Maximum du montant total à recevoir des anciens crédits",
+    "SK_ID_CURR_AMT_RECEIVABLE_PRINCIPAL_sum": "Somme du capital à recevoir des anciens crédits",
+    "SK_ID_CURR_AMT_CREDIT_SUM_sum": "Somme des montants de crédit des anciens crédits",
+    "SK_ID_CURR_CNT_INSTALMENT_mean": "Moyenne du nombre d'échéances des anciens crédits",
+    "SK_ID_CURR_MONTHS_BALANCE_max_x": "Mois maximal de l'historique de bureau",
+    "SK_ID_CURR_PAYMENT_DIFF_sum": "Somme des différences de paiement des anciens crédits",
+    "SK_ID_CURR_CNT_INSTALMENT_max": "Maximum du nombre d'échéances des anciens crédits",
+    "SK_ID_CURR_DBD_sum_x": "Somme des jours avant la date de paiement (bureau)",
+    "SK_ID_CURR_DBD_max_y": "Maximum des jours avant la date de paiement (POS/Cash)",
+    "SK_ID_CURR_AMT_CREDIT_LIMIT_ACTUAL_min": "Minimum du montant de la limite de crédit actuelle",
+    "SK_ID_CURR_AMT_DRAWINGS_POS_CURRENT_mean": "Moyenne des retraits POS actuels",
+    "SK_ID_CURR_SK_DPD_mean_x": "Moyenne des jours d'arriérés (bureau)",
+    "SK_ID_CURR_CNT_DRAWINGS_POS_CURRENT_sum": "Somme des retraits POS actuels",
+    "SK_ID_CURR_DBD_mean_y": "Moyenne des jours avant la date de paiement (POS/Cash)",
+    "SK_ID_CURR_CNT_DRAWINGS_ATM_CURRENT_sum": "Somme des retraits ATM actuels",
+    "SK_ID_CURR_AMT_CREDIT_SUM_DEBT_mean": "Moyenne de la dette des anciens crédits",
+    "SK_ID_CURR_SK_DPD_mean_y": "Moyenne des jours d'arriérés par définition (POS/Cash)",
+    "SK_ID_CURR_CNT_DRAWINGS_ATM_CURRENT_max": "Maximum des retraits ATM actuels",
+    "SK_ID_CURR_MONTHS_BALANCE_min_y": "Mois minimal de l'historique de solde (POS/Cash)",
+    "SK_ID_CURR_DPD_sum_y": "Somme des jours d'arriérés (POS/Cash)",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Medicine_mean": "Moyenne des prêts pour Médicaments",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Spouse_partner_mean": "Moyenne des clients accompagnés par conjoint/partenaire",
+    "SK_ID_CURR_CHANNEL_TYPE_Stone_mean": "Moyenne des demandes via canal 'Stone'",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Refused_mean_y": "Moyenne des contrats refusés (précédentes applications)",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_XNA_mean": "Moyenne des contrats au statut non spécifié",
+    "SK_ID_CURR_SK_DPD_DEF_max_x": "Maximum des jours d'arriérés par définition (bureau)",
+    "SK_ID_CURR_CODE_REJECT_REASON_XNA_mean": "Moyenne des raisons de rejet non spécifiées",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_MONDAY_mean": "Moyenne des demandes commencées un lundi",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Other_mean": "Moyenne des prêts pour Autres biens",
+    "SK_ID_CURR_CREDIT_TYPE_Car_loan_mean": "Moyenne des prêts automobiles",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Canceled_mean_x": "Moyenne des contrats annulés (bureau)",
+    "SK_ID_CURR_CNT_DRAWINGS_CURRENT_mean": "Moyenne des retraits actuels",
+    "SK_ID_CURR_CHANNEL_TYPE_Channel_of_corporate_sales_mean": "Moyenne des demandes via canal de ventes corporate",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_House_Construction_mean": "Moyenne des prêts pour Construction de maison",
+    "SK_ID_CURR_CREDIT_TYPE_Mortgage_mean": "Moyenne des prêts hypothécaires",
+    "SK_ID_CURR_NAME_YIELD_GROUP_low_action_mean": "Moyenne des groupes de rendement 'faible action'",
+    "SK_ID_CURR_CODE_REJECT_REASON_XAP_mean": "Moyenne des rejets par XAP",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Jewelry_mean": "Moyenne des prêts pour Bijoux",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Sent_proposal_mean": "Moyenne des contrats avec proposition envoyée",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_THURSDAY_mean": "Moyenne des demandes commencées un jeudi",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_AudioVideo_mean": "Moyenne des prêts pour Audio/Vidéo",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Car_repairs_mean": "Moyenne des prêts pour Réparations automobiles",
+    "SK_ID_CURR_CODE_REJECT_REASON_CLIENT_mean": "Moyenne des rejets par décision client",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Signed_mean_y": "Moyenne des contrats signés (précédentes applications)",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Homewares_mean": "Moyenne des prêts pour Articles ménagers",
+    "SK_ID_CURR_NAME_PAYMENT_TYPE_Noncash_from_your_account_mean": "Moyenne des paiements non cash depuis compte",
+    "SK_ID_CURR_NAME_CLIENT_TYPE_New_mean": "Moyenne des clients de type 'Nouveau'",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Active_mean_y": "Moyenne des contrats actifs (précédentes applications)",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Consumer_Electronics_mean": "Moyenne des prêts pour Électronique grand public",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Purchase_of_electronic_equipment_mean": "Moyenne des prêts pour Achat d'équipement électronique",
+    "SK_ID_CURR_NAME_CLIENT_TYPE_XNA_mean": "Moyenne des clients de type non spécifié",
+    "SK_ID_CURR_NAME_PRODUCT_TYPE_walkin_mean": "Moyenne des produits de type 'walk-in'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Education_mean": "Moyenne des prêts pour Éducation",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Medicine_mean": "Moyenne des prêts pour Médicaments",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Completed_mean_y": "Moyenne des contrats complétés (précédentes applications)",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Photo__Cinema_Equipment_mean": "Moyenne des prêts pour Équipement photo/cinéma",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Connectivity_mean": "Moyenne des demandes via industrie 'Connectivité'",
+    "SK_ID_CURR_NAME_PAYMENT_TYPE_Cashless_from_the_account_of_the_employer_mean": "Moyenne des paiements sans cash depuis compte employeur",
+    "SK_ID_CURR_CREDIT_TYPE_Real_estate_loan_mean": "Moyenne des prêts immobiliers",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Auto_Accessories_mean": "Moyenne des prêts pour Accessoires auto",
+    "SK_ID_CURR_CHANNEL_TYPE_Credit_and_cash_offices_mean": "Moyenne des demandes via bureaux de crédit et cash",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Refusal_to_name_the_goal_mean": "Moyenne des prêts avec refus de spécifier le but",
+    "SK_ID_CURR_CREDIT_TYPE_Consumer_credit_mean": "Moyenne des crédits à la consommation",
+    "SK_ID_CURR_CREDIT_TYPE_Interbank_credit_mean": "Moyenne des crédits interbancaires",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_XNA_mean": "Moyenne des prêts avec but non spécifié",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Urgent_needs_mean": "Moyenne des prêts pour Besoins urgents",
+    "SK_ID_CURR_RATE_INTEREST_PRIVILEGED_mean": "Moyenne du taux d'intérêt privilégié",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Office_Appliances_mean": "Moyenne des prêts pour Appareils de bureau",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Wedding__gift__holiday_mean": "Moyenne des prêts pour Mariage, cadeau, vacances",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_TUESDAY_mean": "Moyenne des demandes commencées un mardi",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Approved_mean": "Moyenne des contrats approuvés",
+    "SK_ID_CURR_CODE_REJECT_REASON_SCO_mean": "Moyenne des rejets par SCO",
+    "SK_ID_CURR_CREDIT_ACTIVE_Sold_mean": "Moyenne des crédits 'vendus'",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Demand_mean_y": "Moyenne des contrats demandés (précédentes applications)",
+    "SK_ID_CURR_NAME_PORTFOLIO_Cards_mean": "Moyenne des portefeuilles de type 'Cartes'",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_garage_mean": "Moyenne des prêts pour Achat de garage",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Animals_mean": "Moyenne des prêts pour Animaux",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Clothing_and_Accessories_mean": "Moyenne des prêts pour Vêtements et accessoires",
+    "SK_ID_CURR_CHANNEL_TYPE_Contact_center_mean": "Moyenne des demandes via centre d'appels",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Construction_Materials_mean": "Moyenne des prêts pour Matériaux de construction",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_home_mean": "Moyenne des prêts pour Achat d'une maison",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_XAP_mean": "Moyenne des prêts avec but 'XAP'",
+    "SK_ID_CURR_CREDIT_TYPE_Loan_for_working_capital_replenishment_mean": "Moyenne des prêts pour réapprovisionnement fonds de roulement",
+    "SK_ID_CURR_CREDIT_TYPE_Another_type_of_loan_mean": "Moyenne des autres types de prêts",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Fitness_mean": "Moyenne des prêts pour Fitness",
+    "SK_ID_CURR_NAME_PORTFOLIO_POS_mean": "Moyenne des portefeuilles de type 'POS'",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_SATURDAY_mean": "Moyenne des demandes commencées un samedi",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Gasification__water_supply_mean": "Moyenne des prêts pour Gazification, approvisionnement en eau",
+    "SK_ID_CURR_NAME_YIELD_GROUP_high_mean": "Moyenne des groupes de rendement 'élevé'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Gardening_mean": "Moyenne des prêts pour Jardinage",
+    "SK_ID_CURR_FLAG_LAST_APPL_PER_CONTRACT_Y_mean": "Moyenne du flag 'dernière application par contrat' à Oui",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_WEDNESDAY_mean": "Moyenne des demandes commencées un mercredi",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Industry_mean": "Moyenne des demandes via industrie 'Industrie'",
+    "SK_ID_CURR_NAME_PRODUCT_TYPE_xsell_mean": "Moyenne des produits de type 'cross-sell'",
+    "SK_ID_CURR_CODE_REJECT_REASON_LIMIT_mean": "Moyenne des rejets par limite",
+    "SK_ID_CURR_CREDIT_TYPE_Loan_for_business_development_mean": "Moyenne des prêts pour développement commercial",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Unaccompanied_mean": "Moyenne des clients non accompagnés",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Additional_Service_mean": "Moyenne des prêts pour Services additionnels",
+    "SK_ID_CURR_CHANNEL_TYPE_AP_Cash_loan_mean": "Moyenne des demandes via canal 'AP Cash loan'",
+    "SK_ID_CURR_NAME_CONTRACT_TYPE_Cash_loans_mean": "Moyenne des contrats de type 'Prêts en espèces'",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_MLM_partners_mean": "Moyenne des demandes via industrie 'Partenaires MLM'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Medical_Supplies_mean": "Moyenne des prêts pour Fournitures médicales",
+    "SK_ID_CURR_CREDIT_TYPE_Cash_loan_nonearmarked_mean": "Moyenne des prêts en espèces non affectés",
+    "SK_ID_CURR_CREDIT_ACTIVE_Closed_mean": "Moyenne des crédits 'fermés'",
+    "SK_ID_CURR_NAME_CLIENT_TYPE_Repeater_mean": "Moyenne des clients de type 'Répéteur'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Direct_Sales_mean": "Moyenne des prêts pour Ventes directes",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Computers_mean": "Moyenne des prêts pour Ordinateurs",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Clothing_mean": "Moyenne des demandes via industrie 'Vêtements'",
+    "SK_ID_CURR_CREDIT_TYPE_Credit_card_mean": "Moyenne des crédits par carte",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Returned_to_the_store_mean": "Moyenne des contrats retournés au magasin",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Other_A_mean": "Moyenne des clients accompagnés par 'Autre A'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Furniture_mean": "Moyenne des prêts pour Meubles",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Vehicles_mean": "Moyenne des prêts pour Véhicules",
+    "SK_ID_CURR_NAME_YIELD_GROUP_middle_mean": "Moyenne des groupes de rendement 'moyen'",
+    "YEARS_BEGINEXPLUATATION_AVG": "Moyenne des années de début d'exploitation",
+    "SK_ID_CURR_NAME_CONTRACT_TYPE_Consumer_loans_mean": "Moyenne des contrats de type 'Crédits à la consommation'",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Repairs_mean": "Moyenne des prêts pour Réparations",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Building_a_house_or_an_annex_mean": "Moyenne des prêts pour Construction de maison ou annexe",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Hobby_mean": "Moyenne des prêts pour Loisirs",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Canceled_mean_y": "Moyenne des contrats annulés (précédentes applications)",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Other_B_mean": "Moyenne des clients accompagnés par 'Autre B'",
+    "SK_ID_CURR_NAME_PORTFOLIO_Cars_mean": "Moyenne des portefeuilles de type 'Voitures'",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Furniture_mean": "Moyenne des prêts pour Meubles",
+    "SK_ID_CURR_NAME_PRODUCT_TYPE_XNA_mean": "Moyenne des produits de type non spécifié",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Children_mean": "Moyenne des clients accompagnés par des enfants",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Auto_technology_mean": "Moyenne des demandes via industrie 'Technologie auto'",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Amortized_debt_mean": "Moyenne des dettes amorties",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Refused_mean_x": "Moyenne des contrats refusés (bureau)",
+    "SK_ID_CURR_CREDIT_ACTIVE_Bad_debt_mean": "Moyenne des créances irrécouvrables",
+    "SK_ID_CURR_NAME_YIELD_GROUP_low_normal_mean": "Moyenne des groupes de rendement 'faible normal'",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_FRIDAY_mean": "Moyenne des demandes commencées un vendredi",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Completed_mean_x": "Moyenne des contrats complétés (bureau)",
+    "SK_ID_CURR_CHANNEL_TYPE_Car_dealer_mean": "Moyenne des demandes via concessionnaire auto",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Construction_mean": "Moyenne des demandes via industrie 'Construction'",
+    "SK_ID_CURR_NAME_CONTRACT_TYPE_XNA_mean": "Moyenne des contrats de type non spécifié",
+    "SK_ID_CURR_CHANNEL_TYPE_Countrywide_mean": "Moyenne des demandes via canal 'National'",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Signed_mean_x": "Moyenne des contrats signés (bureau)",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Active_mean_x": "Moyenne des contrats actifs (bureau)",
+    "SK_ID_CURR_NAME_PORTFOLIO_Cash_mean": "Moyenne des portefeuilles de type 'Cash'",
+    "SK_ID_CURR_NAME_YIELD_GROUP_XNA_mean": "Moyenne des groupes de rendement non spécifiés",
+    "SK_ID_CURR_CREDIT_TYPE_Microloan_mean": "Moyenne des microcrédits",
+    "SK_ID_CURR_CHANNEL_TYPE_Regional__Local_mean": "Moyenne des demandes via canal 'Régional/Local'",
+    "SK_ID_CURR_CREDIT_TYPE_Loan_for_the_purchase_of_equipment_mean": "Moyenne des prêts pour l'achat d'équipement",
+    "SK_ID_CURR_CODE_REJECT_REASON_HC_mean": "Moyenne des rejets par 'HC'",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Group_of_people_mean": "Moyenne des clients accompagnés par un groupe",
+    "SK_ID_CURR_CODE_REJECT_REASON_SCOFR_mean": "Moyenne des rejets par 'SCOFR'",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Everyday_expenses_mean": "Moyenne des prêts pour Dépenses quotidiennes",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Tourism_mean": "Moyenne des prêts pour Tourisme",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Mobile_mean": "Moyenne des prêts pour Mobile",
+    "SK_ID_CURR_CREDIT_ACTIVE_Active_mean": "Moyenne des crédits 'actifs'",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Money_for_a_third_person_mean": "Moyenne des prêts pour Argent pour une tierce personne",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Other_mean": "Moyenne des prêts pour Autres buts",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Tourism_mean": "Moyenne des demandes via industrie 'Tourisme'",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Insurance_mean": "Moyenne des prêts pour Assurance",
+    "SK_ID_CURR_CREDIT_TYPE_Loan_for_purchase_of_shares_margin_lending_mean": "Moyenne des prêts pour achat d'actions/marge",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Business_development_mean": "Moyenne des prêts pour Développement commercial",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Unused_offer_mean": "Moyenne des offres non utilisées",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_XNA_mean": "Moyenne des prêts pour biens non spécifiés",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Furniture_mean": "Moyenne des demandes via industrie 'Meubles'",
+    "SK_ID_CURR_CREDIT_TYPE_Mobile_operator_loan_mean": "Moyenne des prêts d'opérateur mobile",
+    "SK_ID_CURR_CODE_REJECT_REASON_SYSTEM_mean": "Moyenne des rejets par système",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Education_mean": "Moyenne des prêts pour Éducation",
+    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_SUNDAY_mean": "Moyenne des demandes commencées un dimanche",
+    "SK_ID_CURR_NAME_PAYMENT_TYPE_Cash_through_the_bank_mean": "Moyenne des paiements en espèces via banque",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Payments_on_other_loans_mean": "Moyenne des prêts pour Paiements sur autres prêts",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Sport_and_Leisure_mean": "Moyenne des prêts pour Sport et Loisirs",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Approved_mean_y": "Moyenne des contrats approuvés (précédentes applications)",
+    "SK_ID_CURR_CREDIT_TYPE_Unknown_type_of_loan_mean": "Moyenne des types de prêts inconnus",
+    "SK_ID_CURR_NAME_PAYMENT_TYPE_XNA_mean": "Moyenne des types de paiement non spécifiés",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_used_car_mean": "Moyenne des prêts pour Achat de voiture d'occasion",
+    "SK_ID_CURR_NAME_CONTRACT_STATUS_Demand_mean_x": "Moyenne des contrats demandés (bureau)",
+    "SK_ID_CURR_NAME_TYPE_SUITE_Family_mean": "Moyenne des clients accompagnés par famille",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_XNA_mean": "Moyenne des demandes via industrie non spécifiée",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_new_car_mean": "Moyenne des prêts pour Achat de voiture neuve",
+    "SK_ID_CURR_NAME_CONTRACT_TYPE_Revolving_loans_mean": "Moyenne des prêts revolving",
+    "SK_ID_CURR_NAME_GOODS_CATEGORY_Weapon_mean": "Moyenne des prêts pour Armes",
+    "SK_ID_CURR_CODE_REJECT_REASON_VERIF_mean": "Moyenne des rejets par vérification",
+    "SK_ID_CURR_NAME_PORTFOLIO_XNA_mean": "Moyenne des portefeuilles de type non spécifié",
+    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Journey_mean": "Moyenne des prêts pour Voyage",
+    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Consumer_electronics_mean": "Moyenne des demandes via industrie 'Électronique grand public'",
+    "SK_ID_CURR_AMT_CREDIT_mean": "Moyenne du montant du crédit des anciens crédits",
+    "SK_ID_CURR_AMT_DRAWINGS_CURRENT_mean": "Moyenne des retraits actuels",
+    "NAME_CONTRACT_TYPE": "Type de contrat",
+    "NAME_TYPE_SUITE": "Type d'accompagnement de la demande",
+    "NAME_INCOME_TYPE": "Type de revenu",
+    "NAME_HOUSING_TYPE": "Type de logement",
+    "WEEKDAY_APPR_PROCESS_START": "Jour de la semaine de la demande",
+    "ORGANIZATION_TYPE": "Type d'organisation de l'emploi",
+    "FONDKAPREMONT_MODE": "Mode de financement de la réparation capitale",
+    "HOUSETYPE_MODE": "Type de maison",
+    "WALLSMATERIAL_MODE": "Matériau des murs",
+    "EMERGENCYSTATE_MODE": "État d'urgence du bâtiment",
+    "REGION_RATING_CLIENT": "Notation de la région (par le client)",
+    "REGION_RATING_CLIENT_W_CITY": "Notation de la région (par le client avec ville)",
+    "_AGE_YEARS": "Âge du client (années)",
+    "_EMPLOYED_YEARS": "Ancienneté d'emploi (années)"
+}
+
+# Colonnes réellement lues depuis le fichier (les colonnes préfixées par '_' sont dérivées)
+DATA_COLUMNS = ['SK_ID_CURR'] + [col for col in FEATURE_DESCRIPTIONS if not col.startswith('_')]
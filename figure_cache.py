@@ -0,0 +1,77 @@
+"""Cache LRU des parties « population » des graphiques Plotly.
+
+Le fond d'un graphique (histogramme d'une caractéristique, boîtes à
+moustaches par niveau d'éducation, cadran de la jauge) ne dépend que de la
+caractéristique, du seuil et de la version de la base. Il est construit une
+seule fois, sérialisé en JSON et gardé dans un cache commun à toutes les
+sessions, borné en nombre d'entrées et en octets (les moins récemment lues
+sont évincées). À chaque rerun, la figure est recréée depuis ce JSON sans
+revalidation (il sort de Plotly, déjà validé) et seules les traces propres au
+client (étoile, ligne verticale, clients similaires) y sont ajoutées.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+FIGURE_CACHE_MAX_ENTRIES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_ENTRIES", 256))
+FIGURE_CACHE_MAX_BYTES = int(float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", 32)) * 2 ** 20)
+
+
+class FigureCache:
+
+    def __init__(self, max_entries=FIGURE_CACHE_MAX_ENTRIES, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._specs)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+        if spec is None:
+            # Construction hors verrou : deux sessions peuvent construire la même figure,
+            # la seconde écrase simplement la première
+            spec = build().to_json()
+            self._store(key, spec)
+        return go.Figure(json.loads(spec), _validate=False)
+
+    def _store(self, key, spec):
+        size = len(spec)
+        with self._lock:
+            self.misses += 1
+            if size > self.max_bytes:
+                return
+            previous = self._specs.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+            self._specs[key] = spec
+            self.nbytes += size
+            while len(self._specs) > self.max_entries or self.nbytes > self.max_bytes:
+                _, evicted = self._specs.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._specs), "megabytes": self.nbytes / 2 ** 20,
+                    "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self.nbytes = 0
+
+
+# Cache partagé par tout le processus (toutes les sessions Streamlit)
+figure_cache = FigureCache()
@@ -0,0 +1,391 @@
+"""Matrice SHAP de toute une population, calculée hors ligne pour les vues globales.
+
+Un job (``python population_shap.py``) score une tranche de la base (toute la
+base, les N premiers clients ou un échantillon aléatoire) via l'API de
+prédiction, par blocs de requêtes simultanées, et range les résultats dans
+un répertoire de ``DASHBOARD_CACHE_DIR`` :
+
+* ``shap.npy`` : matrice float32 clients x caractéristiques, en ordre
+  colonne (Fortran) pour qu'une caractéristique soit contiguë sur disque ;
+* ``probabilities.npy`` : probabilité de défaut de chaque client ;
+* ``ids.npy`` : SK_ID_CURR triés, index des lignes des deux tableaux ;
+* ``meta.json`` : noms des caractéristiques, valeur de base SHAP, importance
+  moyenne |SHAP| et version de la base scorée.
+
+Les tableaux sont écrits directement dans des fichiers ``.npy`` projetés en
+mémoire, bloc par bloc : un job interrompu reprend là où il s'était arrêté.
+Le répertoire n'est publié (renommage atomique) qu'une fois complet. Le
+dashboard l'ouvre avec ``mmap_mode="r"`` : les pages sont partagées entre
+sessions et processus via le cache du système, et seules les colonnes
+affichées sont lues.
+
+Utilisation en ligne de commande ::
+
+    python population_shap.py --limit 50000 --workers 16
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import requests
+
+from api_client import API_URL, build_session
+from batch_scoring import score_payload
+from data_store import CACHE_DIR, ClientLookup, dataset_version, load_dataset
+from features import DATA_COLUMNS, FEATURE_DESCRIPTIONS
+from percentile_index import ColumnPercentiles
+from prediction_cache import PredictionCache
+
+POPULATION_SHAP_DIR = os.environ.get("POPULATION_SHAP_DIR",
+                                     os.path.join(CACHE_DIR, "population_shap"))
+DEFAULT_WORKERS = 16
+DEFAULT_CHUNK_SIZE = 1024
+META_FILE = "meta.json"
+# Couleurs habituelles des graphiques SHAP : valeur faible -> bleu, forte -> rose
+SHAP_COLORSCALE = [[0, "#008bfb"], [1, "#ff0051"]]
+CLIENT_COLOR = "red"
+
+
+def select_ids(all_ids, limit=None, sample=False, seed=0):
+    # Tranche de la base à scorer : tout, les `limit` premiers IDs ou un échantillon
+    ids = np.unique(np.asarray(all_ids, dtype=np.int64))
+    if limit is None or limit >= len(ids):
+        return ids
+    if sample:
+        return np.sort(np.random.default_rng(seed).choice(ids, size=limit, replace=False))
+    return ids[:limit]
+
+
+def _ids_digest(ids):
+    return hashlib.sha256(np.ascontiguousarray(ids, dtype=np.int64).tobytes()).hexdigest()
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(directory, meta):
+    tmp_path = os.path.join(directory, META_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+
+def _shap_dict(result):
+    # L'API renvoie {"error": ...} ou {"info": ...} quand le SHAP n'est pas calculable
+    shap_values = result.get("shap_values")
+    if not isinstance(shap_values, dict) or "error" in shap_values or "info" in shap_values:
+        return None
+    return shap_values
+
+
+def _allocate(directory, ids, features, meta):
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "ids.npy"), ids)
+    shap_matrix = np.lib.format.open_memmap(os.path.join(directory, "shap.npy"), mode="w+",
+                                            dtype=np.float32, shape=(len(ids), len(features)),
+                                            fortran_order=True)
+    shap_matrix[:] = np.nan
+    probabilities = np.lib.format.open_memmap(os.path.join(directory, "probabilities.npy"),
+                                              mode="w+", dtype=np.float32, shape=(len(ids),))
+    probabilities[:] = np.nan
+    done = np.lib.format.open_memmap(os.path.join(directory, "done.npy"), mode="w+",
+                                     dtype=np.bool_, shape=(len(ids),))
+    for array in (shap_matrix, probabilities, done):
+        array.flush()
+    _write_meta(directory, meta)
+
+
+def _publish(build_dir, output_dir):
+    # Les lecteurs qui ont déjà projeté l'ancienne version la gardent jusqu'à fermeture
+    old_dir = output_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(build_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def compute_population_shap(ids, lookup, output_dir=POPULATION_SHAP_DIR, url=API_URL,
+                            session=None, cache=None, max_workers=DEFAULT_WORKERS,
+                            chunk_size=DEFAULT_CHUNK_SIZE, version=None, resume=True,
+                            progress=None):
+    ids = np.asarray(ids, dtype=np.int64)
+    build_dir = output_dir + ".partial"
+    if session is None:
+        session = build_session(pool_maxsize=max_workers)
+
+    meta = _read_meta(build_dir) if resume else None
+    if meta is None or meta.get("ids_sha256") != _ids_digest(ids) or meta.get("url") != url:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        # La liste des caractéristiques est celle que renvoie l'API pour le premier client
+        features = None
+        for payload in lookup.get_many(ids[:32]):
+            if payload is not None:
+                shap_values = _shap_dict(score_payload(session, url, payload, cache))
+                if shap_values:
+                    features = list(shap_values)
+                    break
+        if features is None:
+            raise RuntimeError("L'API ne renvoie pas de valeurs SHAP pour les premiers clients.")
+        meta = {"ids_sha256": _ids_digest(ids), "url": url, "dataset_version": version,
+                "features": features, "expected_value": None, "complete": False}
+        _allocate(build_dir, ids, features, meta)
+
+    features = meta["features"]
+    positions = {feature: j for j, feature in enumerate(features)}
+    shap_matrix = np.load(os.path.join(build_dir, "shap.npy"), mmap_mode="r+")
+    probabilities = np.load(os.path.join(build_dir, "probabilities.npy"), mmap_mode="r+")
+    done = np.load(os.path.join(build_dir, "done.npy"), mmap_mode="r+")
+
+    todo = np.flatnonzero(~done)
+    total = len(ids)
+    completed = total - len(todo)
+    n_errors = 0
+    if progress is not None:
+        progress(completed, total)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for start in range(0, len(todo), chunk_size):
+            rows = todo[start:start + chunk_size]
+            futures = {}
+            for row, payload in zip(rows, lookup.get_many(ids[rows])):
+                if payload is None:
+                    n_errors += 1
+                else:
+                    futures[pool.submit(score_payload, session, url, payload, cache)] = row
+            block_rows, block_values = [], np.full((len(futures), len(features)), np.nan,
+                                                   dtype=np.float32)
+            for future, row in futures.items():
+                try:
+                    result = future.result()
+                # ValueError : JSON illisible ou réponse sans probabilité valide (score_payload)
+                except (requests.exceptions.RequestException, ValueError):
+                    n_errors += 1
+                    continue
+                shap_values = _shap_dict(result)
+                if shap_values is None:
+                    n_errors += 1
+                    continue
+                for feature, value in shap_values.items():
+                    j = positions.get(feature)
+                    if j is not None and value is not None:
+                        block_values[len(block_rows), j] = value
+                block_rows.append(row)
+                probabilities[row] = result.get("probability_default", np.nan)
+                if meta["expected_value"] is None and result.get("shap_expected_value") is not None:
+                    meta["expected_value"] = float(result["shap_expected_value"])
+            if block_rows:
+                shap_matrix[block_rows] = block_values[:len(block_rows)]
+                done[block_rows] = True
+            # Le bloc est sur disque avant de passer au suivant : c'est le point de reprise
+            for array in (shap_matrix, probabilities, done):
+                array.flush()
+            completed += len(rows)
+            if progress is not None:
+                progress(completed, total)
+
+    n_done = int(done.sum())
+    # Importance globale calculée une fois pour toutes, colonne par colonne
+    mean_abs = [float(np.nanmean(np.abs(shap_matrix[done, j]))) if n_done else 0.0
+                for j in range(len(features))]
+    del shap_matrix, probabilities, done
+    meta.update({"complete": True, "n_rows": total, "n_scored": n_done,
+                 "mean_abs_shap": mean_abs, "created": time.time()})
+    _write_meta(build_dir, meta)
+    _publish(build_dir, output_dir)
+    return PopulationShap(output_dir), n_errors
+
+
+class PopulationShap:
+    """Lecture en mémoire projetée d'une matrice SHAP publiée par le job."""
+
+    def __init__(self, directory=POPULATION_SHAP_DIR):
+        meta = _read_meta(directory)
+        if meta is None or not meta.get("complete"):
+            raise FileNotFoundError(f"Aucune matrice SHAP complète dans {directory}")
+        self.directory = directory
+        self.features = meta["features"]
+        self.expected_value = meta.get("expected_value")
+        self.dataset_version = meta.get("dataset_version")
+        self.mean_abs = np.asarray(meta["mean_abs_shap"], dtype=np.float64)
+        self._positions = {feature: j for j, feature in enumerate(self.features)}
+        self.ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        self.values = np.load(os.path.join(directory, "shap.npy"), mmap_mode="r")
+        self.probabilities = np.load(os.path.join(directory, "probabilities.npy"), mmap_mode="r")
+        # Lignes effectivement scorées (les autres sont restées NaN)
+        self.scored_rows = np.flatnonzero(np.load(os.path.join(directory, "done.npy")))
+        # Percentiles par caractéristique, calculés au premier appel (un seul tri par colonne)
+        self._percentiles = {}
+
+    @classmethod
+    def open(cls, directory=POPULATION_SHAP_DIR):
+        try:
+            return cls(directory)
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return None
+
+    def __len__(self):
+        return len(self.scored_rows)
+
+    def __contains__(self, feature):
+        return feature in self._positions
+
+    def importance(self):
+        return (pd.DataFrame({"feature": self.features, "mean_abs_shap": self.mean_abs})
+                .sort_values("mean_abs_shap", ascending=False, ignore_index=True))
+
+    def feature_shap(self, feature, rows=None):
+        # Colonne contiguë sur disque : seule cette caractéristique est lue
+        column = self.values[:, self._positions[feature]]
+        return np.asarray(column[self.scored_rows if rows is None else rows])
+
+    def sample_rows(self, max_rows, seed=0):
+        if len(self.scored_rows) <= max_rows:
+            return self.scored_rows
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(self.scored_rows, size=max_rows, replace=False))
+
+    def shap_percentile(self, feature, value):
+        percentiles = self._percentiles.get(feature)
+        if percentiles is None:
+            percentiles = ColumnPercentiles(self.feature_shap(feature).astype(np.float64))
+            self._percentiles[feature] = percentiles
+        return float(percentiles.percentile(value)[0])
+
+
+def _label(feature):
+    return FEATURE_DESCRIPTIONS.get(feature, feature)
+
+
+def importance_figure(store, top_n=20):
+    importance = store.importance().head(top_n).iloc[::-1]
+    fig = go.Figure(go.Bar(
+        x=importance["mean_abs_shap"], y=[_label(f) for f in importance["feature"]],
+        orientation="h", marker_color="#636EFA",
+        hovertemplate="%{y}<br>|SHAP| moyen : %{x:.4f}<extra></extra>"))
+    fig.update_layout(title=f"Importance moyenne des caractéristiques ({len(store)} clients)",
+                      xaxis_title="Moyenne de |valeur SHAP|", height=max(400, 22 * len(importance)),
+                      margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+
+def beeswarm_figure(store, rows, feature_values=None, top_n=15, client_shap=None, seed=0):
+    """Nuage des valeurs SHAP par caractéristique, coloré par la valeur de la caractéristique.
+
+    ``rows`` sont les lignes de la matrice à afficher (un échantillon) et
+    ``feature_values`` un DataFrame aligné sur ces lignes ; sans lui, les points
+    sont gris. La dispersion verticale est un tirage aléatoire fixe, une
+    approximation du placement en essaim qui reste lisible et se calcule
+    en temps constant par point.
+    """
+    features = store.importance()["feature"].head(top_n).tolist()[::-1]
+    rng = np.random.default_rng(seed)
+    xs, ys, colors, hover = [], [], [], []
+    for i, feature in enumerate(features):
+        shap_values = store.feature_shap(feature, rows)
+        keep = np.isfinite(shap_values)
+        xs.append(shap_values[keep])
+        ys.append(i + (rng.random(keep.sum()) - 0.5) * 0.7)
+        if feature_values is not None and feature in feature_values.columns:
+            values = pd.to_numeric(feature_values[feature], errors="coerce").to_numpy()[keep]
+            # Rang centile dans l'échantillon : les variables asymétriques restent lisibles
+            colors.append(pd.Series(values).rank(pct=True).to_numpy())
+            hover.append(values)
+        else:
+            colors.append(np.full(keep.sum(), np.nan))
+            hover.append(np.full(keep.sum(), np.nan))
+    fig = go.Figure(go.Scattergl(
+        x=np.concatenate(xs), y=np.concatenate(ys), mode="markers",
+        marker=dict(size=4, color=np.concatenate(colors), colorscale=SHAP_COLORSCALE,
+                    cmin=0, cmax=1, opacity=0.6,
+                    colorbar=dict(title="Valeur", tickvals=[0, 1], ticktext=["faible", "élevée"])),
+        customdata=np.concatenate(hover),
+        hovertemplate="SHAP : %{x:.4f}<br>Valeur : %{customdata:.4g}<extra></extra>",
+        name="Population", showlegend=False))
+    if client_shap:
+        client_features = [(i, client_shap[f]) for i, f in enumerate(features)
+                           if isinstance(client_shap.get(f), (int, float))]
+        if client_features:
+            fig.add_trace(go.Scatter(
+                x=[v for _, v in client_features], y=[i for i, _ in client_features],
+                mode="markers", marker=dict(color=CLIENT_COLOR, size=12, symbol="star",
+                                            line=dict(color="black", width=1)),
+                name="Client Actuel", hovertemplate="Client : %{x:.4f}<extra></extra>"))
+    fig.add_vline(x=0, line_color="gray", line_width=1)
+    fig.update_layout(title="Impact des caractéristiques sur la population (SHAP)",
+                      xaxis_title="Valeur SHAP (impact sur la probabilité de défaut)",
+                      yaxis=dict(tickvals=list(range(len(features))),
+                                 ticktext=[_label(f) for f in features]),
+                      height=max(450, 32 * len(features)), margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+
+def shap_distribution_figure(store, feature, client_value=None, bins=60):
+    column = store.feature_shap(feature)
+    column = column[np.isfinite(column)]
+    counts, edges = np.histogram(column, bins=bins) if len(column) else (np.zeros(0), np.zeros(1))
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                           marker_color="#636EFA", name="Population",
+                           hovertemplate="SHAP ≈ %{x:.4f}<br>%{y} clients<extra></extra>"))
+    if client_value is not None:
+        fig.add_vline(x=client_value, line_color=CLIENT_COLOR, line_dash="dash", line_width=3,
+                      annotation_text="Client Actuel", annotation_position="top")
+    fig.update_layout(title=f"Impact SHAP de « {_label(feature)} » sur la population",
+                      xaxis_title="Valeur SHAP", yaxis_title="Nombre de clients",
+                      bargap=0, height=400, margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcule la matrice SHAP d'une tranche de la base via l'API.")
+    parser.add_argument("--data", default="application_train.csv", help="Jeu de données clients")
+    parser.add_argument("-o", "--output-dir", default=POPULATION_SHAP_DIR)
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Nombre de clients à scorer (toute la base par défaut)")
+    parser.add_argument("--sample", action="store_true",
+                        help="Échantillon aléatoire plutôt que les premiers IDs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=API_URL)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore un calcul interrompu et repart de zéro")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="N'utilise pas le cache partagé des prédictions")
+    args = parser.parse_args(argv)
+
+    df = load_dataset(args.data, DATA_COLUMNS)
+    lookup = ClientLookup(df)
+    ids = select_ids(df["SK_ID_CURR"], args.limit, args.sample, args.seed)
+    del df
+
+    def report(done, total):
+        print(f"\r{done}/{total} clients scorés", end="", file=sys.stderr, flush=True)
+
+    cache = None if args.no_cache else PredictionCache()
+    store, n_errors = compute_population_shap(
+        ids, lookup, args.output_dir, url=args.url, cache=cache, max_workers=args.workers,
+        chunk_size=args.chunk_size, version=dataset_version(args.data),
+        resume=not args.no_resume, progress=report)
+    print(file=sys.stderr)
+    print(f"{len(store)} clients x {len(store.features)} caractéristiques écrits dans "
+          f"{args.output_dir} ({n_errors} en erreur).")
+    return 1 if n_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""Résumés de distribution pré-calculés sur l'ensemble de la base clients.
+
+Les histogrammes de comparaison sont construits à partir de ces agrégats
+(bornes et effectifs des classes, quantiles, statistiques de boîte à
+moustaches, effectifs par modalité) calculés une fois par version du jeu de
+données, et non plus à partir d'un échantillon de lignes brutes. De même,
+l'analyse bi-variée affiche une grille de densité 2D (ou des statistiques par
+modalité) calculée sur toutes les lignes : la taille du graphique envoyé au
+navigateur ne dépend plus du nombre de clients.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from tracing import traced
+
+HISTOGRAM_BINS = 50
+DENSITY_BINS = 60
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+HIST_COLOR = "#636EFA"  # première couleur de px.colors.qualitative.Plotly
+PEER_COLOR = "#FFA15A"
+
+
+def is_categorical_feature(series):
+    return not pd.api.types.is_numeric_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _to_float_array(series):
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _is_number(value):
+    return (isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+            and np.isfinite(value))
+
+
+def peer_feature_values(peers, feature):
+    # Valeurs d'une caractéristique pour les clients similaires (None si indisponible)
+    if peers is None or feature not in peers.columns:
+        return None
+    column = peers[feature]
+    if is_categorical_feature(column):
+        return column.astype(object).where(column.notna(), None).tolist()
+    return _to_float_array(column).tolist()
+
+
+def _peers_trace(x, y, ids):
+    return go.Scatter(x=x, y=y, mode="markers", customdata=ids, name="Clients similaires",
+                      marker=dict(color=PEER_COLOR, size=9, symbol="diamond",
+                                  line=dict(color="black", width=1)),
+                      hovertemplate="Client similaire %{customdata}<br>X: %{x}<br>Y: %{y}"
+                                    "<extra></extra>")
+
+
+def box_stats(values):
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    # Moustaches « à la Tukey » comme dans la boîte marginale de px.histogram
+    in_fences = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {"min": float(values.min()), "max": float(values.max()),
+            "q1": float(q1), "median": float(median), "q3": float(q3),
+            "lowerfence": float(in_fences.min()), "upperfence": float(in_fences.max()),
+            "mean": float(values.mean()), "count": int(len(values))}
+
+
+def summarize_numeric(series, bins=HISTOGRAM_BINS):
+    values = _to_float_array(series)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return None
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        "kind": "numeric",
+        "count": int(len(values)),
+        "missing": int(len(series) - len(values)),
+        "mean": float(values.mean()),
+        "bin_edges": edges,
+        "bin_counts": counts,
+        "quantiles": dict(zip(QUANTILES, np.quantile(values, QUANTILES).tolist())),
+        "box": box_stats(values),
+    }
+
+
+def summarize_categorical(series):
+    counts = series.value_counts(sort=False, dropna=True)
+    counts = counts[counts > 0]
+    return {
+        "kind": "categorical",
+        "count": int(counts.sum()),
+        "missing": int(series.isna().sum()),
+        "categories": [str(c) for c in counts.index],
+        "category_counts": counts.to_numpy(dtype=np.int64),
+    }
+
+
+@traced("distribution_summaries.compute")
+def compute_distribution_summaries(df, features, bins=HISTOGRAM_BINS):
+    summaries = {}
+    for feature in features:
+        if feature not in df.columns:
+            continue
+        series = df[feature]
+        if is_categorical_feature(series):
+            summaries[feature] = summarize_categorical(series)
+        else:
+            summary = summarize_numeric(series, bins=bins)
+            if summary is not None:
+                summaries[feature] = summary
+    return summaries
+
+
+def distribution_base_figure(summary, title):
+    # Partie population de l'histogramme, identique pour tous les clients
+    if summary["kind"] == "categorical":
+        fig = go.Figure(go.Bar(x=list(summary["categories"]), y=list(summary["category_counts"]),
+                               marker_color=HIST_COLOR,
+                               hovertemplate="%{x}<br>Nombre de clients : %{y}<extra></extra>"))
+        fig.update_layout(title=title, xaxis_title=None, yaxis_title="Nombre de clients",
+                          showlegend=False)
+        return fig
+
+    edges = summary["bin_edges"]
+    box = summary["box"]
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8],
+                        vertical_spacing=0.02)
+    fig.add_trace(go.Box(q1=[box["q1"]], median=[box["median"]], q3=[box["q3"]],
+                         lowerfence=[box["lowerfence"]], upperfence=[box["upperfence"]],
+                         mean=[summary["mean"]], orientation="h", y=[""], name="",
+                         marker_color=HIST_COLOR, hoverinfo="x"), row=1, col=1)
+    fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=summary["bin_counts"],
+                         width=np.diff(edges), marker_color=HIST_COLOR, name="",
+                         customdata=np.stack([edges[:-1], edges[1:]], axis=1),
+                         hovertemplate="[%{customdata[0]:.4g} ; %{customdata[1]:.4g}[<br>"
+                                       "Nombre de clients : %{y}<extra></extra>"),
+                  row=2, col=1)
+    fig.update_layout(title=title, showlegend=False, bargap=0)
+    fig.update_yaxes(title_text="Nombre de clients", row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    return fig
+
+
+def add_distribution_overlay(fig, summary, client_value=None, peer_values=None, peer_ids=None):
+    # Traces propres au client, ajoutées sur une figure de distribution_base_figure ;
+    # les axes sont nommés explicitement car la figure peut sortir du cache JSON
+    # (sans la grille de make_subplots)
+    if summary["kind"] == "categorical":
+        categories = list(summary["categories"])
+        counts = list(summary["category_counts"])
+        if client_value is not None and str(client_value) not in categories:
+            categories.append(str(client_value))
+            counts.append(0)
+            fig.data[0].x, fig.data[0].y = categories, counts
+        if client_value is not None:
+            fig.add_annotation(x=str(client_value), y=1, text="Client", showarrow=True,
+                               arrowhead=2, arrowcolor="red", font=dict(color="red"),
+                               yref="paper", xref="x")
+        if peer_values:
+            peer_counts = pd.Series([str(v) for v in peer_values if v is not None]).value_counts()
+            bar_heights = dict(zip(categories, counts))
+            shown = [c for c in peer_counts.index if c in bar_heights]
+            fig.add_trace(go.Scatter(
+                x=shown, y=[bar_heights[c] for c in shown], mode="markers+text",
+                text=[f"{peer_counts[c]} similaire(s)" for c in shown], textposition="top center",
+                marker=dict(color=PEER_COLOR, size=10, symbol="diamond",
+                            line=dict(color="black", width=1)),
+                name="Clients similaires", hoverinfo="text"))
+        return fig
+
+    if isinstance(client_value, (int, float)) and not isinstance(client_value, bool):
+        # Une ligne par sous-graphique : add_vline ne retrouve pas la grille sur une figure
+        # relue depuis le JSON et ne tracerait que dans la boîte du haut
+        for xref, yref in (("x", "y domain"), ("x2", "y2 domain")):
+            fig.add_shape(type="line", x0=client_value, x1=client_value, y0=0, y1=1,
+                          xref=xref, yref=yref, line=dict(color="red", dash="dash"))
+        fig.add_annotation(x=client_value, y=1, xref="x2", yref="y2 domain",
+                           text=f"Client: {client_value:.2f}", showarrow=False,
+                           xanchor="left", yanchor="top", font=dict(color="red"))
+    if peer_values:
+        # Clients similaires : losanges au pied de l'histogramme (2e ligne de la grille)
+        points = [(v, i) for v, i in zip(peer_values, peer_ids or [""] * len(peer_values))
+                  if _is_number(v)]
+        if points:
+            fig.add_trace(go.Scatter(
+                x=[v for v, _ in points], y=[0] * len(points), mode="markers",
+                customdata=[i for _, i in points], name="Clients similaires",
+                xaxis="x2", yaxis="y2",
+                marker=dict(color=PEER_COLOR, size=10, symbol="diamond",
+                            line=dict(color="black", width=1)),
+                hovertemplate="Client similaire %{customdata}<br>%{x:.4g}<extra></extra>"))
+    return fig
+
+
+def distribution_figure(summary, title, client_value=None, peer_values=None, peer_ids=None):
+    return add_distribution_overlay(distribution_base_figure(summary, title), summary,
+                                    client_value, peer_values, peer_ids)
+
+
+@traced("pair_aggregate.compute", attributes=("feature_x", "feature_y"))
+def compute_pair_aggregate(df, feature_x, feature_y, bins=DENSITY_BINS):
+    x, y = df[feature_x], df[feature_y]
+    x_is_cat, y_is_cat = is_categorical_feature(x), is_categorical_feature(y)
+
+    if not x_is_cat and not y_is_cat:
+        x_values, y_values = _to_float_array(x), _to_float_array(y)
+        mask = np.isfinite(x_values) & np.isfinite(y_values)
+        if not mask.any():
+            return None
+        counts, x_edges, y_edges = np.histogram2d(x_values[mask], y_values[mask], bins=bins)
+        return {"kind": "density", "count": int(mask.sum()), "counts": counts,
+                "x_edges": x_edges, "y_edges": y_edges}
+
+    if x_is_cat and y_is_cat:
+        table = pd.crosstab(x.rename("x").astype(str).where(x.notna()),
+                            y.rename("y").astype(str).where(y.notna()))
+        if table.empty:
+            return None
+        return {"kind": "crosstab", "count": int(table.to_numpy().sum()), "counts": table.to_numpy(),
+                "x_categories": list(table.index), "y_categories": list(table.columns)}
+
+    # Une caractéristique catégorielle, une numérique : boîtes à moustaches par modalité
+    categories, numbers = (x, y) if x_is_cat else (y, x)
+    values = _to_float_array(numbers)
+    mask = np.isfinite(values) & categories.notna().to_numpy()
+    if not mask.any():
+        return None
+    groups = pd.Series(values[mask]).groupby(categories.astype(str).to_numpy()[mask], sort=True)
+    boxes = {str(name): box_stats(group.to_numpy()) for name, group in groups}
+    return {"kind": "grouped", "count": int(mask.sum()), "boxes": boxes,
+            "categorical_axis": "x" if x_is_cat else "y"}
+
+
+def _client_star(client_x, client_y):
+    return go.Scatter(x=[client_x], y=[client_y], mode="markers",
+                      marker=dict(color="red", size=12, symbol="star"), name="Client Actuel",
+                      hovertemplate=f"Client X: {client_x}<br>Client Y: {client_y}<extra></extra>")
+
+
+def _plot_point(aggregate, x, y):
+    # Coordonnées affichables d'un point (client ou client similaire), ou None
+    kind = aggregate["kind"]
+    if kind == "density":
+        return (x, y) if _is_number(x) and _is_number(y) else None
+    if kind == "crosstab":
+        if (x is not None and y is not None and str(x) in aggregate["x_categories"]
+                and str(y) in aggregate["y_categories"]):
+            return str(x), str(y)
+        return None
+    vertical = aggregate["categorical_axis"] == "x"
+    category_value, number_value = (x, y) if vertical else (y, x)
+    if category_value is None or str(category_value) not in aggregate["boxes"] \
+            or not _is_number(number_value):
+        return None
+    return (str(category_value), number_value) if vertical else (number_value, str(category_value))
+
+
+def bivariate_figure(aggregate, title, client_x=None, client_y=None, peer_x=None, peer_y=None,
+                     peer_ids=None):
+    fig = go.Figure()
+    kind = aggregate["kind"]
+    if kind == "density":
+        x_edges, y_edges = aggregate["x_edges"], aggregate["y_edges"]
+        counts = aggregate["counts"].T
+        fig.add_trace(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts > 0, counts, np.nan), colorscale="Blues",
+            colorbar=dict(title="Clients"),
+            hovertemplate="X: %{x:.4g}<br>Y: %{y:.4g}<br>Nombre de clients : %{z}<extra></extra>"))
+    elif kind == "crosstab":
+        fig.add_trace(go.Heatmap(
+            x=aggregate["x_categories"], y=aggregate["y_categories"], z=aggregate["counts"].T,
+            colorscale="Blues", colorbar=dict(title="Clients"),
+            hovertemplate="%{x} / %{y}<br>Nombre de clients : %{z}<extra></extra>"))
+    else:
+        names = list(aggregate["boxes"])
+        stats = [aggregate["boxes"][name] for name in names]
+        vertical = aggregate["categorical_axis"] == "x"
+        fig.add_trace(go.Box(
+            **{"x" if vertical else "y": names},
+            q1=[b["q1"] for b in stats], median=[b["median"] for b in stats],
+            q3=[b["q3"] for b in stats], lowerfence=[b["lowerfence"] for b in stats],
+            upperfence=[b["upperfence"] for b in stats], mean=[b["mean"] for b in stats],
+            orientation="v" if vertical else "h", marker_color=HIST_COLOR, name=""))
+    if peer_x is not None and peer_y is not None:
+        ids = peer_ids if peer_ids is not None else [""] * len(peer_x)
+        points = [(_plot_point(aggregate, x, y), i) for x, y, i in zip(peer_x, peer_y, ids)]
+        points = [(point, i) for point, i in points if point is not None]
+        if points:
+            fig.add_trace(_peers_trace([p[0] for p, _ in points], [p[1] for p, _ in points],
+                                       [i for _, i in points]))
+    client_point = _plot_point(aggregate, client_x, client_y)
+    if client_point is not None:
+        fig.add_trace(_client_star(*client_point))
+    fig.update_layout(title=title, showlegend=False)
+    return fig
@@ -0,0 +1,119 @@
+"""Cache des réponses de l'API de prédiction, partagé entre sessions.
+
+La clé est un hash du payload client canonisé (clés triées, flottants
+normalisés), si bien que deux soumissions identiques du formulaire ne
+déclenchent qu'un seul appel réseau. Le stockage SQLite est commun à toutes
+les sessions et à tous les processus d'une même machine ; les entrées
+expirent après un TTL et les moins récemment lues sont évincées au-delà de
+``max_entries``. Seules les réponses portant une probabilité valide sont
+gardées : une erreur passagère de l'API n'est pas servie pendant tout le TTL.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from data_store import CACHE_DIR
+
+PREDICTION_CACHE_PATH = os.environ.get("PREDICTION_CACHE_PATH",
+                                       os.path.join(CACHE_DIR, "predictions.sqlite3"))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", 24 * 3600))
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get("PREDICTION_CACHE_MAX_ENTRIES", 10000))
+FLOAT_SIGNIFICANT_DIGITS = 10
+
+# Champs de la réponse /predict conservés dans le cache
+CACHED_RESULT_FIELDS = ("probability_default", "prediction_class", "optimal_threshold_used",
+                        "shap_values", "shap_expected_value")
+
+
+def _canonical_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and math.isnan(value):
+            return "nan"
+        # 250000 et 250000.0 (ou 0.1 + 0.2 et 0.3) donnent la même clé
+        return format(float(value), f".{FLOAT_SIGNIFICANT_DIGITS}g")
+    return str(value)
+
+
+def is_valid_result(result):
+    # Réponse exploitable : une probabilité de défaut finie dans [0, 1]
+    if not isinstance(result, dict):
+        return False
+    probability = result.get("probability_default")
+    if isinstance(probability, bool) or not isinstance(probability, (int, float)):
+        return False
+    return 0.0 <= probability <= 1.0
+
+
+def payload_key(payload, namespace=""):
+    canonical = {str(k): _canonical_value(v) for k, v in payload.items()}
+    blob = json.dumps([namespace, canonical], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+
+    def __init__(self, path=PREDICTION_CACHE_PATH, ttl_seconds=PREDICTION_CACHE_TTL,
+                 max_entries=PREDICTION_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " key TEXT PRIMARY KEY, result TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS predictions_last_access ON predictions(last_access)")
+
+    def get(self, payload, namespace=""):
+        key = payload_key(payload, namespace)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM predictions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (now, key))
+        result = json.loads(row[0])
+        # Entrées écrites avant la validation dans set : une réponse d'erreur n'est pas servie
+        return result if is_valid_result(result) else None
+
+    def set(self, payload, result, namespace=""):
+        # Renvoie False sans rien écrire pour une réponse sans probabilité valide
+        if not is_valid_result(result):
+            return False
+        key = payload_key(payload, namespace)
+        stored = {field: result.get(field) for field in CACHED_RESULT_FIELDS}
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions (key, result, created_at, last_access)"
+                " VALUES (?, ?, ?, ?)", (key, json.dumps(stored), now, now))
+            self._conn.execute("DELETE FROM predictions WHERE created_at < ?",
+                               (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions"
+                " ORDER BY last_access DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+        return True
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM predictions")
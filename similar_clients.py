@@ -0,0 +1,253 @@
+"""Recherche des clients de la base les plus proches du client affiché.
+
+Chaque client est représenté par ses caractéristiques de
+``FEATURE_DESCRIPTIONS`` : numériques centrées-réduites (valeur manquante =
+moyenne), catégorielles en one-hot pondéré par 1/√2 pour qu'un changement de
+modalité compte comme un écart d'un écart-type. La recherche est exacte :
+les vecteurs (quelques centaines de dimensions) de toute la base sont gardés
+en float32 et une requête est un produit matrice-vecteur par blocs de
+lignes, quelques dizaines de millisecondes pour 300 000 clients. Une
+projection sur les premières composantes principales serait plus légère,
+mais elle n'explique qu'une petite part de la variance de ces
+caractéristiques peu corrélées : la plupart des vrais voisins en sortaient.
+
+L'index est encodé par blocs de lignes, directement dans sa matrice finale,
+puis enregistré dans ``DASHBOARD_CACHE_DIR`` sous un nom qui dépend de la
+somme de contrôle du CSV et de la liste des caractéristiques : un redémarrage
+le relit au lieu de le reconstruire.
+"""
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_store import CACHE_DIR, _replace_from_tmp
+from features import FEATURE_DESCRIPTIONS
+
+logger = logging.getLogger(__name__)
+
+BUILD_CHUNK_ROWS = 20000
+QUERY_BLOCK_ROWS = 65536
+DEFAULT_NEIGHBOURS = 10
+CATEGORY_WEIGHT = np.float32(1 / np.sqrt(2))
+INDEX_FORMAT_VERSION = 2
+
+
+def _is_numeric(series):
+    return (pd.api.types.is_numeric_dtype(series)
+            and not isinstance(series.dtype, pd.CategoricalDtype)
+            and not pd.api.types.is_bool_dtype(series))
+
+
+class FeatureEncoder:
+    """Passage d'une ligne client au vecteur centré-réduit + one-hot."""
+
+    def __init__(self, numeric_features, means, stds, categorical_features, categories):
+        self.numeric_features = list(numeric_features)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.stds = np.asarray(stds, dtype=np.float64)
+        self.categorical_features = list(categorical_features)
+        # Une liste de modalités (chaînes) par caractéristique catégorielle
+        self.categories = [list(c) for c in categories]
+        self.width = len(self.numeric_features) + sum(len(c) for c in self.categories)
+        self._numeric_positions = {f: j for j, f in enumerate(self.numeric_features)}
+        self._category_positions = {}
+        offset = len(self.numeric_features)
+        for feature, categories in zip(self.categorical_features, self.categories):
+            for k, category in enumerate(categories):
+                self._category_positions[(feature, category)] = offset + k
+            offset += len(categories)
+
+    @classmethod
+    def fit(cls, df, features):
+        numeric = [f for f in features if f in df.columns and _is_numeric(df[f])]
+        categorical = [f for f in features if f in df.columns and f not in numeric]
+        means, stds = [], []
+        for feature in numeric:
+            values = df[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+            mean = np.nanmean(values) if np.isfinite(values).any() else 0.0
+            std = np.nanstd(values) if np.isfinite(values).any() else 0.0
+            means.append(mean)
+            stds.append(std if std > 0 else 1.0)
+        categories = [sorted(str(c) for c in df[f].dropna().unique()) for f in categorical]
+        return cls(numeric, means, stds, categorical, categories)
+
+    def encode(self, get_column, n_rows):
+        # get_column(feature) -> tableau de n_rows valeurs (None si absente)
+        encoded = np.zeros((n_rows, self.width), dtype=np.float32)
+        for j, feature in enumerate(self.numeric_features):
+            values = get_column(feature)
+            if values is None:
+                continue
+            z = (np.asarray(values, dtype=np.float64) - self.means[j]) / self.stds[j]
+            encoded[:, j] = np.where(np.isfinite(z), z, 0.0)
+        offset = len(self.numeric_features)
+        for feature, categories in zip(self.categorical_features, self.categories):
+            values = get_column(feature)
+            if values is not None:
+                codes = pd.Categorical(pd.Series(values, dtype=object).astype(str),
+                                       categories=categories).codes.astype(np.int64)
+                rows = np.flatnonzero(codes >= 0)
+                encoded[rows, offset + codes[rows]] = CATEGORY_WEIGHT
+            offset += len(categories)
+        return encoded
+
+    def encode_frame(self, df):
+        def get_column(feature):
+            if feature not in df.columns:
+                return None
+            if feature in self.numeric_features:
+                return df[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+            return df[feature].astype(object).where(df[feature].notna(), None).to_numpy()
+        return self.encode(get_column, len(df))
+
+    def encode_client(self, client_data):
+        # Chemin direct pour une seule ligne : pas de conversion pandas par colonne
+        encoded = np.zeros(self.width, dtype=np.float32)
+        for feature, value in client_data.items():
+            if value is None:
+                continue
+            j = self._numeric_positions.get(feature)
+            if j is not None:
+                try:
+                    z = (float(value) - self.means[j]) / self.stds[j]
+                except (TypeError, ValueError):
+                    continue
+                encoded[j] = z if np.isfinite(z) else 0.0
+            else:
+                position = self._category_positions.get((feature, str(value)))
+                if position is not None:
+                    encoded[position] = CATEGORY_WEIGHT
+        return encoded
+
+
+def default_features():
+    # Les caractéristiques dérivées (préfixe _) doublonnent leurs colonnes sources
+    return [f for f in FEATURE_DESCRIPTIONS if not f.startswith("_")]
+
+
+def index_path(dataset_version, features, cache_dir=CACHE_DIR):
+    fingerprint = hashlib.sha256(
+        "\n".join([str(INDEX_FORMAT_VERSION)] + list(features)).encode()
+    ).hexdigest()[:12]
+    return os.path.join(cache_dir, f"similar_clients-{dataset_version[:16]}-{fingerprint}.npz")
+
+
+class SimilarClientsIndex:
+
+    def __init__(self, ids, vectors, encoder):
+        self.ids = ids
+        # Une ligne par client de df_full, dans le même ordre : sorties de FeatureEncoder
+        self.vectors = vectors
+        self.squared_norms = np.einsum("ij,ij->i", vectors, vectors)
+        self.encoder = encoder
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, df, features=None, chunk_rows=BUILD_CHUNK_ROWS):
+        features = default_features() if features is None else features
+        encoder = FeatureEncoder.fit(df, features)
+        # Encodage par blocs de lignes, directement dans la matrice finale
+        vectors = np.empty((len(df), encoder.width), dtype=np.float32)
+        for start in range(0, len(df), chunk_rows):
+            block = encoder.encode_frame(df.iloc[start:start + chunk_rows])
+            vectors[start:start + len(block)] = block
+        ids = df["SK_ID_CURR"].to_numpy(dtype=np.int64)
+        return cls(ids, vectors, encoder)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        encoder = self.encoder
+        flat_categories = [f"{feature}={category}" for feature, categories
+                           in zip(encoder.categorical_features, encoder.categories)
+                           for category in categories]
+        arrays = dict(ids=self.ids, vectors=self.vectors,
+                      numeric_features=np.array(encoder.numeric_features, dtype=str),
+                      means=encoder.means, stds=encoder.stds,
+                      categorical_features=np.array(encoder.categorical_features, dtype=str),
+                      category_counts=np.array([len(c) for c in encoder.categories], dtype=np.int64),
+                      categories=np.array(flat_categories, dtype=str))
+
+        def write(tmp_path):
+            # Écrit dans un fichier ouvert : np.savez ajouterait .npz au nom temporaire
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+        _replace_from_tmp(path, write)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            categorical_features = data["categorical_features"].tolist()
+            flat_categories = data["categories"].tolist()
+            categories, start = [], 0
+            for feature, count in zip(categorical_features, data["category_counts"]):
+                categories.append([c[len(feature) + 1:] for c in flat_categories[start:start + count]])
+                start += count
+            encoder = FeatureEncoder(data["numeric_features"].tolist(), data["means"],
+                                     data["stds"], categorical_features, categories)
+            return cls(data["ids"], data["vectors"], encoder)
+
+    @classmethod
+    def load_or_build(cls, df, dataset_version=None, features=None, cache_dir=CACHE_DIR):
+        features = default_features() if features is None else features
+        if dataset_version is None:
+            return cls.build(df, features)
+        path = index_path(dataset_version, features, cache_dir)
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if len(index) == len(df):
+                    return index
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Index des clients similaires illisible (%s), reconstruction", e)
+        index = cls.build(df, features)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning("Impossible d'enregistrer l'index des clients similaires : %s", e)
+        return index
+
+    def query_vector(self, vector, k=DEFAULT_NEIGHBOURS, exclude_id=None,
+                     block_rows=QUERY_BLOCK_ROWS):
+        # vector : client encodé par FeatureEncoder ; lignes de df_full et distances exactes
+        vector = np.asarray(vector, dtype=np.float32)
+        n_wanted = k + (1 if exclude_id is not None else 0)
+        best_rows = []
+        # ||v - q||² = ||v||² - 2 v·q + ||q||² : seuls les deux premiers termes départagent
+        for start in range(0, len(self.ids), block_rows):
+            block = self.vectors[start:start + block_rows]
+            scores = self.squared_norms[start:start + block_rows] - 2 * (block @ vector)
+            top = min(n_wanted, len(scores))
+            best_rows.append(np.argpartition(scores, top - 1)[:top] + start)
+        if not best_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        rows = np.concatenate(best_rows)
+        if exclude_id is not None:
+            rows = rows[self.ids[rows] != exclude_id]
+        # Distances des seuls candidats recalculées directement : pas d'erreur d'annulation
+        differences = self.vectors[rows] - vector
+        distances = np.sqrt(np.einsum("ij,ij->i", differences, differences, dtype=np.float64))
+        order = np.argsort(distances, kind="stable")[:k]
+        return rows[order], distances[order]
+
+    def query(self, client_data, k=DEFAULT_NEIGHBOURS, exclude_id=None, row=None):
+        """Lignes de df_full des k plus proches voisins de ``client_data`` et leurs distances.
+
+        ``client_data`` : valeurs du formulaire, modifications comprises. ``row``
+        (ligne du client dans df_full, donnée par ``ClientLookup.row_of``) sert
+        à reconnaître les valeurs manquantes : ClientLookup remplace les NaN par
+        0, alors que l'index les impute à la moyenne. Un 0 du formulaire sur une
+        colonne dont la ligne indexée est à la moyenne reste donc imputé.
+        """
+        vector = self.encoder.encode_client(client_data)
+        if row is not None and self.ids[row] == client_data.get("SK_ID_CURR"):
+            indexed = self.vectors[row]
+            for j, feature in enumerate(self.encoder.numeric_features):
+                if indexed[j] == 0 and client_data.get(feature) == 0:
+                    vector[j] = 0
+            exclude_id = self.ids[row]
+        return self.query_vector(vector, k, exclude_id)
@@ -5,264 +5,313 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-import shap
-import traceback
-
-FEATURE_DESCRIPTIONS = {
-    "EXT_SOURCE_1": "Score Source Externe 1 (information financière externe)",
-    "EXT_SOURCE_3": "Score Source Externe 3 (information financière externe)",
-    "AMT_CREDIT": "Montant du crédit demandé",
-    "DAYS_BIRTH": "Âge du client (en jours, négatif)",
-    "EXT_SOURCE_2": "Score Source Externe 2 (information financière externe)",
-    "AMT_ANNUITY": "Montant des annuités du prêt",
-    "SK_ID_CURR_CNT_INSTALMENT_FUTURE_mean": "Moyenne des échéances futures impayées (crédits précédents)",
-    "DAYS_ID_PUBLISH": "Ancienneté de la dernière mise à jour de l'ID (en jours, négatif)",
-    "SK_ID_CURR_DAYS_CREDIT_ENDDATE_max": "Date de fin maximale des crédits passés (en jours)",
-    "DAYS_EMPLOYED": "Ancienneté d'emploi actuelle (en jours, négatif, 365243 si non employé)",
-    "CODE_GENDER": "Genre",
-    "NAME_EDUCATION_TYPE": "Niveau d'éducation",
-    "NAME_FAMILY_STATUS": "Statut familial",
-    "AMT_INCOME_TOTAL": "Revenu annuel total",
-    "CNT_CHILDREN": "Nombre d'enfants",
-    "FLAG_OWN_CAR": "Possède une voiture",
-    "FLAG_OWN_REALTY": "Possède un bien immobilier",
-    "OCCUPATION_TYPE": "Type d'emploi",
-    "REGION_POPULATION_RELATIVE": "Densité de population de la région de résidence",
-    "HOUR_APPR_PROCESS_START": "Heure de début de la demande",
-    "SK_ID_CURR_AMT_GOODS_PRICE_mean": "Moyenne du prix des biens des anciens crédits",
-    "SK_ID_CURR_AMT_PAYMENT_CURRENT_mean": "Moyenne des paiements actuels des crédits",
-    "SK_ID_CURR_AMT_INSTALMENT_mean": "Moyenne des montants d'échéances des anciens crédits",
-    "SK_ID_CURR_AMT_CREDIT_SUM_DEBT_sum": "Somme des dettes des anciens crédits",
-    "SK_ID_CURR_AMT_ANNUITY_mean": "Moyenne des annuités des anciens crédits",
-    "SK_ID_CURR_AMT_TOTAL_RECEIVABLE_sum": "Somme des montants totaux à recevoir des anciens crédits",
-    "SK_ID_CURR_AMT_TOTAL_RECEIVABLE_max": "Maximum du montant total à recevoir des anciens crédits",
-    "SK_ID_CURR_AMT_RECEIVABLE_PRINCIPAL_sum": "Somme du capital à recevoir des anciens crédits",
-    "SK_ID_CURR_AMT_CREDIT_SUM_sum": "Somme des montants de crédit des anciens crédits",
-    "SK_ID_CURR_CNT_INSTALMENT_mean": "Moyenne du nombre d'échéances des anciens crédits",
-    "SK_ID_CURR_MONTHS_BALANCE_max_x": "Mois maximal de l'historique de bureau",
-    "SK_ID_CURR_PAYMENT_DIFF_sum": "Somme des différences de paiement des anciens crédits",
-    "SK_ID_CURR_CNT_INSTALMENT_max": "Maximum du nombre d'échéances des anciens crédits",
-    "SK_ID_CURR_DBD_sum_x": "Somme des jours avant la date de paiement (bureau)",
-    "SK_ID_CURR_DBD_max_y": "Maximum des jours avant la date de paiement (POS/Cash)",
-    "SK_ID_CURR_AMT_CREDIT_LIMIT_ACTUAL_min": "Minimum du montant de la limite de crédit actuelle",
-    "SK_ID_CURR_AMT_DRAWINGS_POS_CURRENT_mean": "Moyenne des retraits POS actuels",
-    "SK_ID_CURR_SK_DPD_mean_x": "Moyenne des jours d'arriérés (bureau)",
-    "SK_ID_CURR_CNT_DRAWINGS_POS_CURRENT_sum": "Somme des retraits POS actuels",
-    "SK_ID_CURR_DBD_mean_y": "Moyenne des jours avant la date de paiement (POS/Cash)",
-    "SK_ID_CURR_CNT_DRAWINGS_ATM_CURRENT_sum": "Somme des retraits ATM actuels",
-    "SK_ID_CURR_AMT_CREDIT_SUM_DEBT_mean": "Moyenne de la dette des anciens crédits",
-    "SK_ID_CURR_SK_DPD_mean_y": "Moyenne des jours d'arriérés par définition (POS/Cash)",
-    "SK_ID_CURR_CNT_DRAWINGS_ATM_CURRENT_max": "Maximum des retraits ATM actuels",
-    "SK_ID_CURR_MONTHS_BALANCE_min_y": "Mois minimal de l'historique de solde (POS/Cash)",
-    "SK_ID_CURR_DPD_sum_y": "Somme des jours d'arriérés (POS/Cash)",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Medicine_mean": "Moyenne des prêts pour Médicaments",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Spouse_partner_mean": "Moyenne des clients accompagnés par conjoint/partenaire",
-    "SK_ID_CURR_CHANNEL_TYPE_Stone_mean": "Moyenne des demandes via canal 'Stone'",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Refused_mean_y": "Moyenne des contrats refusés (précédentes applications)",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_XNA_mean": "Moyenne des contrats au statut non spécifié",
-    "SK_ID_CURR_SK_DPD_DEF_max_x": "Maximum des jours d'arriérés par définition (bureau)",
-    "SK_ID_CURR_CODE_REJECT_REASON_XNA_mean": "Moyenne des raisons de rejet non spécifiées",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_MONDAY_mean": "Moyenne des demandes commencées un lundi",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Other_mean": "Moyenne des prêts pour Autres biens",
-    "SK_ID_CURR_CREDIT_TYPE_Car_loan_mean": "Moyenne des prêts automobiles",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Canceled_mean_x": "Moyenne des contrats annulés (bureau)",
-    "SK_ID_CURR_CNT_DRAWINGS_CURRENT_mean": "Moyenne des retraits actuels",
-    "SK_ID_CURR_CHANNEL_TYPE_Channel_of_corporate_sales_mean": "Moyenne des demandes via canal de ventes corporate",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_House_Construction_mean": "Moyenne des prêts pour Construction de maison",
-    "SK_ID_CURR_CREDIT_TYPE_Mortgage_mean": "Moyenne des prêts hypothécaires",
-    "SK_ID_CURR_NAME_YIELD_GROUP_low_action_mean": "Moyenne des groupes de rendement 'faible action'",
-    "SK_ID_CURR_CODE_REJECT_REASON_XAP_mean": "Moyenne des rejets par XAP",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Jewelry_mean": "Moyenne des prêts pour Bijoux",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Sent_proposal_mean": "Moyenne des contrats avec proposition envoyée",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_THURSDAY_mean": "Moyenne des demandes commencées un jeudi",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_AudioVideo_mean": "Moyenne des prêts pour Audio/Vidéo",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Car_repairs_mean": "Moyenne des prêts pour Réparations automobiles",
-    "SK_ID_CURR_CODE_REJECT_REASON_CLIENT_mean": "Moyenne des rejets par décision client",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Signed_mean_y": "Moyenne des contrats signés (précédentes applications)",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Homewares_mean": "Moyenne des prêts pour Articles ménagers",
-    "SK_ID_CURR_NAME_PAYMENT_TYPE_Noncash_from_your_account_mean": "Moyenne des paiements non cash depuis compte",
-    "SK_ID_CURR_NAME_CLIENT_TYPE_New_mean": "Moyenne des clients de type 'Nouveau'",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Active_mean_y": "Moyenne des contrats actifs (précédentes applications)",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Consumer_Electronics_mean": "Moyenne des prêts pour Électronique grand public",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Purchase_of_electronic_equipment_mean": "Moyenne des prêts pour Achat d'équipement électronique",
-    "SK_ID_CURR_NAME_CLIENT_TYPE_XNA_mean": "Moyenne des clients de type non spécifié",
-    "SK_ID_CURR_NAME_PRODUCT_TYPE_walkin_mean": "Moyenne des produits de type 'walk-in'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Education_mean": "Moyenne des prêts pour Éducation",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Medicine_mean": "Moyenne des prêts pour Médicaments",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Completed_mean_y": "Moyenne des contrats complétés (précédentes applications)",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Photo__Cinema_Equipment_mean": "Moyenne des prêts pour Équipement photo/cinéma",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Connectivity_mean": "Moyenne des demandes via industrie 'Connectivité'",
-    "SK_ID_CURR_NAME_PAYMENT_TYPE_Cashless_from_the_account_of_the_employer_mean": "Moyenne des paiements sans cash depuis compte employeur",
-    "SK_ID_CURR_CREDIT_TYPE_Real_estate_loan_mean": "Moyenne des prêts immobiliers",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Auto_Accessories_mean": "Moyenne des prêts pour Accessoires auto",
-    "SK_ID_CURR_CHANNEL_TYPE_Credit_and_cash_offices_mean": "Moyenne des demandes via bureaux de crédit et cash",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Refusal_to_name_the_goal_mean": "Moyenne des prêts avec refus de spécifier le but",
-    "SK_ID_CURR_CREDIT_TYPE_Consumer_credit_mean": "Moyenne des crédits à la consommation",
-    "SK_ID_CURR_CREDIT_TYPE_Interbank_credit_mean": "Moyenne des crédits interbancaires",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_XNA_mean": "Moyenne des prêts avec but non spécifié",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Urgent_needs_mean": "Moyenne des prêts pour Besoins urgents",
-    "SK_ID_CURR_RATE_INTEREST_PRIVILEGED_mean": "Moyenne du taux d'intérêt privilégié",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Office_Appliances_mean": "Moyenne des prêts pour Appareils de bureau",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Wedding__gift__holiday_mean": "Moyenne des prêts pour Mariage, cadeau, vacances",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_TUESDAY_mean": "Moyenne des demandes commencées un mardi",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Approved_mean": "Moyenne des contrats approuvés",
-    "SK_ID_CURR_CODE_REJECT_REASON_SCO_mean": "Moyenne des rejets par SCO",
-    "SK_ID_CURR_CREDIT_ACTIVE_Sold_mean": "Moyenne des crédits 'vendus'",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Demand_mean_y": "Moyenne des contrats demandés (précédentes applications)",
-    "SK_ID_CURR_NAME_PORTFOLIO_Cards_mean": "Moyenne des portefeuilles de type 'Cartes'",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_garage_mean": "Moyenne des prêts pour Achat de garage",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Animals_mean": "Moyenne des prêts pour Animaux",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Clothing_and_Accessories_mean": "Moyenne des prêts pour Vêtements et accessoires",
-    "SK_ID_CURR_CHANNEL_TYPE_Contact_center_mean": "Moyenne des demandes via centre d'appels",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Construction_Materials_mean": "Moyenne des prêts pour Matériaux de construction",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_home_mean": "Moyenne des prêts pour Achat d'une maison",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_XAP_mean": "Moyenne des prêts avec but 'XAP'",
-    "SK_ID_CURR_CREDIT_TYPE_Loan_for_working_capital_replenishment_mean": "Moyenne des prêts pour réapprovisionnement fonds de roulement",
-    "SK_ID_CURR_CREDIT_TYPE_Another_type_of_loan_mean": "Moyenne des autres types de prêts",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Fitness_mean": "Moyenne des prêts pour Fitness",
-    "SK_ID_CURR_NAME_PORTFOLIO_POS_mean": "Moyenne des portefeuilles de type 'POS'",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_SATURDAY_mean": "Moyenne des demandes commencées un samedi",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Gasification__water_supply_mean": "Moyenne des prêts pour Gazification, approvisionnement en eau",
-    "SK_ID_CURR_NAME_YIELD_GROUP_high_mean": "Moyenne des groupes de rendement 'élevé'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Gardening_mean": "Moyenne des prêts pour Jardinage",
-    "SK_ID_CURR_FLAG_LAST_APPL_PER_CONTRACT_Y_mean": "Moyenne du flag 'dernière application par contrat' à Oui",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_WEDNESDAY_mean": "Moyenne des demandes commencées un mercredi",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Industry_mean": "Moyenne des demandes via industrie 'Industrie'",
-    "SK_ID_CURR_NAME_PRODUCT_TYPE_xsell_mean": "Moyenne des produits de type 'cross-sell'",
-    "SK_ID_CURR_CODE_REJECT_REASON_LIMIT_mean": "Moyenne des rejets par limite",
-    "SK_ID_CURR_CREDIT_TYPE_Loan_for_business_development_mean": "Moyenne des prêts pour développement commercial",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Unaccompanied_mean": "Moyenne des clients non accompagnés",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Additional_Service_mean": "Moyenne des prêts pour Services additionnels",
-    "SK_ID_CURR_CHANNEL_TYPE_AP_Cash_loan_mean": "Moyenne des demandes via canal 'AP Cash loan'",
-    "SK_ID_CURR_NAME_CONTRACT_TYPE_Cash_loans_mean": "Moyenne des contrats de type 'Prêts en espèces'",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_MLM_partners_mean": "Moyenne des demandes via industrie 'Partenaires MLM'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Medical_Supplies_mean": "Moyenne des prêts pour Fournitures médicales",
-    "SK_ID_CURR_CREDIT_TYPE_Cash_loan_nonearmarked_mean": "Moyenne des prêts en espèces non affectés",
-    "SK_ID_CURR_CREDIT_ACTIVE_Closed_mean": "Moyenne des crédits 'fermés'",
-    "SK_ID_CURR_NAME_CLIENT_TYPE_Repeater_mean": "Moyenne des clients de type 'Répéteur'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Direct_Sales_mean": "Moyenne des prêts pour Ventes directes",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Computers_mean": "Moyenne des prêts pour Ordinateurs",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Clothing_mean": "Moyenne des demandes via industrie 'Vêtements'",
-    "SK_ID_CURR_CREDIT_TYPE_Credit_card_mean": "Moyenne des crédits par carte",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Returned_to_the_store_mean": "Moyenne des contrats retournés au magasin",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Other_A_mean": "Moyenne des clients accompagnés par 'Autre A'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Furniture_mean": "Moyenne des prêts pour Meubles",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Vehicles_mean": "Moyenne des prêts pour Véhicules",
-    "SK_ID_CURR_NAME_YIELD_GROUP_middle_mean": "Moyenne des groupes de rendement 'moyen'",
-    "YEARS_BEGINEXPLUATATION_AVG": "Moyenne des années de début d'exploitation",
-    "SK_ID_CURR_NAME_CONTRACT_TYPE_Consumer_loans_mean": "Moyenne des contrats de type 'Crédits à la consommation'",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Repairs_mean": "Moyenne des prêts pour Réparations",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Building_a_house_or_an_annex_mean": "Moyenne des prêts pour Construction de maison ou annexe",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Hobby_mean": "Moyenne des prêts pour Loisirs",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Canceled_mean_y": "Moyenne des contrats annulés (précédentes applications)",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Other_B_mean": "Moyenne des clients accompagnés par 'Autre B'",
-    "SK_ID_CURR_NAME_PORTFOLIO_Cars_mean": "Moyenne des portefeuilles de type 'Voitures'",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Furniture_mean": "Moyenne des prêts pour Meubles",
-    "SK_ID_CURR_NAME_PRODUCT_TYPE_XNA_mean": "Moyenne des produits de type non spécifié",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Children_mean": "Moyenne des clients accompagnés par des enfants",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Auto_technology_mean": "Moyenne des demandes via industrie 'Technologie auto'",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Amortized_debt_mean": "Moyenne des dettes amorties",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Refused_mean_x": "Moyenne des contrats refusés (bureau)",
-    "SK_ID_CURR_CREDIT_ACTIVE_Bad_debt_mean": "Moyenne des créances irrécouvrables",
-    "SK_ID_CURR_NAME_YIELD_GROUP_low_normal_mean": "Moyenne des groupes de rendement 'faible normal'",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_FRIDAY_mean": "Moyenne des demandes commencées un vendredi",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Completed_mean_x": "Moyenne des contrats complétés (bureau)",
-    "SK_ID_CURR_CHANNEL_TYPE_Car_dealer_mean": "Moyenne des demandes via concessionnaire auto",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Construction_mean": "Moyenne des demandes via industrie 'Construction'",
-    "SK_ID_CURR_NAME_CONTRACT_TYPE_XNA_mean": "Moyenne des contrats de type non spécifié",
-    "SK_ID_CURR_CHANNEL_TYPE_Countrywide_mean": "Moyenne des demandes via canal 'National'",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Signed_mean_x": "Moyenne des contrats signés (bureau)",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Active_mean_x": "Moyenne des contrats actifs (bureau)",
-    "SK_ID_CURR_NAME_PORTFOLIO_Cash_mean": "Moyenne des portefeuilles de type 'Cash'",
-    "SK_ID_CURR_NAME_YIELD_GROUP_XNA_mean": "Moyenne des groupes de rendement non spécifiés",
-    "SK_ID_CURR_CREDIT_TYPE_Microloan_mean": "Moyenne des microcrédits",
-    "SK_ID_CURR_CHANNEL_TYPE_Regional__Local_mean": "Moyenne des demandes via canal 'Régional/Local'",
-    "SK_ID_CURR_CREDIT_TYPE_Loan_for_the_purchase_of_equipment_mean": "Moyenne des prêts pour l'achat d'équipement",
-    "SK_ID_CURR_CODE_REJECT_REASON_HC_mean": "Moyenne des rejets par 'HC'",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Group_of_people_mean": "Moyenne des clients accompagnés par un groupe",
-    "SK_ID_CURR_CODE_REJECT_REASON_SCOFR_mean": "Moyenne des rejets par 'SCOFR'",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Everyday_expenses_mean": "Moyenne des prêts pour Dépenses quotidiennes",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Tourism_mean": "Moyenne des prêts pour Tourisme",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Mobile_mean": "Moyenne des prêts pour Mobile",
-    "SK_ID_CURR_CREDIT_ACTIVE_Active_mean": "Moyenne des crédits 'actifs'",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Money_for_a_third_person_mean": "Moyenne des prêts pour Argent pour une tierce personne",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Other_mean": "Moyenne des prêts pour Autres buts",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Tourism_mean": "Moyenne des demandes via industrie 'Tourisme'",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Insurance_mean": "Moyenne des prêts pour Assurance",
-    "SK_ID_CURR_CREDIT_TYPE_Loan_for_purchase_of_shares_margin_lending_mean": "Moyenne des prêts pour achat d'actions/marge",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Business_development_mean": "Moyenne des prêts pour Développement commercial",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Unused_offer_mean": "Moyenne des offres non utilisées",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_XNA_mean": "Moyenne des prêts pour biens non spécifiés",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Furniture_mean": "Moyenne des demandes via industrie 'Meubles'",
-    "SK_ID_CURR_CREDIT_TYPE_Mobile_operator_loan_mean": "Moyenne des prêts d'opérateur mobile",
-    "SK_ID_CURR_CODE_REJECT_REASON_SYSTEM_mean": "Moyenne des rejets par système",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Education_mean": "Moyenne des prêts pour Éducation",
-    "SK_ID_CURR_WEEKDAY_APPR_PROCESS_START_SUNDAY_mean": "Moyenne des demandes commencées un dimanche",
-    "SK_ID_CURR_NAME_PAYMENT_TYPE_Cash_through_the_bank_mean": "Moyenne des paiements en espèces via banque",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Payments_on_other_loans_mean": "Moyenne des prêts pour Paiements sur autres prêts",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Sport_and_Leisure_mean": "Moyenne des prêts pour Sport et Loisirs",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Approved_mean_y": "Moyenne des contrats approuvés (précédentes applications)",
-    "SK_ID_CURR_CREDIT_TYPE_Unknown_type_of_loan_mean": "Moyenne des types de prêts inconnus",
-    "SK_ID_CURR_NAME_PAYMENT_TYPE_XNA_mean": "Moyenne des types de paiement non spécifiés",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_used_car_mean": "Moyenne des prêts pour Achat de voiture d'occasion",
-    "SK_ID_CURR_NAME_CONTRACT_STATUS_Demand_mean_x": "Moyenne des contrats demandés (bureau)",
-    "SK_ID_CURR_NAME_TYPE_SUITE_Family_mean": "Moyenne des clients accompagnés par famille",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_XNA_mean": "Moyenne des demandes via industrie non spécifiée",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Buying_a_new_car_mean": "Moyenne des prêts pour Achat de voiture neuve",
-    "SK_ID_CURR_NAME_CONTRACT_TYPE_Revolving_loans_mean": "Moyenne des prêts revolving",
-    "SK_ID_CURR_NAME_GOODS_CATEGORY_Weapon_mean": "Moyenne des prêts pour Armes",
-    "SK_ID_CURR_CODE_REJECT_REASON_VERIF_mean": "Moyenne des rejets par vérification",
-    "SK_ID_CURR_NAME_PORTFOLIO_XNA_mean": "Moyenne des portefeuilles de type non spécifié",
-    "SK_ID_CURR_NAME_CASH_LOAN_PURPOSE_Journey_mean": "Moyenne des prêts pour Voyage",
-    "SK_ID_CURR_NAME_SELLER_INDUSTRY_Consumer_electronics_mean": "Moyenne des demandes via industrie 'Électronique grand public'",
-    "SK_ID_CURR_AMT_CREDIT_mean": "Moyenne du montant du crédit des anciens crédits",
-    "SK_ID_CURR_AMT_DRAWINGS_CURRENT_mean": "Moyenne des retraits actuels",
-    "NAME_CONTRACT_TYPE": "Type de contrat",
-    "NAME_TYPE_SUITE": "Type d'accompagnement de la demande",
-    "NAME_INCOME_TYPE": "Type de revenu",
-    "NAME_HOUSING_TYPE": "Type de logement",
-    "WEEKDAY_APPR_PROCESS_START": "Jour de la semaine de la demande",
-    "ORGANIZATION_TYPE": "Type d'organisation de l'emploi",
-    "FONDKAPREMONT_MODE": "Mode de financement de la réparation capitale",
-    "HOUSETYPE_MODE": "Type de maison",
-    "WALLSMATERIAL_MODE": "Matériau des murs",
-    "EMERGENCYSTATE_MODE": "État d'urgence du bâtiment",
-    "REGION_RATING_CLIENT": "Notation de la région (par le client)",
-    "REGION_RATING_CLIENT_W_CITY": "Notation de la région (par le client avec ville)",
-    "_AGE_YEARS": "Âge du client (années)",
-    "_EMPLOYED_YEARS": "Ancienneté d'emploi (années)"
-}
-
-API_URL = "https://ilkan77-openclassroom.hf.space/predict"
-
-
-@st.cache_data
-def load_full_data(file_path):
+import os
+import time
+
+from api_client import API_URL, POOL_MAXSIZE, build_session, post_prediction
+from batch_scoring import DEFAULT_WORKERS, batch_output_path, read_ids, score_ids
+from dataset import Dataset, DatasetManager
+from derived_features import client_feature_value
+from features import FEATURE_DESCRIPTIONS
+from figure_cache import figure_cache
+from population_shap import (POPULATION_SHAP_DIR, META_FILE, PopulationShap, beeswarm_figure,
+                             importance_figure, shap_distribution_figure)
+from population_stats import (add_distribution_overlay, bivariate_figure, compute_pair_aggregate,
+                              distribution_base_figure, peer_feature_values)
+from prediction_cache import PredictionCache, payload_key
+from tracing import span, traced, tracer
+from what_if import (DEFAULT_PAIR_POINTS, DEFAULT_POINTS, WHAT_IF_FEATURES, run_what_if,
+                     what_if_figure)
+
+# Colonnes affichées dans le tableau des clients similaires
+PEER_TABLE_COLUMNS = ["AMT_CREDIT", "AMT_INCOME_TOTAL", "AMT_ANNUITY", "EXT_SOURCE_1", "EXT_SOURCE_2",
+                      "EXT_SOURCE_3", "_AGE_YEARS", "CODE_GENDER", "NAME_EDUCATION_TYPE",
+                      "OCCUPATION_TYPE"]
+# Nombre de clients affichés dans le nuage SHAP de la population
+BEESWARM_MAX_POINTS = 2000
+# Panneau de performance : DASHBOARD_ADMIN=1 ou ?admin=1 dans l'URL
+ADMIN_MODE = os.environ.get("DASHBOARD_ADMIN") == "1"
+
+
+@st.cache_resource
+def get_api_session():
+    # Session HTTP partagée par tout le processus (pool de connexions keep-alive)
+    return build_session()
+
+
+@st.cache_resource
+def get_prediction_cache():
+    # Cache SQLite des réponses /predict, commun à toutes les sessions
+    return PredictionCache()
+
+
+@st.cache_resource
+def get_dataset_manager(file_path):
+    # Chargement de la base en arrière-plan : le formulaire et l'appel API n'en dépendent pas.
+    # Le gestionnaire recharge ensuite la base à chaud quand le CSV change.
+    return DatasetManager(file_path)
+
+
+def get_dataset(file_path):
+    # Renvoie la version courante du jeu de données, None tant que le chargement est en cours
     try:
-        df = pd.read_csv(file_path)
-        if 'TARGET' in df.columns:
-            df = df.drop(columns=['TARGET'])
+        return get_dataset_manager(file_path).current()
+    except FileNotFoundError:
+        st.error(f"Fichier '{file_path}' non trouvé.")
+        return Dataset.empty()
 
-        df["_AGE_YEARS"] = np.abs(df["DAYS_BIRTH"]) / 365.25
-        df["_EMPLOYED_YEARS"] = np.abs(df["DAYS_EMPLOYED"]) / 365.25
 
-        # Créez _EMPLOYED_YEARS_CAT avec des chaînes de caractères dès le début
-        df['_EMPLOYED_YEARS_CAT'] = df["_EMPLOYED_YEARS"].apply(
-            lambda x: f"{round(x)} ans" if pd.notna(x) else "Inconnu").astype(str)
-        df.loc[df["DAYS_EMPLOYED"] == 365243, '_EMPLOYED_YEARS_CAT'] = "Non-employé"
-        df['_EMPLOYED_YEARS_CAT'] = df['_EMPLOYED_YEARS_CAT'].astype('category')
+@st.cache_resource(max_entries=64)
+def load_pair_aggregate(_dataset, dataset_version, feature_x, feature_y):
+    # Grille de densité 2D (ou statistiques par modalité) sur toute la base, par couple de
+    # variables ; la version de la base fait partie de la clé du cache
+    df = _dataset.df_full
+    if feature_x not in df.columns or feature_y not in df.columns:
+        return None
+    return compute_pair_aggregate(df, feature_x, feature_y)
 
-        return df
-    except FileNotFoundError:
-        st.error(f"Fichier '{file_path}' non trouvé.")
-        return pd.DataFrame()
 
+@st.cache_resource(max_entries=2)
+def get_population_shap(directory, published_at):
+    # Matrice SHAP projetée en mémoire, rouverte quand le job en publie une nouvelle
+    return PopulationShap.open(directory)
 
-df_full = load_full_data("application_train.csv")
 
-relevant_cols_for_sample = list(FEATURE_DESCRIPTIONS.keys()) + ['_EMPLOYED_YEARS_CAT']
-df_ref = df_full[df_full.columns.intersection(relevant_cols_for_sample)].sample(
-    min(1000, len(df_full)), random_state=42)
+def population_shap_store():
+    try:
+        published_at = os.path.getmtime(os.path.join(POPULATION_SHAP_DIR, META_FILE))
+    except OSError:
+        return None
+    return get_population_shap(POPULATION_SHAP_DIR, published_at)
+
+
+def feature_label(feature):
+    if feature == '_EMPLOYED_YEARS_CAT':
+        return 'Ancienneté d\'emploi (catégories)'
+    return FEATURE_DESCRIPTIONS.get(feature, feature)
+
+
+@traced("figure.gauge_base")
+def gauge_base_figure(threshold):
+    # Cadran de la jauge : ne dépend que du seuil, l'aiguille est posée à chaque rerun
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number+delta", value=0,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Probabilité de défaut du client"},
+        gauge={'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+               'bar': {'color': "darkblue"},
+               'steps': [
+                   {'range': [0, threshold * 100], 'color': "lightgreen"},
+                   {'range': [threshold * 100, 100], 'color': "lightcoral"}],
+               'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75,
+                             'value': threshold * 100}}))
+    fig_gauge.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10))
+    return fig_gauge
+
+
+@traced("figure.education_box_base")
+def education_box_base_figure(df_ref):
+    df_temp_box = df_ref[["NAME_EDUCATION_TYPE", "AMT_CREDIT"]].copy()
+    df_temp_box['NAME_EDUCATION_TYPE'] = df_temp_box['NAME_EDUCATION_TYPE'].astype(str)
+
+    fig_box = px.box(df_temp_box, x="NAME_EDUCATION_TYPE", y="AMT_CREDIT",
+                     title="Montant du crédit par niveau d'éducation",
+                     labels={"NAME_EDUCATION_TYPE": FEATURE_DESCRIPTIONS.get("NAME_EDUCATION_TYPE"),
+                             "AMT_CREDIT": FEATURE_DESCRIPTIONS.get("AMT_CREDIT")},
+                     color="NAME_EDUCATION_TYPE",
+                     color_discrete_map={"Higher education": "blue",
+                                         "Secondary / secondary special": "green",
+                                         "Incomplete higher": "orange",
+                                         "Lower secondary": "red",
+                                         "Academic degree": "purple", "nan": "gray"})
+    return fig_box
+
+
+# Les deux graphiques de comparaison sont des fragments : changer de caractéristique
+# ne réexécute que le fragment concerné, pas le formulaire, la jauge ni les SHAP.
+@st.fragment
+def histogram_panel(dataset, comparison_features, similar_peers=None):
+    selected_feature_hist_tech_name = st.selectbox(
+        "Sélectionnez une caractéristique à comparer (Histogramme):",
+        comparison_features,
+        format_func=feature_label
+    )
+
+    if selected_feature_hist_tech_name:
+        client_value_for_plot_hist = client_feature_value(
+            selected_feature_hist_tech_name, st.session_state.client_data_for_api_display)
+
+        feature_summary = dataset.distribution_summaries.get(selected_feature_hist_tech_name)
+        if feature_summary is not None:
+            with span("figure.histogram", feature=selected_feature_hist_tech_name):
+                fig_hist = figure_cache.get_or_build(
+                    ("histogram", dataset.version, selected_feature_hist_tech_name),
+                    lambda: distribution_base_figure(
+                        feature_summary,
+                        f"Distribution de '{FEATURE_DESCRIPTIONS.get(selected_feature_hist_tech_name, selected_feature_hist_tech_name)}' dans la base"))
+                fig_hist = add_distribution_overlay(
+                    fig_hist, feature_summary,
+                    client_value=client_value_for_plot_hist,
+                    peer_values=peer_feature_values(similar_peers, selected_feature_hist_tech_name),
+                    peer_ids=peer_feature_values(similar_peers, "SK_ID_CURR"))
+                fig_hist.update_layout(height=400)
+                st.plotly_chart(fig_hist, use_container_width=True)
+        else:
+            st.warning("Aucune valeur disponible pour cette caractéristique dans la base.")
+    else:
+        st.warning("Veuillez sélectionner une caractéristique pour l'histogramme.")
+
+
+@st.fragment
+def bivariate_panel(dataset, comparison_features, similar_peers=None):
+    st.markdown("### Analyse Bi-variée :")
+    feature_x_tech_name = st.selectbox(
+        "Axe X : Sélectionnez la première caractéristique :",
+        comparison_features,
+        format_func=feature_label,
+        key="feature_x"
+    )
+    feature_y_tech_name = st.selectbox(
+        "Axe Y : Sélectionnez la seconde caractéristique :",
+        comparison_features,
+        format_func=feature_label,
+        key="feature_y"
+    )
+
+    if feature_x_tech_name and feature_y_tech_name:
+        client_x_val_plot = client_feature_value(
+            feature_x_tech_name, st.session_state.client_data_for_api_display)
+        client_y_val_plot = client_feature_value(
+            feature_y_tech_name, st.session_state.client_data_for_api_display)
+
+        pair_aggregate = load_pair_aggregate(dataset, dataset.version, feature_x_tech_name,
+                                             feature_y_tech_name)
+        if pair_aggregate is not None:
+            with span("figure.bivariate", kind=pair_aggregate["kind"]):
+                fig_scatter = bivariate_figure(
+                    pair_aggregate,
+                    f"Relation entre '{feature_label(feature_x_tech_name)}' et '{feature_label(feature_y_tech_name)}'",
+                    client_x=client_x_val_plot, client_y=client_y_val_plot,
+                    peer_x=peer_feature_values(similar_peers, feature_x_tech_name),
+                    peer_y=peer_feature_values(similar_peers, feature_y_tech_name),
+                    peer_ids=peer_feature_values(similar_peers, "SK_ID_CURR"))
+
+                fig_scatter.update_layout(height=400,
+                                          xaxis_title=feature_label(feature_x_tech_name),
+                                          yaxis_title=feature_label(feature_y_tech_name))
+                st.plotly_chart(fig_scatter, use_container_width=True)
+        else:
+            st.warning(
+                "Impossible de générer le graphique bi-varié car une ou plusieurs caractéristiques n'ont pas pu être traitées.")
+    else:
+        st.warning("Veuillez sélectionner deux caractéristiques pour l'analyse bi-variée.")
+
+
+@st.fragment
+def global_shap_panel(store, client_shap, dataset=None):
+    tab_importance, tab_beeswarm, tab_client = st.tabs(
+        ["Importance moyenne", "Vue d'ensemble", "Client vs population"])
+    with tab_importance:
+        with span("figure.shap_importance"):
+            st.plotly_chart(importance_figure(store), use_container_width=True)
+    with tab_beeswarm:
+        with span("figure.shap_beeswarm"):
+            rows = store.sample_rows(BEESWARM_MAX_POINTS)
+            feature_values = None
+            if dataset is not None and "SK_ID_CURR" in dataset.df_full.columns:
+                positions = pd.Index(dataset.df_full["SK_ID_CURR"]).get_indexer(store.ids[rows])
+                if (positions >= 0).all():
+                    feature_values = dataset.df_full.iloc[positions].reset_index(drop=True)
+            st.plotly_chart(beeswarm_figure(store, rows, feature_values, client_shap=client_shap),
+                            use_container_width=True)
+        st.caption(f"Échantillon de {len(rows)} clients sur {len(store)}. Couleur : rang de la valeur "
+                   "de la caractéristique dans l'échantillon.")
+    with tab_client:
+        shap_feature = st.selectbox("Caractéristique :", store.importance()["feature"].tolist(),
+                                    format_func=feature_label, key="population_shap_feature")
+        client_value = client_shap.get(shap_feature) if client_shap else None
+        if not isinstance(client_value, (int, float)):
+            client_value = None
+        with span("figure.shap_distribution", feature=shap_feature):
+            st.plotly_chart(shap_distribution_figure(store, shap_feature, client_value),
+                            use_container_width=True)
+        if client_value is not None:
+            st.write(f"L'impact de cette caractéristique pour le client ({client_value:+.4f}) est "
+                     f"supérieur à celui de {store.shap_percentile(shap_feature, client_value):.0f} % "
+                     "de la population.")
+
+
+@st.fragment
+def what_if_panel(client_data, threshold, client_probability, percentile_index=None):
+    st.subheader("🧪 Simulation : et si... ?")
+    st.markdown("Faites varier une ou deux caractéristiques du client pour voir comment évolue sa "
+                "probabilité de défaut par rapport au seuil de décision.")
+    available_features = [f for f in WHAT_IF_FEATURES if f in client_data]
+    mode = st.radio("Faire varier :", ["Une caractéristique", "Deux caractéristiques"],
+                    horizontal=True, key="what_if_mode")
+    col_feature_1, col_feature_2 = st.columns(2)
+    with col_feature_1:
+        what_if_features = [st.selectbox("Caractéristique :", available_features,
+                                         format_func=feature_label, key="what_if_feature_1")]
+    if mode == "Deux caractéristiques":
+        with col_feature_2:
+            what_if_features.append(st.selectbox(
+                "Seconde caractéristique :",
+                [f for f in available_features if f != what_if_features[0]],
+                format_func=feature_label, key="what_if_feature_2"))
+        n_points = st.slider("Nombre de valeurs par caractéristique", min_value=5, max_value=15,
+                             value=DEFAULT_PAIR_POINTS, key="what_if_pair_points")
+    else:
+        n_points = st.slider("Nombre de valeurs", min_value=5, max_value=41, value=DEFAULT_POINTS,
+                             step=2, key="what_if_points")
+
+    request_key = (tuple(what_if_features), n_points, payload_key(client_data, API_URL))
+    if st.button("Lancer la simulation", key="what_if_run"):
+        started = time.perf_counter()
+        try:
+            with span("what_if.score", features=",".join(what_if_features)):
+                what_if_grid, n_cached = run_what_if(
+                    client_data, what_if_features, get_api_session(), n_points=n_points,
+                    percentile_index=percentile_index, url=API_URL, cache=get_prediction_cache())
+            st.session_state.what_if = {"key": request_key, "grid": what_if_grid,
+                                        "n_cached": n_cached,
+                                        "elapsed_ms": (time.perf_counter() - started) * 1000}
+        except requests.exceptions.ConnectionError:
+            st.error("❌ Impossible de se connecter à l'API pour la simulation. "
+                     "Veuillez vérifier l'URL et que l'API est bien démarrée.")
+        except requests.exceptions.Timeout:
+            st.error("⏳ La simulation a expiré. L'API est peut-être trop lente ou surchargée.")
+        except requests.exceptions.HTTPError as e:
+            st.error(f"⚠️ Erreur HTTP de l'API : {e.response.status_code} - {e.response.text}")
+        except ValueError as e:  # JSON illisible ou nombre de résultats incohérent
+            st.error(f"🚫 Réponse de l'API inexploitable pour la simulation : {e}")
+        except requests.exceptions.RequestException as e:
+            st.error(f"⚠️ Erreur lors de l'appel à l'API : {e}")
+
+    what_if_state = st.session_state.get("what_if")
+    if what_if_state is not None and what_if_state["key"] == request_key:
+        what_if_grid = what_if_state["grid"]
+        with span("figure.what_if"):
+            st.plotly_chart(what_if_figure(what_if_grid, client_data, threshold, client_probability),
+                            use_container_width=True)
+        n_failed = int(what_if_grid["probability_default"].isna().sum())
+        st.caption(f"{len(what_if_grid)} variantes scorées en {what_if_state['elapsed_ms']:.0f} ms "
+                   f"({what_if_state['n_cached']} lues dans le cache"
+                   + (f", {n_failed} en erreur" if n_failed else "") + ").")
+
+
+@st.fragment(run_every=1.0)
+def dataset_loading_status(file_path):
+    # Relance la page entière dès que la base est chargée
+    if get_dataset_manager(file_path).ready():
+        st.rerun()
+    st.info("⏳ Chargement de la base clients en cours... La saisie manuelle et le calcul du score "
+            "sont déjà disponibles ; la recherche par ID et les comparaisons le seront dans un instant.")
+
+
+# Durée de l'exécution complète du script (hors reruns de fragments)
+rerun_started_ns = time.time_ns()
+rerun_started = time.perf_counter_ns()
 
 st.set_page_config(
     page_title="Prêt à dépenser : Outil de Scoring Crédit",
@@ -274,12 +323,21 @@ st.title("📊 Prêt à dépenser : Outil de Scoring Crédit pour les Chargés d
 st.markdown(
     "Bienvenue sur le dashboard interactif d'aide à la décision d'octroi de crédit. Cet outil vous permet de visualiser le score de crédit d'un client, sa probabilité de défaut, et les facteurs qui ont influencé cette décision. Vous pouvez également comparer le profil du client avec l'ensemble de la base.")
 
+dataset = get_dataset("application_train.csv")
+if dataset is None:
+    dataset_loading_status("application_train.csv")
+elif st.session_state.get("dataset_version") not in (None, dataset.version):
+    st.toast("🔄 Une nouvelle version de la base clients a été chargée.")
+if dataset is not None:
+    st.session_state.dataset_version = dataset.version
+
 st.sidebar.header("👤 Informations Client Actuel")
 st.sidebar.markdown(
     "Saisissez un ID client pour pré-remplir les champs, ou entrez les informations manuellement.")
 
 client_id_input = st.sidebar.number_input("ID Client (Ex: 100002)", min_value=0, value=0, step=1)
-load_client_data_button = st.sidebar.button("Charger données client par ID")
+load_client_data_button = st.sidebar.button("Charger données client par ID",
+                                            disabled=dataset is None)
 
 # Initialisation de l'état de session pour les valeurs du formulaire
 if 'client_data_form_values' not in st.session_state:
@@ -304,42 +362,11 @@ if 'client_data_for_api_display' not in st.session_state: # Pour stocker les don
     st.session_state.client_data_for_api_display = {}
 
 if load_client_data_button and client_id_input != 0:
-    client_row = df_full[df_full['SK_ID_CURR'] == client_id_input]
-    if not client_row.empty:
+    with span("client_lookup.get"):
+        client_data = dataset.client_lookup.get(client_id_input)
+    if client_data is not None:
         st.sidebar.success(f"Données pour l'ID {client_id_input} chargées.")
-        client_data = client_row.iloc[0].to_dict()
-
-        for feature, value in client_data.items():
-            final_value = None
-            if isinstance(value, (pd.Series, pd.Index)):
-                if not value.empty and len(value) == 1:
-                    final_value = value.iloc[0] if isinstance(value, pd.Series) else value[0]
-                else:
-                    st.warning(f"La caractéristique '{feature}' contient une série non scalaire (vide ou multi-valeurs). Une valeur par défaut sera utilisée si possible.")
-                    if feature in df_full.columns:
-                        if pd.api.types.is_numeric_dtype(df_full[feature]):
-                            final_value = 0.0
-                        elif pd.api.types.is_string_dtype(df_full[feature]) or pd.api.types.is_categorical_dtype(df_full[feature]):
-                            final_value = "Non spécifié"
-                        else:
-                            final_value = None
-                    else:
-                        final_value = 0.0 if isinstance(value, (int, float)) else "Unknown"
-            elif pd.isna(value):
-                if feature in df_full.columns:
-                    if pd.api.types.is_numeric_dtype(df_full[feature]):
-                        final_value = 0.0
-                    elif pd.api.types.is_string_dtype(df_full[feature]) or pd.api.types.is_categorical_dtype(df_full[feature]):
-                        final_value = "XNA" if feature in ["CODE_GENDER", "OCCUPATION_TYPE"] else "Unknown"
-                    else:
-                        final_value = None
-                else:
-                    final_value = 0.0 if isinstance(value, (int, float)) else "Unknown"
-            else:
-                final_value = value
-
-            if final_value is not None:
-                st.session_state.client_data_form_values[feature] = final_value
+        st.session_state.client_data_form_values.update(client_data)
 
     else:
         st.sidebar.warning(f"ID Client {client_id_input} non trouvé.")
@@ -524,16 +551,26 @@ if submitted:
 
     st.subheader("Chargement et Calcul...")
     try:
-        response = requests.post(API_URL, json=client_data_for_api)
-        response.raise_for_status()
-        result = response.json()
+        prediction_cache = get_prediction_cache()
+        with span("prediction_cache.get"):
+            result = prediction_cache.get(client_data_for_api, namespace=API_URL)
+        api_latency = None
+        if result is None:
+            with span("api.predict"):
+                response, api_latency = post_prediction(get_api_session(), API_URL,
+                                                        client_data_for_api)
+                response.raise_for_status()
+                result = response.json()
+            prediction_cache.set(client_data_for_api, result, namespace=API_URL)
 
         st.session_state.prediction_results = {
             "prob_default": result.get("probability_default"),
             "pred_class": result.get("prediction_class"),
             "optimal_threshold_used": result.get("optimal_threshold_used"),
             "shap_values_raw": result.get("shap_values"),
-            "shap_expected_value": result.get("shap_expected_value")
+            "shap_expected_value": result.get("shap_expected_value"),
+            "api_latency_ms": api_latency * 1000 if api_latency is not None else None,
+            "from_cache": api_latency is None
         }
         st.session_state.client_data_for_api_display = client_data_for_api
         st.session_state.prediction_made = True
@@ -565,6 +602,8 @@ if st.session_state.prediction_made:
     optimal_threshold_used = st.session_state.prediction_results.get("optimal_threshold_used")
     shap_values_raw = st.session_state.prediction_results.get("shap_values_raw")
     shap_expected_value = st.session_state.prediction_results.get("shap_expected_value")
+    api_latency_ms = st.session_state.prediction_results.get("api_latency_ms")
+    from_cache = st.session_state.prediction_results.get("from_cache", False)
     client_data_for_api_display = st.session_state.client_data_for_api_display
 
     st.subheader("📈 Score de Crédit et Décision")
@@ -572,22 +611,18 @@ if st.session_state.prediction_made:
 
     with col1:
         st.metric(label="Probabilité de Défaut", value=f"{prob_default:.2%}")
+        if from_cache:
+            st.caption("Résultat servi depuis le cache (aucun appel à l'API).")
+        elif api_latency_ms is not None:
+            st.caption(f"Temps de réponse de l'API : {api_latency_ms:.0f} ms")
         if prob_default is not None:
-            fig_gauge = go.Figure(go.Indicator(
-                mode="gauge+number+delta", value=prob_default * 100,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Probabilité de défaut du client"},
-                gauge={'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                       'bar': {'color': "darkblue"},
-                       'steps': [
-                           {'range': [0, optimal_threshold_used * 100], 'color': "lightgreen"},
-                           {'range': [optimal_threshold_used * 100, 100],
-                            'color': "lightcoral"}],
-                       'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75,
-                                     'value': optimal_threshold_used * 100}}))
-            fig_gauge.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10))
-            st.plotly_chart(fig_gauge, use_container_width=True,
-                            config={'displayModeBar': False})
+            with span("figure.gauge"):
+                fig_gauge = figure_cache.get_or_build(
+                    ("gauge", optimal_threshold_used),
+                    lambda: gauge_base_figure(optimal_threshold_used))
+                fig_gauge.data[0].value = prob_default * 100
+                st.plotly_chart(fig_gauge, use_container_width=True,
+                                config={'displayModeBar': False})
 
             st.info(f"Le seuil de décision est de **{optimal_threshold_used:.2%}**.")
             if pred_class == 0:
@@ -601,24 +636,26 @@ if st.session_state.prediction_made:
         st.subheader("Interprétation du Score (Facteurs influents)")
         if shap_values_raw and "error" not in shap_values_raw and shap_values_raw != {
             "info": "SHAP explainer non disponible ou non initialisé."}:
-            shap_df = pd.DataFrame(shap_values_raw.items(), columns=['feature', 'shap_value'])
-            shap_df['abs_shap_value'] = np.abs(shap_df['shap_value'])
-            shap_df = shap_df.sort_values(by='abs_shap_value', ascending=False).head(10)
-            shap_df['feature_display_name'] = shap_df['feature'].map(
-                FEATURE_DESCRIPTIONS).fillna(shap_df['feature'])
-
-            fig_shap = px.bar(
-                shap_df, x='shap_value', y='feature_display_name', orientation='h',
-                title='Top 10 des facteurs influençant la décision pour ce client',
-                labels={'shap_value': 'Impact sur la probabilité de défaut (valeur SHAP)',
-                        'feature_display_name': 'Caractéristique'},
-                color='shap_value', color_continuous_scale=px.colors.diverging.RdBu,
-                hover_data={'shap_value': ':.4f'})
-            fig_shap.update_layout(
-                xaxis_title="Impact sur la probabilité de défaut (valeur SHAP)",
-                yaxis_title="Caractéristique",
-                height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig_shap, use_container_width=True)
+            with span("shap.dataframe"):
+                shap_df = pd.DataFrame(shap_values_raw.items(), columns=['feature', 'shap_value'])
+                shap_df['abs_shap_value'] = np.abs(shap_df['shap_value'])
+                shap_df = shap_df.sort_values(by='abs_shap_value', ascending=False).head(10)
+                shap_df['feature_display_name'] = shap_df['feature'].map(
+                    FEATURE_DESCRIPTIONS).fillna(shap_df['feature'])
+
+            with span("figure.shap"):
+                fig_shap = px.bar(
+                    shap_df, x='shap_value', y='feature_display_name', orientation='h',
+                    title='Top 10 des facteurs influençant la décision pour ce client',
+                    labels={'shap_value': 'Impact sur la probabilité de défaut (valeur SHAP)',
+                            'feature_display_name': 'Caractéristique'},
+                    color='shap_value', color_continuous_scale=px.colors.diverging.RdBu,
+                    hover_data={'shap_value': ':.4f'})
+                fig_shap.update_layout(
+                    xaxis_title="Impact sur la probabilité de défaut (valeur SHAP)",
+                    yaxis_title="Caractéristique",
+                    height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+                st.plotly_chart(fig_shap, use_container_width=True)
 
             st.markdown("""
             * Les barres **rouges** indiquent des facteurs qui **augmentent** la probabilité de défaut du client.
@@ -629,216 +666,186 @@ if st.session_state.prediction_made:
             st.warning(
                 "Impossible de calculer les contributions individuelles des features (SHAP values).")
 
+        st.markdown("**Positionnement du client dans l'ensemble de la base**")
+        if dataset is None:
+            st.info("⏳ Disponible dès que la base clients est chargée.")
+        else:
+            with span("percentile.profile"):
+                percentile_df = dataset.percentile_index.profile(client_data_for_api_display)
+            if percentile_df.empty:
+                st.write("Aucune caractéristique numérique à positionner.")
+            else:
+                shap_lookup = shap_values_raw if isinstance(shap_values_raw, dict) else {}
+                percentile_df['shap_value'] = pd.to_numeric(
+                    percentile_df['feature'].map(shap_lookup), errors='coerce')
+                percentile_df['feature_display_name'] = percentile_df['feature'].map(
+                    FEATURE_DESCRIPTIONS).fillna(percentile_df['feature'])
+                # Par défaut les facteurs les plus influents en premier ; chaque colonne reste triable
+                percentile_df = percentile_df.sort_values('shap_value', key=np.abs, ascending=False,
+                                                          na_position='last')
+                st.dataframe(
+                    percentile_df[['feature_display_name', 'value', 'percentile', 'shap_value']],
+                    hide_index=True, use_container_width=True, height=350,
+                    column_config={
+                        'feature_display_name': st.column_config.TextColumn("Caractéristique"),
+                        'value': st.column_config.NumberColumn("Valeur client", format="%.4g"),
+                        'percentile': st.column_config.ProgressColumn(
+                            "Percentile", min_value=0, max_value=100, format="%.1f"),
+                        'shap_value': st.column_config.NumberColumn("Impact SHAP", format="%.4f")})
+                st.caption(f"Percentile : part des {len(dataset.df_full)} clients de la base ayant une "
+                           "valeur inférieure à celle du client (ex-aequo comptés pour moitié).")
+
+    what_if_panel(client_data_for_api_display, optimal_threshold_used, prob_default,
+                  dataset.percentile_index if dataset is not None else None)
+    st.write("---")
+
     st.subheader("📑 Informations Descriptives Détaillées du Client")
 
-    client_info_df = pd.DataFrame.from_dict(client_data_for_api_display, orient='index',
-                                            columns=['Valeur'])
-    client_info_df.index.name = 'Caractéristique'
-    client_info_df.index = client_info_df.index.map(lambda x: FEATURE_DESCRIPTIONS.get(x, x))
-
-    display_df = client_info_df.copy()
-    for idx, row in display_df.iterrows():
-        if 'Âge du client' in idx and pd.api.types.is_numeric_dtype(row['Valeur']):
-            display_df.loc[idx, 'Valeur'] = f"{round(abs(row['Valeur']) / 365.25)} ans"
-        elif 'Ancienneté d\'emploi' in idx and pd.api.types.is_numeric_dtype(row['Valeur']):
-            if row['Valeur'] == 365243:
-                display_df.loc[idx, 'Valeur'] = "Non employé"
-            else:
+    with span("client_table.format"):
+        client_info_df = pd.DataFrame.from_dict(client_data_for_api_display, orient='index',
+                                                columns=['Valeur'])
+        client_info_df.index.name = 'Caractéristique'
+        client_info_df.index = client_info_df.index.map(lambda x: FEATURE_DESCRIPTIONS.get(x, x))
+
+        display_df = client_info_df.copy()
+        for idx, row in display_df.iterrows():
+            if 'Âge du client' in idx and pd.api.types.is_numeric_dtype(row['Valeur']):
                 display_df.loc[idx, 'Valeur'] = f"{round(abs(row['Valeur']) / 365.25)} ans"
-        elif 'Date de fin maximale des crédits passés' in idx and pd.api.types.is_numeric_dtype(
-                row['Valeur']):
-            if row['Valeur'] < 0:
-                display_df.loc[
-                    idx, 'Valeur'] = f"Il y a {round(abs(row['Valeur']) / 365.25)} ans"
-            elif row['Valeur'] > 0:
-                display_df.loc[idx, 'Valeur'] = f"Dans {round(row['Valeur'] / 365.25)} ans"
-            else:
-                display_df.loc[idx, 'Valeur'] = "Aujourd'hui"
+            elif 'Ancienneté d\'emploi' in idx and pd.api.types.is_numeric_dtype(row['Valeur']):
+                if row['Valeur'] == 365243:
+                    display_df.loc[idx, 'Valeur'] = "Non employé"
+                else:
+                    display_df.loc[idx, 'Valeur'] = f"{round(abs(row['Valeur']) / 365.25)} ans"
+            elif 'Date de fin maximale des crédits passés' in idx and pd.api.types.is_numeric_dtype(
+                    row['Valeur']):
+                if row['Valeur'] < 0:
+                    display_df.loc[
+                        idx, 'Valeur'] = f"Il y a {round(abs(row['Valeur']) / 365.25)} ans"
+                elif row['Valeur'] > 0:
+                    display_df.loc[idx, 'Valeur'] = f"Dans {round(row['Valeur'] / 365.25)} ans"
+                else:
+                    display_df.loc[idx, 'Valeur'] = "Aujourd'hui"
 
-    display_df['Valeur'] = display_df['Valeur'].astype(str)
+        display_df['Valeur'] = display_df['Valeur'].astype(str)
 
-    st.dataframe(
-        display_df.style.set_properties(**{'background-color': '#f0f2f6', 'color': 'black'}),
-        use_container_width=True)
+        st.dataframe(
+            display_df.style.set_properties(**{'background-color': '#f0f2f6', 'color': 'black'}),
+            use_container_width=True)
     st.write("---")
 
-    st.subheader("🔬 Comparaison avec l'Ensemble des Clients")
-    st.markdown(
-        "Comparez les caractéristiques du client actuel avec la distribution de l'ensemble de notre base de données.")
-
-    comparison_features = [col for col in df_ref.columns if
-                           col in FEATURE_DESCRIPTIONS or col == "_AGE_YEARS" or col == "_EMPLOYED_YEARS_CAT"]
-
-    col_comp1, col_comp2 = st.columns(2)
-
-    with col_comp1:
-        selected_feature_hist_tech_name = st.selectbox(
-            "Sélectionnez une caractéristique à comparer (Histogramme):",
-            comparison_features,
-            format_func=lambda x: FEATURE_DESCRIPTIONS.get(x,
-                                                           x) if x != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)'
-        )
-
-        if selected_feature_hist_tech_name:
-            plot_x_axis = selected_feature_hist_tech_name
-            client_value_for_plot_hist = None
-
-            if selected_feature_hist_tech_name == "_AGE_YEARS":
-                client_value_for_plot_hist = np.abs(
-                    st.session_state.client_data_for_api_display.get("DAYS_BIRTH")) / 365.25
-            elif selected_feature_hist_tech_name == "_EMPLOYED_YEARS_CAT":
-                if st.session_state.client_data_for_api_display.get("DAYS_EMPLOYED") == 365243:
-                    client_value_for_plot_hist = "Non-employé"
-                else:
-                    client_value_for_plot_hist = f"{round(np.abs(st.session_state.client_data_for_api_display.get('DAYS_EMPLOYED')) / 365.25)} ans"
-                if client_value_for_plot_hist not in df_ref[
-                    '_EMPLOYED_YEARS_CAT'].cat.categories:
-                    df_ref['_EMPLOYED_YEARS_CAT'] = df_ref[
-                        '_EMPLOYED_YEARS_CAT'].cat.add_categories([client_value_for_plot_hist])
-            else:
-                client_value_for_plot_hist = st.session_state.client_data_for_api_display.get(
-                    selected_feature_hist_tech_name)
-
-            fig_hist = px.histogram(df_ref, x=plot_x_axis,
-                                    title=f"Distribution de '{FEATURE_DESCRIPTIONS.get(selected_feature_hist_tech_name, selected_feature_hist_tech_name)}' dans la base",
-                                    marginal="box",
-                                    color_discrete_sequence=px.colors.qualitative.Plotly)
-
-            if client_value_for_plot_hist is not None:
-                if pd.api.types.is_numeric_dtype(df_ref[plot_x_axis]) and isinstance(
-                        client_value_for_plot_hist, (int, float)):
-                    fig_hist.add_vline(x=client_value_for_plot_hist, line_dash="dash",
-                                       line_color="red",
-                                       annotation_text=f"Client: {client_value_for_plot_hist:.2f}",
-                                       annotation_position="top right")
-                elif selected_feature_hist_tech_name == "_EMPLOYED_YEARS_CAT":
-                    fig_hist.add_annotation(
-                        x=client_value_for_plot_hist, y=1, text=f"Client",
-                        showarrow=True, arrowhead=2, arrowcolor="red", font=dict(color="red"),
-                        yref="paper", xref="x")
-
-            fig_hist.update_layout(height=400)
-            st.plotly_chart(fig_hist, use_container_width=True)
-        else:
-            st.warning("Veuillez sélectionner une caractéristique pour l'histogramme.")
-
-    with col_comp2:
-        st.markdown("### Analyse Bi-variée :")
-        feature_x_tech_name = st.selectbox(
-            "Axe X : Sélectionnez la première caractéristique :",
-            comparison_features,
-            format_func=lambda x: FEATURE_DESCRIPTIONS.get(x,
-                                                           x) if x != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)',
-            key="feature_x"
-        )
-        feature_y_tech_name = st.selectbox(
-            "Axe Y : Sélectionnez la seconde caractéristique :",
-            comparison_features,
-            format_func=lambda x: FEATURE_DESCRIPTIONS.get(x,
-                                                           x) if x != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)',
-            key="feature_y"
-        )
-
-        if feature_x_tech_name and feature_y_tech_name:
-            df_temp_scatter = df_ref.copy()
-
-            client_x_val_plot = None
-            if feature_x_tech_name == "_AGE_YEARS":
-                client_x_val_plot = np.abs(st.session_state.client_data_for_api_display.get("DAYS_BIRTH")) / 365.25
-            elif feature_x_tech_name == "_EMPLOYED_YEARS_CAT":
-                if st.session_state.client_data_for_api_display.get("DAYS_EMPLOYED") == 365243:
-                    client_x_val_plot = "Non-employé"
-                else:
-                    client_x_val_plot = f"{round(np.abs(st.session_state.client_data_for_api_display.get('DAYS_EMPLOYED')) / 365.25)} ans"
-                if client_x_val_plot not in df_temp_scatter[
-                    '_EMPLOYED_YEARS_CAT'].cat.categories:
-                    df_temp_scatter['_EMPLOYED_YEARS_CAT'] = df_temp_scatter[
-                        '_EMPLOYED_YEARS_CAT'].cat.add_categories([client_x_val_plot])
+    similar_peers = None
+    if dataset is not None and dataset.similar_clients is not None:
+        st.subheader("👥 Clients les plus similaires")
+        n_similar = st.slider("Nombre de clients similaires à afficher", min_value=5, max_value=50,
+                              value=10, step=5)
+        client_id = client_data_for_api_display.get("SK_ID_CURR")
+        with span("similar_clients.query", k=n_similar):
+            # Valeurs du formulaire (modifications comprises) ; la ligne en base du client
+            # sert à garder ses valeurs manquantes imputées comme dans l'index
+            similar_rows, similar_distances = dataset.similar_clients.query(
+                client_data_for_api_display, k=n_similar, exclude_id=client_id,
+                row=dataset.client_lookup.row_of(client_id) if client_id else None)
+        similar_peers = dataset.df_full.iloc[similar_rows]
+        peer_columns = ["SK_ID_CURR"] + [c for c in PEER_TABLE_COLUMNS if c in similar_peers.columns]
+        peer_table = similar_peers[peer_columns].assign(Distance=similar_distances)
+        peer_column_config = {"SK_ID_CURR": st.column_config.NumberColumn("ID client", format="%d"),
+                              "Distance": st.column_config.NumberColumn(format="%.2f")}
+        for col in peer_columns[1:]:
+            # Les colonnes float32 s'afficheraient sinon avec leurs décimales parasites
+            peer_column_config[col] = (
+                st.column_config.TextColumn(FEATURE_DESCRIPTIONS.get(col, col))
+                if isinstance(peer_table[col].dtype, pd.CategoricalDtype)
+                else st.column_config.NumberColumn(FEATURE_DESCRIPTIONS.get(col, col), format="%.6g"))
+        st.dataframe(peer_table, hide_index=True, use_container_width=True,
+                     column_config=peer_column_config)
+        st.caption(f"Distance euclidienne calculée sur {dataset.similar_clients.encoder.width} "
+                   f"caractéristiques standardisées (catégories encodées).")
+        if not st.checkbox("Mettre en évidence ces clients sur les graphiques de comparaison",
+                           value=True):
+            similar_peers = None
+        st.write("---")
+
+    if dataset is None:
+        st.info("⏳ Les comparaisons avec l'ensemble des clients s'afficheront dès que la base sera chargée.")
+    else:
+        df_ref = dataset.df_ref
 
-            else:
-                client_x_val_plot = st.session_state.client_data_for_api_display.get(feature_x_tech_name)
-
-            client_y_val_plot = None
-            if feature_y_tech_name == "_AGE_YEARS":
-                client_y_val_plot = np.abs(st.session_state.client_data_for_api_display.get("DAYS_BIRTH")) / 365.25
-            elif feature_y_tech_name == "_EMPLOYED_YEARS_CAT":
-                if st.session_state.client_data_for_api_display.get("DAYS_EMPLOYED") == 365243:
-                    client_y_val_plot = "Non-employé"
-                else:
-                    client_y_val_plot = f"{round(np.abs(st.session_state.client_data_for_api_display.get('DAYS_EMPLOYED')) / 365.25)} ans"
-                if client_y_val_plot not in df_temp_scatter[
-                    '_EMPLOYED_YEARS_CAT'].cat.categories:
-                    df_temp_scatter['_EMPLOYED_YEARS_CAT'] = df_temp_scatter[
-                        '_EMPLOYED_YEARS_CAT'].cat.add_categories([client_y_val_plot])
-            else:
-                client_y_val_plot = st.session_state.client_data_for_api_display.get(feature_y_tech_name)
-
-
-            if feature_x_tech_name in df_temp_scatter.columns and feature_y_tech_name in df_temp_scatter.columns:
-                fig_scatter = px.scatter(
-                    df_temp_scatter.dropna(subset=[feature_x_tech_name, feature_y_tech_name]),
-                    x=feature_x_tech_name, y=feature_y_tech_name,
-                    title=f"Relation entre '{FEATURE_DESCRIPTIONS.get(feature_x_tech_name, feature_x_tech_name) if feature_x_tech_name != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)'}' et '{FEATURE_DESCRIPTIONS.get(feature_y_tech_name, feature_y_tech_name) if feature_y_tech_name != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)'}'",
-                    opacity=0.6,
-                    hover_data={feature_x_tech_name: True, feature_y_tech_name: True},
-                    color_discrete_sequence=px.colors.qualitative.Plotly)
-                if client_x_val_plot is not None and client_y_val_plot is not None:
-                    x_is_numeric = pd.api.types.is_numeric_dtype(
-                        df_temp_scatter[feature_x_tech_name])
-                    y_is_numeric = pd.api.types.is_numeric_dtype(
-                        df_temp_scatter[feature_y_tech_name])
-
-                    if x_is_numeric and y_is_numeric and isinstance(client_x_val_plot, (
-                    int, float)) and isinstance(client_y_val_plot, (int, float)):
-                        fig_scatter.add_trace(go.Scatter(
-                            x=[client_x_val_plot], y=[client_y_val_plot], mode='markers',
-                            marker=dict(color='red', size=12, symbol='star'),
-                            name='Client Actuel',
-                            hovertemplate=f"Client X: {client_x_val_plot}<br>Client Y: {client_y_val_plot}"))
+        st.subheader("🔬 Comparaison avec l'Ensemble des Clients")
+        st.markdown(
+            "Comparez les caractéristiques du client actuel avec la distribution de l'ensemble de notre base de données.")
 
-                fig_scatter.update_layout(height=400,
-                                          xaxis_title=FEATURE_DESCRIPTIONS.get(
-                                              feature_x_tech_name,
-                                              feature_x_tech_name) if feature_x_tech_name != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)',
-                                          yaxis_title=FEATURE_DESCRIPTIONS.get(
-                                              feature_y_tech_name,
-                                              feature_y_tech_name) if feature_y_tech_name != '_EMPLOYED_YEARS_CAT' else 'Ancienneté d\'emploi (catégories)')
-                st.plotly_chart(fig_scatter, use_container_width=True)
-            else:
-                st.warning(
-                    "Impossible de générer le graphique bi-varié car une ou plusieurs caractéristiques n'ont pas pu être traitées.")
-        else:
-            st.warning("Veuillez sélectionner deux caractéristiques pour l'analyse bi-variée.")
+        comparison_features = [col for col in df_ref.columns if
+                               col in FEATURE_DESCRIPTIONS or col == "_AGE_YEARS" or col == "_EMPLOYED_YEARS_CAT"]
+
+        col_comp1, col_comp2 = st.columns(2)
+
+        with col_comp1:
+            histogram_panel(dataset, comparison_features, similar_peers)
+
+        with col_comp2:
+            bivariate_panel(dataset, comparison_features, similar_peers)
+
+        st.markdown("---")
+        st.subheader("🔍 Autres Graphiques Pertinents")
+
+        if 'AMT_CREDIT' in df_ref.columns and 'NAME_EDUCATION_TYPE' in df_ref.columns:
+            with span("figure.education_box"):
+                fig_box = figure_cache.get_or_build(("education_box", dataset.version),
+                                                    lambda: education_box_base_figure(df_ref))
+                client_edu = st.session_state.client_data_for_api_display.get('NAME_EDUCATION_TYPE')
+                client_credit = st.session_state.client_data_for_api_display.get('AMT_CREDIT')
+                if client_edu and client_credit is not None:
+                    fig_box.add_trace(go.Scatter(
+                        x=[client_edu], y=[client_credit], mode='markers',
+                        marker=dict(color='red', size=12, symbol='star'), name='Client Actuel',
+                        hovertemplate=f"Client Éducation: {client_edu}<br>Client Crédit: {client_credit}"))
+                fig_box.update_layout(height=400)
+                st.plotly_chart(fig_box, use_container_width=True)
 
     st.markdown("---")
-    st.subheader("🔍 Autres Graphiques Pertinents")
-
-    if 'AMT_CREDIT' in df_ref.columns and 'NAME_EDUCATION_TYPE' in df_ref.columns:
-        df_temp_box = df_ref.copy()
-        df_temp_box['NAME_EDUCATION_TYPE'] = df_temp_box['NAME_EDUCATION_TYPE'].astype(str)
-
-        fig_box = px.box(df_temp_box, x="NAME_EDUCATION_TYPE", y="AMT_CREDIT",
-                         title="Montant du crédit par niveau d'éducation",
-                         labels={"NAME_EDUCATION_TYPE": FEATURE_DESCRIPTIONS.get(
-                             "NAME_EDUCATION_TYPE"),
-                                 "AMT_CREDIT": FEATURE_DESCRIPTIONS.get("AMT_CREDIT")},
-                         color="NAME_EDUCATION_TYPE",
-                         color_discrete_map={"Higher education": "blue",
-                                             "Secondary / secondary special": "green",
-                                             "Incomplete higher": "orange",
-                                             "Lower secondary": "red",
-                                             "Academic degree": "purple", "nan": "gray"})
-        client_edu = st.session_state.client_data_for_api_display.get('NAME_EDUCATION_TYPE')
-        client_credit = st.session_state.client_data_for_api_display.get('AMT_CREDIT')
-        if client_edu and client_credit is not None:
-            fig_box.add_trace(go.Scatter(
-                x=[client_edu], y=[client_credit], mode='markers',
-                marker=dict(color='red', size=12, symbol='star'), name='Client Actuel',
-                hovertemplate=f"Client Éducation: {client_edu}<br>Client Crédit: {client_credit}"))
-        fig_box.update_layout(height=400)
-        st.plotly_chart(fig_box, use_container_width=True)
+    st.subheader("🌍 Explications globales du modèle")
+    population_shap = population_shap_store()
+    if population_shap is None:
+        st.info("Aucune matrice SHAP de la population n'est disponible. Elle se calcule hors ligne "
+                "avec `python population_shap.py --limit 50000`.")
+    else:
+        client_shap = shap_values_raw if isinstance(shap_values_raw, dict) else {}
+        global_shap_panel(population_shap, client_shap, dataset)
 
 
+st.sidebar.markdown("---")
+with st.sidebar.expander("📦 Scoring par lot"):
+    st.markdown("Chargez un CSV contenant une colonne `SK_ID_CURR` pour scorer plusieurs clients.")
+    batch_ids_file = st.file_uploader("Fichier d'IDs clients", type=["csv"], key="batch_ids_file")
+    # Pas plus de requêtes simultanées que de connexions dans le pool de la session partagée
+    batch_workers = st.number_input("Requêtes simultanées", min_value=1, max_value=POOL_MAXSIZE,
+                                    value=min(DEFAULT_WORKERS, POOL_MAXSIZE), step=1)
+    if dataset is None:
+        st.caption("Disponible dès que la base clients est chargée.")
+    if st.button("Lancer le scoring par lot", disabled=batch_ids_file is None or dataset is None):
+        batch_ids = read_ids(batch_ids_file)
+        batch_progress = st.progress(0.0, text="Scoring en cours...")
+
+        def report_batch_progress(done, total):
+            batch_progress.progress(done / total if total else 1.0,
+                                    text=f"{done}/{total} clients scorés")
+
+        # Chemin stable : relancer le même fichier après une interruption reprend le scoring
+        batch_results = score_ids(
+            batch_ids, dataset.client_lookup,
+            batch_output_path(batch_ids, API_URL, dataset.version), url=API_URL,
+            session=get_api_session(), cache=get_prediction_cache(),
+            max_workers=int(batch_workers), progress=report_batch_progress)
+        st.session_state.batch_results = batch_results
+
+    if st.session_state.get("batch_results") is not None:
+        batch_results = st.session_state.batch_results
+        n_batch_errors = int(batch_results["error"].notna().sum())
+        st.write(f"{len(batch_results)} clients scorés, {n_batch_errors} en erreur.")
+        st.download_button("Télécharger les résultats (CSV)",
+                           batch_results.to_csv(index=False).encode("utf-8"),
+                           file_name="scores.csv", mime="text/csv")
+
 st.sidebar.markdown("---")
 st.sidebar.header("Accessibilité (WCAG)")
 st.sidebar.markdown("""
@@ -849,4 +856,32 @@ Ce dashboard intègre des critères d'accessibilité clés du WCAG :
 * **Critère 1.4.3 Contraste (minimum)** : Les couleurs de texte et d'arrière-plan de l'interface Streamlit respectent généralement les normes de contraste. Pour les graphiques, des palettes de couleurs contrastées, comme `px.colors.diverging.RdBu`, sont employées.
 * **Critère 1.4.4 Redimensionnement du texte** : La fonctionnalité de zoom des navigateurs permet le redimensionnement du texte de l'application Streamlit.
 * **Critère 2.4.2 Titre de page** : Un titre de page explicite est défini via `st.set_page_config`.
-""")
\ No newline at end of file
+""")
+tracer.record("dashboard.rerun", rerun_started_ns, time.perf_counter_ns() - rerun_started)
+
+if ADMIN_MODE or st.query_params.get("admin") == "1":
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("⏱️ Performance (admin)"):
+        span_summary = tracer.summary()
+        if span_summary:
+            st.dataframe(pd.DataFrame(span_summary).set_index("span").round(1),
+                         use_container_width=True)
+        else:
+            st.write("Aucune mesure pour l'instant.")
+        st.caption(f"Percentiles calculés sur les {tracer.buffer_size} dernières mesures de chaque "
+                   "section, toutes sessions confondues.")
+        if tracer.export_path:
+            st.caption(f"Export des spans ({tracer.export_format}) : `{tracer.export_path}`")
+        figure_stats = figure_cache.stats()
+        st.caption(f"Cache des figures : {figure_stats['entries']} entrées "
+                   f"({figure_stats['megabytes']:.1f} Mo), {figure_stats['hits']} succès, "
+                   f"{figure_stats['misses']} constructions.")
+        dataset_manager = get_dataset_manager("application_train.csv")
+        if dataset is not None and dataset.version:
+            st.caption(f"Base clients : version `{dataset.version[:12]}`, "
+                       f"{dataset_manager.reload_count} rechargement(s) à chaud.")
+        if dataset_manager.last_error:
+            st.caption(f"Dernier rechargement en échec : {dataset_manager.last_error}")
+        if st.button("Réinitialiser les mesures"):
+            tracer.reset()
+            st.rerun()
@@ -0,0 +1,107 @@
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+import batch_scoring
+from batch_scoring import batch_output_path, checkpoint_path, read_ids, score_ids
+from data_store import ClientLookup
+
+
+class FakeResponse:
+
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class FakeApi:
+    """Remplace post_prediction : note les IDs scorés et renvoie la réponse choisie."""
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.calls = []
+
+    def __call__(self, session, url, payload, timeout=None):
+        client_id = payload["SK_ID_CURR"]
+        self.calls.append(client_id)
+        body = self.responses.get(client_id, {"probability_default": client_id / 100,
+                                              "prediction_class": 0})
+        if isinstance(body, Exception):
+            raise body
+        return FakeResponse(body), 0.0
+
+
+@pytest.fixture
+def lookup():
+    return ClientLookup(pd.DataFrame({"SK_ID_CURR": [1, 2, 3, 4, 5],
+                                      "AMT_CREDIT": [10.0, 20.0, 30.0, 40.0, 50.0]}))
+
+
+def test_read_ids(tmp_path):
+    path = tmp_path / "ids.csv"
+    path.write_text("SK_ID_CURR\n3\n1\n3\nabc\n")
+    assert read_ids(str(path)) == [3, 1]
+
+
+def test_batch_output_path_is_stable(tmp_path):
+    path = batch_output_path([1, 2], "http://api", "v1", directory=str(tmp_path))
+    assert path == batch_output_path([1, 2], "http://api", "v1", directory=str(tmp_path))
+    assert path != batch_output_path([1, 2, 3], "http://api", "v1", directory=str(tmp_path))
+    assert path != batch_output_path([1, 2], "http://api", "v2", directory=str(tmp_path))
+
+
+def test_errors_are_recorded(tmp_path, lookup, monkeypatch):
+    api = FakeApi({2: {"detail": "pas de probabilité"},
+                   3: requests.exceptions.ConnectionError("API injoignable")})
+    monkeypatch.setattr(batch_scoring, "post_prediction", api)
+    results = score_ids([1, 2, 3, 99], lookup, str(tmp_path / "scores.csv"), session=object(),
+                        max_workers=2).set_index("SK_ID_CURR")
+    assert results.loc[1, "probability_default"] == 0.01
+    assert pd.isna(results.loc[1, "error"])
+    assert "probabilité" in results.loc[2, "error"]
+    assert "injoignable" in results.loc[3, "error"]
+    assert results.loc[99, "error"] == "ID client inconnu"
+    assert not os.path.exists(checkpoint_path(str(tmp_path / "scores.csv")))
+
+
+def test_resume_rescores_only_missing_and_failed_ids(tmp_path, lookup, monkeypatch):
+    output = str(tmp_path / "out" / "scores.csv")
+    api = FakeApi({2: {"probability_default": None}})
+    monkeypatch.setattr(batch_scoring, "post_prediction", api)
+
+    def interrupt_after_first_chunk(done, total):
+        if done >= 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        score_ids([1, 2, 3, 4, 5], lookup, output, session=object(), max_workers=1,
+                  chunk_size=2, progress=interrupt_after_first_chunk)
+    assert sorted(api.calls) == [1, 2]
+    assert os.path.exists(checkpoint_path(output))
+
+    api.calls.clear()
+    api.responses.clear()
+    results = score_ids([1, 2, 3, 4, 5], lookup, output, session=object(), max_workers=1,
+                        chunk_size=2)
+    # 1 était déjà scoré ; 2 était en erreur et 3 à 5 jamais envoyés
+    assert sorted(api.calls) == [2, 3, 4, 5]
+    assert results["SK_ID_CURR"].tolist() == [1, 2, 3, 4, 5]
+    assert results["error"].isna().all()
+    assert results.loc[results["SK_ID_CURR"] == 2, "probability_default"].item() == 0.02
+    assert pd.read_csv(output)["SK_ID_CURR"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_no_resume_starts_over(tmp_path, lookup, monkeypatch):
+    output = str(tmp_path / "scores.csv")
+    pd.DataFrame([{"SK_ID_CURR": 1, "error": None}]).to_csv(checkpoint_path(output), index=False)
+    api = FakeApi()
+    monkeypatch.setattr(batch_scoring, "post_prediction", api)
+    score_ids([1, 2], lookup, output, session=object(), resume=False)
+    assert sorted(api.calls) == [1, 2]
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+from data_store import ClientLookup, _replace_from_tmp, _unique_tmp_path
+
+requires_pyarrow = pytest.mark.skipif(data_store.pq is None, reason="pyarrow absent")
+
+CSV = "SK_ID_CURR,AMT_CREDIT,CODE_GENDER\n100002,406597.5,M\n100003,1293502.5,F\n"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "application_train.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+def test_replace_from_tmp_publishes_complete_files_only(tmp_path):
+    path = str(tmp_path / "data.json")
+    _replace_from_tmp(path, lambda tmp: open(tmp, "w").write("v1"))
+    assert open(path).read() == "v1"
+
+    def failing_write(tmp):
+        with open(tmp, "w") as f:
+            f.write("à moitié")
+        raise OSError("disque plein")
+
+    with pytest.raises(OSError):
+        _replace_from_tmp(path, failing_write)
+    assert open(path).read() == "v1"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_each_writer_gets_its_own_tmp_file(tmp_path):
+    path = str(tmp_path / "data.parquet")
+    first, second = _unique_tmp_path(path), _unique_tmp_path(path)
+    assert first != second
+    assert os.path.dirname(first) == str(tmp_path)
+    assert os.path.basename(first).startswith("data.parquet.")
+
+
+@requires_pyarrow
+def test_columnar_cache_is_built_once(cache_dir, csv_path, monkeypatch):
+    parquet_path = data_store.ensure_columnar_cache(csv_path)
+    assert os.path.exists(parquet_path)
+    assert data_store.dataset_version(csv_path) == data_store.file_checksum(csv_path)
+
+    def no_conversion(*args):
+        raise AssertionError("le cache aurait dû être réutilisé")
+
+    monkeypatch.setattr(data_store, "convert_csv_to_parquet", no_conversion)
+    assert data_store.ensure_columnar_cache(csv_path) == parquet_path
+    # Date modifiée, contenu identique : la somme de contrôle évite la reconversion
+    os.utime(csv_path, ns=(0, 0))
+    assert data_store.ensure_columnar_cache(csv_path) == parquet_path
+    assert data_store._read_meta(data_store._cache_paths(csv_path)[1])["mtime_ns"] == 0
+
+
+@requires_pyarrow
+def test_columnar_cache_follows_csv_changes(cache_dir, csv_path):
+    data_store.ensure_columnar_cache(csv_path)
+    version = data_store.dataset_version(csv_path)
+    with open(csv_path, "a") as f:
+        f.write("100004,135000.0,M\n")
+    assert data_store.dataset_version(csv_path) != version
+    df = data_store.read_projected(csv_path, ["SK_ID_CURR", "CODE_GENDER", "ABSENTE"])
+    assert list(df.columns) == ["SK_ID_CURR", "CODE_GENDER"]
+    assert df["SK_ID_CURR"].tolist() == [100002, 100003, 100004]
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".tmp")] == []
+
+
+def test_client_lookup():
+    df = pd.DataFrame({"SK_ID_CURR": [30, 10, 20],
+                       "AMT_ANNUITY": [1.5, np.nan, 3.0],
+                       "OCCUPATION_TYPE": ["Laborers", None, "Managers"]})
+    lookup = ClientLookup(df)
+    assert lookup.row_of(10) == 1 and lookup.row_of(99) is None
+    assert lookup.get(10) == {"SK_ID_CURR": 10, "AMT_ANNUITY": 0.0, "OCCUPATION_TYPE": "XNA"}
+    assert lookup.get_many([20, 99, 30]) == [lookup.get(20), None, lookup.get(30)]
+    assert 30 in lookup and 99 not in lookup
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dtype_plan import SPARSE_MIN_ROWS, apply_dtype_plan, infer_column_dtype
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([0, 1, 120], np.int8),
+    ([-40000, 3], np.int32),
+    ([1.0, np.nan, 3.0], np.float32),
+    ([0.5, 0.25, np.nan], np.float32),
+    ([0.1, 0.2], np.float64),
+    ([2.0 ** 25 + 1, np.nan], np.float64),
+])
+def test_numeric_columns(values, expected):
+    assert infer_column_dtype(pd.Series(values)) == np.dtype(expected)
+
+
+def test_other_columns():
+    assert isinstance(infer_column_dtype(pd.Series(["M", "F", None])), pd.CategoricalDtype)
+    assert infer_column_dtype(pd.Series([True, False])) == np.dtype(bool)
+    assert infer_column_dtype(pd.Series([np.nan, np.nan])) == np.dtype(np.float32)
+
+
+def test_mostly_zero_column_is_sparse():
+    values = np.zeros(SPARSE_MIN_ROWS)
+    values[:5] = 1
+    dtype = infer_column_dtype(pd.Series(values))
+    assert isinstance(dtype, pd.SparseDtype)
+    assert dtype.subtype == np.int8 and dtype.fill_value == 0
+    assert not isinstance(infer_column_dtype(pd.Series(values), allow_sparse=False),
+                          pd.SparseDtype)
+
+
+def test_plan_round_trips_exactly():
+    rng = np.random.default_rng(0)
+    n_rows = 2 * SPARSE_MIN_ROWS
+    rare = np.where(rng.random(n_rows) < 0.02, rng.normal(size=n_rows), 0.0)
+    original = pd.DataFrame({
+        "SK_ID_CURR": np.arange(100000, 100000 + n_rows),
+        "CNT_CHILDREN": rng.integers(0, 5, n_rows).astype(np.float64),
+        "AMT_CREDIT": rng.integers(1, 4000, n_rows) * 112.5,
+        "EXT_SOURCE_2": np.where(rng.random(n_rows) < 0.1, np.nan, rng.random(n_rows)),
+        "RARE_MEAN": rare,
+        "NAME_CONTRACT_TYPE": rng.choice(["Cash loans", "Revolving loans"], n_rows),
+    })
+    compact = apply_dtype_plan(original.copy())
+    assert compact["SK_ID_CURR"].dtype == np.int32
+    assert compact["CNT_CHILDREN"].dtype == np.int8
+    assert compact["AMT_CREDIT"].dtype == np.float32
+    assert compact["EXT_SOURCE_2"].dtype == np.float64
+    assert isinstance(compact["RARE_MEAN"].dtype, pd.SparseDtype)
+    assert isinstance(compact["NAME_CONTRACT_TYPE"].dtype, pd.CategoricalDtype)
+    assert compact.memory_usage(deep=True).sum() < original.memory_usage(deep=True).sum()
+    for col in original.columns:
+        restored = compact[col]
+        if isinstance(restored.dtype, pd.SparseDtype):
+            restored = restored.sparse.to_dense()
+        if not pd.api.types.is_numeric_dtype(original[col]):
+            assert restored.astype(object).tolist() == original[col].tolist()
+        else:
+            # Valeurs envoyées telles quelles à l'API : aucune ne doit changer
+            np.testing.assert_array_equal(restored.to_numpy(dtype=np.float64),
+                                          original[col].to_numpy(dtype=np.float64))
@@ -0,0 +1,67 @@
+import plotly.graph_objects as go
+
+from figure_cache import FigureCache
+
+
+def bar_figure():
+    return go.Figure(go.Bar(x=[0, 1, 2], y=[0, 1, 2], name="population"))
+
+
+class CountingBuilder:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return bar_figure()
+
+
+def test_figure_is_built_once_and_returned_as_a_copy():
+    cache = FigureCache()
+    build = CountingBuilder()
+    first = cache.get_or_build(("histogram", "v1", "AMT_CREDIT"), build)
+    first.add_vline(x=1)
+    second = cache.get_or_build(("histogram", "v1", "AMT_CREDIT"), build)
+    assert build.calls == 1
+    assert list(second.data[0].y) == [0, 1, 2]
+    # Les traces du client ajoutées à une copie ne modifient pas la spécification gardée
+    assert not second.layout.shapes
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_read_entry_is_evicted():
+    cache = FigureCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_build(key, bar_figure)
+    cache.get_or_build("a", bar_figure)
+    cache.get_or_build("c", bar_figure)
+    build = CountingBuilder()
+    cache.get_or_build("b", build)
+    assert build.calls == 1
+    assert len(cache) == 2
+
+
+def test_byte_budget_is_respected():
+    size = len(bar_figure().to_json())
+    cache = FigureCache(max_bytes=int(size * 2.5))
+    for key in range(5):
+        cache.get_or_build(key, bar_figure)
+    assert len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_oversized_figure_is_not_stored():
+    cache = FigureCache(max_bytes=100)
+    build = CountingBuilder()
+    assert len(cache.get_or_build("big", build).data) == 1
+    cache.get_or_build("big", build)
+    assert build.calls == 2
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = FigureCache()
+    cache.get_or_build("a", bar_figure)
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
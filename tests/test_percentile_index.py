@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from percentile_index import MAX_EXACT_VALUES, ColumnPercentiles, PercentileIndex
+
+
+def exact_percentile(values, value):
+    # Rang moyen des ex-aequo, sur la colonne triée complète
+    values = np.sort(values[np.isfinite(values)])
+    below = np.searchsorted(values, value, side="left")
+    at_or_below = np.searchsorted(values, value, side="right")
+    return (below + at_or_below) / 2 / len(values) * 100
+
+
+def test_few_distinct_values_are_exact():
+    values = np.array([0, 0, 1, 1, 1, 2, 5, np.nan], dtype=np.float64)
+    percentiles = ColumnPercentiles(values)
+    for value in (0, 1, 2, 5):
+        assert percentiles.percentile(value)[0] == pytest.approx(exact_percentile(values, value))
+
+
+def test_values_outside_and_between_points():
+    percentiles = ColumnPercentiles(np.array([1.0, 2.0, 3.0, 4.0]))
+    assert percentiles.percentile(-10)[0] == 0
+    assert percentiles.percentile(10)[0] == 100
+    assert percentiles.percentile(2.5)[0] == pytest.approx(50)
+    assert np.isnan(percentiles.percentile(np.nan)[0])
+
+
+def test_sketch_error_is_small():
+    values = np.random.default_rng(0).lognormal(size=50_000)
+    percentiles = ColumnPercentiles(values)
+    assert len(percentiles.points) < MAX_EXACT_VALUES
+    probes = np.quantile(values, np.linspace(0.001, 0.999, 200)) * 1.0001
+    expected = np.array([exact_percentile(values, probe) for probe in probes])
+    assert np.abs(percentiles.percentile(probes) - expected).max() < 0.05
+
+
+def test_empty_column():
+    assert np.isnan(ColumnPercentiles(np.array([np.nan])).percentile(1.0)[0])
+
+
+def test_index_columns_and_profile():
+    df = pd.DataFrame({"SK_ID_CURR": [1, 2, 3, 4],
+                       "AMT_CREDIT": [100.0, 200.0, 300.0, np.nan],
+                       "CODE_GENDER": pd.Categorical(["M", "F", "F", "M"]),
+                       "FLAG": [True, False, True, True]})
+    index = PercentileIndex(df)
+    assert list(index.columns) == ["AMT_CREDIT"]
+    profile = index.profile({"SK_ID_CURR": 1, "AMT_CREDIT": 200.0, "CODE_GENDER": "M"})
+    assert profile.to_dict("records") == [{"feature": "AMT_CREDIT", "value": 200.0,
+                                           "percentile": pytest.approx(50.0)}]
+
+
+def test_reuse_keeps_unchanged_columns():
+    df = pd.DataFrame({"A": [1.0, 2.0], "B": [3.0, 4.0]})
+    previous = PercentileIndex(df)
+    index = PercentileIndex(df.assign(B=[5.0, 6.0]), reuse={"A": previous.columns["A"]})
+    assert index.columns["A"] is previous.columns["A"]
+    assert index.columns["B"] is not previous.columns["B"]
@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache, is_valid_result, payload_key
+
+RESULT = {"probability_default": 0.31, "prediction_class": 1, "optimal_threshold_used": 0.3,
+          "shap_values": {"AMT_CREDIT": 0.02}, "shap_expected_value": -1.2}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PredictionCache(str(tmp_path / "predictions.sqlite3"), ttl_seconds=3600, max_entries=3)
+
+
+def test_payload_key_is_canonical():
+    assert payload_key({"a": 250000, "b": "x"}) == payload_key({"b": "x", "a": 250000.0})
+    assert payload_key({"a": 0.1 + 0.2}) == payload_key({"a": 0.3})
+    assert payload_key({"a": np.float32(2.5)}) == payload_key({"a": 2.5})
+    assert payload_key({"a": 1}) != payload_key({"a": 2})
+    assert payload_key({"a": 1}, namespace="http://a") != payload_key({"a": 1}, namespace="http://b")
+
+
+@pytest.mark.parametrize("result, valid", [
+    ({"probability_default": 0.0}, True),
+    ({"probability_default": 1}, True),
+    ({"probability_default": 1.5}, False),
+    ({"probability_default": float("nan")}, False),
+    ({"probability_default": True}, False),
+    ({"probability_default": None}, False),
+    ({"detail": "Internal Server Error"}, False),
+    ([0.3], False),
+    (None, False),
+])
+def test_is_valid_result(result, valid):
+    assert is_valid_result(result) is valid
+
+
+def test_round_trip_keeps_only_result_fields(cache):
+    payload = {"SK_ID_CURR": 100002, "AMT_CREDIT": 406597.5}
+    assert cache.get(payload) is None
+    assert cache.set(payload, dict(RESULT, extra="ignoré"))
+    assert cache.get(payload) == RESULT
+    assert cache.get(payload, namespace="http://autre-api") is None
+
+
+def test_invalid_results_are_not_stored(cache):
+    payload = {"SK_ID_CURR": 100002}
+    assert not cache.set(payload, {"detail": "erreur"})
+    assert cache.get(payload) is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = PredictionCache(str(tmp_path / "predictions.sqlite3"), ttl_seconds=-1)
+    cache.set({"a": 1}, RESULT)
+    assert cache.get({"a": 1}) is None
+
+
+def test_least_recently_read_entries_are_evicted(cache, monkeypatch):
+    # Horloge strictement croissante : pas d'ex-aequo sur last_access
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(prediction_cache.time, "time", lambda: float(next(clock)))
+    for i in range(3):
+        cache.set({"a": i}, RESULT)
+    cache.get({"a": 0})
+    cache.set({"a": 3}, RESULT)
+    assert cache.get({"a": 1}) is None
+    assert cache.get({"a": 0}) == RESULT
+    assert cache.get({"a": 3}) == RESULT
@@ -0,0 +1,88 @@
+import re
+
+import pytest
+
+nltk = pytest.importorskip("nltk")
+from nltk.corpus import stopwords  # noqa: E402
+from nltk.stem import PorterStemmer, WordNetLemmatizer  # noqa: E402
+
+import text_preprocessing  # noqa: E402
+
+try:
+    stopwords.words('english')
+    nltk.word_tokenize("cannot")
+    WordNetLemmatizer().lemmatize("shoes")
+except LookupError:
+    pytest.skip("ressources NLTK (punkt, stopwords, wordnet) non téléchargées",
+                allow_module_level=True)
+
+# Extraits du catalogue Flipkart du notebook, avec contractions et ponctuation
+DESCRIPTIONS = [
+    "Key Features of Elegance Polyester Multicolor Abstract Eyelet Door Curtain "
+    "Floral Curtain,Elegance Polyester Multicolor Abstract Eyelet Door Curtain "
+    "(213 cm in Height, Pack of 2) Price: Rs. 899",
+    "Specifications of Sathiyas Cotton Bath Towel (3 Bath Towel, Red, Yellow, Blue) "
+    "Bath Towel Features Machine Washable Yes Material Cotton Design Self Design",
+    "Buy Eurospa Cotton Terry Face Towel Set only for Rs. 299 from Flipkart.com. "
+    "Only Genuine Products. 30 Day Replacement Guarantee. Free Shipping. Cash On Delivery!",
+    "You can't go wrong with these shoes: they're light, won't slip and we've "
+    "tested them for 1000+ km. Gonna love 'em, wanna buy? Cannot beat the price!!",
+    '["Home Furnishing >> Curtains & Accessories >> Curtains >> Elegance Polyester"]',
+    "SANTOSH ROYAL FASHION Cotton Printed King sized Double Bedsheet\twith 2 Pillow\nCovers",
+    "",
+    "a an the of",
+    float("nan"),
+]
+
+
+def original_preprocess_text_with_stemming(text):
+    # Fonction d'origine du notebook de veille, recopiée telle quelle
+    text = str(text).lower()
+    text = re.sub(r'[^a-z\s]', '', text)
+    tokens = nltk.word_tokenize(text)
+
+    stop_words_set = set(stopwords.words('english'))
+
+    stemmer = PorterStemmer()
+
+    processed_tokens = []
+    for word in tokens:
+        if word not in stop_words_set and len(word) > 2:
+            stemmed_word = stemmer.stem(word)
+            processed_tokens.append(stemmed_word)
+
+    return ' '.join(processed_tokens)
+
+
+def original_preprocess_text(text):
+    # Fonction d'origine du notebook de veille, recopiée telle quelle
+    text = str(text).lower()
+    text = re.sub(r'[^a-z\s]', '', text)
+    tokens = nltk.word_tokenize(text)
+    stop_words = set(stopwords.words('english'))
+    tokens = [word for word in tokens if word not in stop_words and len(word) > 2]
+    lemmatizer = WordNetLemmatizer()
+    tokens = [lemmatizer.lemmatize(word) for word in tokens]
+    return ' '.join(tokens)
+
+
+@pytest.mark.parametrize("text", DESCRIPTIONS)
+def test_same_output_as_notebook(text):
+    assert (text_preprocessing.preprocess_text_with_stemming(text)
+            == original_preprocess_text_with_stemming(text))
+    assert text_preprocessing.preprocess_text(text) == original_preprocess_text(text)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_corpus_order_is_kept(n_jobs):
+    corpus = DESCRIPTIONS * 5
+    expected = [original_preprocess_text(text) for text in corpus]
+    assert list(text_preprocessing.iter_preprocessed(corpus, "lemmatize", n_jobs=n_jobs,
+                                                     chunk_size=4)) == expected
+    assert text_preprocessing.preprocess_texts(corpus, "stem") == [
+        original_preprocess_text_with_stemming(text) for text in corpus]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        list(text_preprocessing.iter_preprocessed(["texte"], mode="tokenize"))
@@ -0,0 +1,113 @@
+"""Nettoyage NLTK des textes du notebook de veille, en parallèle et mis en cache.
+
+Mêmes sorties, caractère pour caractère, que les fonctions d'origine du
+notebook (minuscules, lettres a-z seulement, ``nltk.word_tokenize``, mots
+vides anglais et mots de moins de 3 lettres retirés, puis racinisation
+Porter ou lemmatisation WordNet). Ce qui change :
+
+* les ressources (liste des mots vides, stemmer, lemmatiseur) sont
+  construites une fois par processus et non à chaque texte ;
+* après le filtrage a-z, un texte n'est plus qu'une suite de mots séparés
+  par des espaces, que ``word_tokenize`` découpe indépendamment les uns des
+  autres (seules ses règles de contractions, internes à un mot, s'y
+  appliquent) : chaque mot distinct est donc tokenisé, filtré et racinisé
+  une seule fois, puis lu dans un cache mémoire ;
+* ``iter_preprocessed`` traite le corpus par blocs répartis sur un pool de
+  processus et rend les résultats au fil de l'eau, dans l'ordre, sans
+  charger tout le corpus : il accepte n'importe quel itérable (lecteur CSV
+  par morceaux, générateur de lignes).
+"""
+import itertools
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import nltk
+from nltk.corpus import stopwords
+from nltk.stem import PorterStemmer, WordNetLemmatizer
+
+DEFAULT_CHUNK_SIZE = 256
+MODES = ("stem", "lemmatize")
+_NON_LETTERS = re.compile(r'[^a-z\s]')
+
+_stop_words = None
+_stemmer = None
+_lemmatizer = None
+
+
+def _init_resources():
+    # Une fois par processus (et à l'initialisation de chaque processus du pool)
+    global _stop_words, _stemmer, _lemmatizer
+    if _stop_words is None:
+        _stop_words = frozenset(stopwords.words('english'))
+        _stemmer = PorterStemmer()
+        _lemmatizer = WordNetLemmatizer()
+
+
+@lru_cache(maxsize=1 << 20)
+def _process_word(word, mode):
+    # Tokens conservés d'un mot, déjà racinisés ou lemmatisés
+    _init_resources()
+    normalize = _stemmer.stem if mode == "stem" else _lemmatizer.lemmatize
+    return tuple(normalize(token) for token in nltk.word_tokenize(word)
+                 if token not in _stop_words and len(token) > 2)
+
+
+def _preprocess(text, mode):
+    text = _NON_LETTERS.sub('', str(text).lower())
+    return ' '.join(token for word in text.split() for token in _process_word(word, mode))
+
+
+def preprocess_text_with_stemming(text):
+    return _preprocess(text, "stem")
+
+
+def preprocess_text(text):
+    return _preprocess(text, "lemmatize")
+
+
+def _preprocess_chunk(texts, mode):
+    return [_preprocess(text, mode) for text in texts]
+
+
+def _chunks(texts, chunk_size):
+    iterator = iter(texts)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_preprocessed(texts, mode="lemmatize", n_jobs=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Textes nettoyés un par un, dans l'ordre de ``texts``.
+
+    ``n_jobs`` : nombre de processus (None : un par cœur ; 1 : dans le
+    processus courant). Au plus deux blocs par processus sont en cours à la
+    fois, la mémoire reste donc bornée quelle que soit la taille du corpus.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode inconnu : {mode} (choix : {', '.join(MODES)})")
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for chunk in _chunks(texts, chunk_size):
+            yield from _preprocess_chunk(chunk, mode)
+        return
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_resources) as pool:
+        pending = deque()
+        for chunk in _chunks(texts, chunk_size):
+            pending.append(pool.submit(_preprocess_chunk, chunk, mode))
+            if len(pending) >= 2 * n_jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def preprocess_texts(texts, mode="lemmatize", n_jobs=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    texts = list(texts)
+    # Petit corpus : démarrer un pool coûte plus que le traitement lui-même
+    if len(texts) <= chunk_size:
+        n_jobs = 1
+    return list(iter_preprocessed(texts, mode, n_jobs, chunk_size))
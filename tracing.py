@@ -0,0 +1,176 @@
+"""Mesure du temps passé dans les sections chaudes du dashboard.
+
+Chaque section est entourée d'un *span* (gestionnaire de contexte
+``span("nom", attribut=valeur)`` ou décorateur ``@traced("nom")``, qui peut
+reprendre des arguments de la fonction comme attributs). Les durées sont conservées
+dans un tampon circulaire par nom de span, ce qui borne la mémoire quel que
+soit le nombre de reruns, et ``Tracer.summary`` en donne les percentiles
+p50/p95/p99 pour le panneau d'administration.
+
+Si ``DASHBOARD_TRACE_FILE`` est défini, chaque span est aussi ajouté à ce
+fichier, une ligne JSON par span. Avec ``DASHBOARD_TRACE_FORMAT=otel`` chaque
+ligne est une requête d'export OTLP/JSON complète (``resourceSpans`` →
+``resource`` et ``scopeSpans`` → ``spans``, identifiants en hexadécimal,
+horodatages en nanosecondes, attributs typés), comme celles du *file
+exporter* du collecteur OpenTelemetry : chaque ligne peut être rejouée
+telle quelle vers ``/v1/traces``.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+TRACE_BUFFER_SIZE = int(os.environ.get("DASHBOARD_TRACE_BUFFER_SIZE", 1000))
+TRACE_FILE = os.environ.get("DASHBOARD_TRACE_FILE")
+TRACE_FORMAT = os.environ.get("DASHBOARD_TRACE_FORMAT", "jsonl")
+PERCENTILES = (50, 95, 99)
+SERVICE_NAME = "credit-scoring-dashboard"
+SCOPE_NAME = "tracing"
+
+# Span englobant dans le thread / la tâche courante : (trace_id, span_id)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id(n_bytes):
+    return os.urandom(n_bytes).hex()
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otel_span(record):
+    return {
+        "traceId": record["trace_id"],
+        "spanId": record["span_id"],
+        "parentSpanId": record["parent_span_id"] or "",
+        "name": record["name"],
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(record["start_ns"]),
+        "endTimeUnixNano": str(record["start_ns"] + record["duration_ns"]),
+        "attributes": [{"key": key, "value": _otel_value(value)}
+                       for key, value in record["attributes"].items()],
+        "status": {"code": 2, "message": record["error"]} if record["error"] else {"code": 1},
+    }
+
+
+def to_otel_record(record):
+    # Requête d'export OTLP/JSON d'un seul span : la ressource est portée par resourceSpans
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name",
+                                     "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [_otel_span(record)]}],
+    }]}
+
+
+class Tracer:
+
+    def __init__(self, buffer_size=TRACE_BUFFER_SIZE, export_path=TRACE_FILE,
+                 export_format=TRACE_FORMAT):
+        if export_format not in ("jsonl", "otel"):
+            raise ValueError(f"Format d'export inconnu : {export_format!r} (jsonl ou otel)")
+        self.buffer_size = buffer_size
+        self.export_path = export_path
+        self.export_format = export_format
+        self._durations = defaultdict(lambda: deque(maxlen=self.buffer_size))
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, name, start_ns, duration_ns, attributes=None, error=None,
+               trace_id=None, span_id=None, parent_span_id=None):
+        with self._lock:
+            self._durations[name].append(duration_ns / 1e6)
+            if error:
+                self._errors[name] += 1
+        if self.export_path:
+            self._export({"name": name, "trace_id": trace_id or _new_id(16),
+                          "span_id": span_id or _new_id(8), "parent_span_id": parent_span_id,
+                          "start_ns": start_ns, "duration_ns": duration_ns,
+                          "attributes": attributes or {}, "error": error,
+                          "thread": threading.current_thread().name})
+
+    def _export(self, record):
+        if self.export_format == "otel":
+            line = json.dumps(to_otel_record(record), ensure_ascii=False)
+        else:
+            line = json.dumps({**record, "duration_ms": record["duration_ns"] / 1e6},
+                              ensure_ascii=False, default=str)
+        with self._lock, open(self.export_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    @contextmanager
+    def span(self, name, **attributes):
+        parent = _current_span.get()
+        trace_id = parent[0] if parent else _new_id(16)
+        span_id = _new_id(8)
+        token = _current_span.set((trace_id, span_id))
+        start_ns = time.time_ns()
+        start = time.perf_counter_ns()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            # st.rerun / st.stop passent aussi par ici : seules les vraies erreurs sont marquées
+            if isinstance(e, Exception) and type(e).__module__.split(".")[0] != "streamlit":
+                error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start
+            _current_span.reset(token)
+            self.record(name, start_ns, duration_ns, attributes, error, trace_id=trace_id,
+                        span_id=span_id, parent_span_id=parent[1] if parent else None)
+
+    def traced(self, name=None, attributes=()):
+        # attributes : noms d'arguments de la fonction repris comme attributs du span
+        def decorator(func):
+            span_name = name or func.__qualname__
+            signature = inspect.signature(func) if attributes else None
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                span_attributes = {}
+                if signature is not None:
+                    arguments = signature.bind(*args, **kwargs).arguments
+                    span_attributes = {key: arguments[key] for key in attributes
+                                       if key in arguments}
+                with self.span(span_name, **span_attributes):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        with self._lock:
+            snapshot = {name: np.array(durations) for name, durations in self._durations.items()
+                        if durations}
+            errors = dict(self._errors)
+        rows = []
+        for name, durations in sorted(snapshot.items()):
+            p50, p95, p99 = np.percentile(durations, PERCENTILES)
+            rows.append({"span": name, "count": len(durations), "p50_ms": p50, "p95_ms": p95,
+                         "p99_ms": p99, "max_ms": durations.max(),
+                         "errors": errors.get(name, 0)})
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+
+
+# Traceur partagé par tout le processus (toutes les sessions Streamlit)
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
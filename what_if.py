@@ -0,0 +1,209 @@
+"""Simulation « et si » : probabilité de défaut du client quand une ou deux
+caractéristiques varient.
+
+Pour la caractéristique choisie, une grille de valeurs couvre la population
+(du 1er au 99e percentile, valeur du client comprise) ; les valeurs codées
+hors échelle (365243 jours d'emploi : « non employé ») sont exclues de la
+plage et scorées comme un point à part ; avec deux
+caractéristiques, la grille est le produit des deux. Toutes les variantes du
+client sont scorées d'un coup : en une seule requête si l'API expose un
+point d'entrée par lot (``API_BATCH_URL``, qui reçoit une liste de payloads
+et renvoie la liste des résultats dans le même ordre), sinon en parallèle
+sur ``/predict`` avec un nombre de requêtes simultanées borné. Les variantes
+déjà scorées sont lues dans le cache partagé des prédictions.
+"""
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import requests
+
+from api_client import API_URL, post_prediction
+from batch_scoring import DEFAULT_WORKERS, score_payload
+from derived_features import DAYS_EMPLOYED_UNEMPLOYED, UNEMPLOYED_LABEL
+from features import FEATURE_DESCRIPTIONS
+from prediction_cache import is_valid_result
+
+BATCH_API_URL = os.environ.get("API_BATCH_URL")
+DEFAULT_POINTS = 21
+DEFAULT_PAIR_POINTS = 9
+GRID_PERCENTILES = (1, 99)
+# Caractéristiques numériques du formulaire et bornes de saisie
+WHAT_IF_FEATURES = {
+    "AMT_CREDIT": (0, None), "AMT_ANNUITY": (0, None), "AMT_INCOME_TOTAL": (0, None),
+    "EXT_SOURCE_1": (0, 1), "EXT_SOURCE_2": (0, 1), "EXT_SOURCE_3": (0, 1),
+    "DAYS_BIRTH": (None, 0), "DAYS_EMPLOYED": (None, 0), "DAYS_ID_PUBLISH": (None, 0),
+    "CNT_CHILDREN": (0, None), "REGION_POPULATION_RELATIVE": (0, 1),
+    "HOUR_APPR_PROCESS_START": (0, 23),
+    "SK_ID_CURR_CNT_INSTALMENT_FUTURE_mean": (0, None),
+    "SK_ID_CURR_DAYS_CREDIT_ENDDATE_max": (None, None),
+}
+# Valeur conventionnelle (au-delà de toutes les autres) : hors de la plage balayée
+SENTINEL_VALUES = {"DAYS_EMPLOYED": DAYS_EMPLOYED_UNEMPLOYED}
+# Plage par défaut d'un client à la valeur conventionnelle, sans index de percentiles
+SENTINEL_FALLBACK_RANGES = {"DAYS_EMPLOYED": (-3650, 0)}
+INTEGER_FEATURES = {"DAYS_BIRTH", "DAYS_EMPLOYED", "DAYS_ID_PUBLISH", "CNT_CHILDREN",
+                    "HOUR_APPR_PROCESS_START"}
+
+
+def feature_grid(feature, client_value, n_points=DEFAULT_POINTS, percentile_index=None):
+    client_value = float(client_value)
+    sentinel = SENTINEL_VALUES.get(feature)
+    client_is_sentinel = sentinel is not None and client_value == sentinel
+    ranks = points = None
+    if percentile_index is not None and feature in percentile_index:
+        column = percentile_index.columns[feature]
+        ranks = (column.below + column.at_or_below) / 2 * 100
+        points = column.points
+        if sentinel is not None:
+            # Percentiles recalculés sur les seules valeurs réelles
+            keep = points < sentinel
+            ranks = ranks[keep] / column.at_or_below[keep][-1] if keep.any() else None
+            points = points[keep]
+    if ranks is not None:
+        low, high = np.interp(GRID_PERCENTILES, ranks, points)
+    elif client_is_sentinel:
+        low, high = SENTINEL_FALLBACK_RANGES[feature]
+    else:  # base pas encore chargée : ±50 % autour de la valeur du client
+        spread = abs(client_value) / 2 or 1.0
+        low, high = client_value - spread, client_value + spread
+    if not client_is_sentinel:
+        low, high = min(low, client_value), max(high, client_value)
+    lower, upper = WHAT_IF_FEATURES.get(feature, (None, None))
+    low = low if lower is None else max(low, lower)
+    high = high if upper is None else min(high, upper)
+    values = np.linspace(low, high, n_points)
+    # La valeur conventionnelle n'est pas bornée : c'est un point à part
+    values = np.append(values, [client_value] if sentinel is None else [client_value, sentinel])
+    if feature in INTEGER_FEATURES:
+        values = np.round(values)
+    # Valeurs arrondies : les mêmes grilles retombent sur les mêmes clés de cache
+    return np.unique([float(f"{v:.6g}") for v in values])
+
+
+def make_variants(client_data, grids):
+    features = list(grids)
+    combinations = list(itertools.product(*grids.values()))
+    variants = []
+    for combination in combinations:
+        variant = dict(client_data)
+        for feature, value in zip(features, combination):
+            variant[feature] = int(value) if feature in INTEGER_FEATURES else value
+        variants.append(variant)
+    return pd.DataFrame(combinations, columns=features), variants
+
+
+def _score_batch(session, batch_url, payloads):
+    response, _ = post_prediction(session, batch_url, payloads)
+    response.raise_for_status()
+    results = response.json()
+    if isinstance(results, dict):
+        results = results.get("predictions", [])
+    if len(results) != len(payloads):
+        raise ValueError(f"{len(results)} résultats reçus pour {len(payloads)} variantes")
+    # Un élément qui n'est pas un résultat valide (dict avec une probabilité) compte comme une erreur
+    return [result if is_valid_result(result) else None for result in results]
+
+
+def score_variants(variants, session, url=API_URL, cache=None, batch_url=BATCH_API_URL,
+                   max_workers=DEFAULT_WORKERS):
+    # Renvoie les résultats (None si en erreur) et le nombre de variantes lues dans le cache
+    results = [cache.get(v, namespace=url) if cache is not None else None for v in variants]
+    missing = [i for i, result in enumerate(results) if result is None]
+    n_cached = len(variants) - len(missing)
+    if missing and batch_url:
+        for i, result in zip(missing, _score_batch(session, batch_url,
+                                                   [variants[i] for i in missing])):
+            results[i] = result
+            if cache is not None and result is not None:
+                cache.set(variants[i], result, namespace=url)
+    elif missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {i: pool.submit(score_payload, session, url, variants[i], cache)
+                       for i in missing}
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                # score_payload lève ValueError pour un JSON illisible ou sans probabilité valide
+                except (requests.exceptions.RequestException, ValueError):
+                    results[i] = None
+    return results, n_cached
+
+
+def run_what_if(client_data, features, session, n_points=DEFAULT_POINTS, percentile_index=None,
+                url=API_URL, cache=None, batch_url=BATCH_API_URL, max_workers=DEFAULT_WORKERS):
+    grids = {feature: feature_grid(feature, client_data.get(feature, 0), n_points,
+                                   percentile_index)
+             for feature in features}
+    grid, variants = make_variants(client_data, grids)
+    results, n_cached = score_variants(variants, session, url=url, cache=cache,
+                                       batch_url=batch_url, max_workers=max_workers)
+    grid["probability_default"] = [np.nan if r is None else r["probability_default"]
+                                   for r in results]
+    return grid, n_cached
+
+
+def _label(feature):
+    return FEATURE_DESCRIPTIONS.get(feature, feature)
+
+
+def _is_sentinel(feature, value):
+    return feature in SENTINEL_VALUES and value == SENTINEL_VALUES[feature]
+
+
+def what_if_figure(grid, client_data, threshold, client_probability=None):
+    features = [col for col in grid.columns if col != "probability_default"]
+    # Les points « non employé » ne sont pas placés sur l'axe (à 365243 jours, ils l'écraseraient)
+    on_scale = np.ones(len(grid), dtype=bool)
+    for feature in features:
+        if feature in SENTINEL_VALUES:
+            on_scale &= grid[feature].to_numpy() != SENTINEL_VALUES[feature]
+    sentinel_rows, grid = grid[~on_scale], grid[on_scale]
+    if len(features) == 1:
+        feature = features[0]
+        fig = go.Figure(go.Scatter(
+            x=grid[feature], y=grid["probability_default"] * 100, mode="lines+markers",
+            name="Probabilité simulée", line=dict(color="darkblue"),
+            hovertemplate=f"{_label(feature)} : %{{x:.6g}}<br>Probabilité : %{{y:.2f}} %<extra></extra>"))
+        if threshold is not None:
+            fig.add_hline(y=threshold * 100, line_dash="dash", line_color="red",
+                          annotation_text=f"Seuil ({threshold:.2%})")
+        for probability in sentinel_rows["probability_default"].dropna():
+            fig.add_hline(y=probability * 100, line_dash="dot", line_color="gray",
+                          annotation_text=f"{UNEMPLOYED_LABEL} ({probability:.2%})",
+                          annotation_position="bottom left")
+        if client_probability is not None and not _is_sentinel(feature, client_data.get(feature)):
+            fig.add_trace(go.Scatter(
+                x=[client_data.get(feature)], y=[client_probability * 100], mode="markers",
+                marker=dict(color="red", size=14, symbol="star"), name="Client Actuel"))
+        fig.update_layout(xaxis_title=_label(feature), yaxis_title="Probabilité de défaut (%)",
+                          title=f"Probabilité de défaut selon « {_label(feature)} »")
+    else:
+        feature_x, feature_y = features
+        table = grid.pivot_table(index=feature_y, columns=feature_x, values="probability_default")
+        fig = go.Figure(go.Heatmap(
+            x=table.columns, y=table.index, z=table.to_numpy() * 100, colorscale="RdYlGn_r",
+            colorbar=dict(title="Proba. (%)"),
+            hovertemplate=(f"{_label(feature_x)} : %{{x:.6g}}<br>{_label(feature_y)} : %{{y:.6g}}"
+                           "<br>Probabilité : %{z:.2f} %<extra></extra>")))
+        if threshold is not None:
+            # Frontière de décision : courbe de niveau au seuil
+            fig.add_trace(go.Contour(
+                x=table.columns, y=table.index, z=table.to_numpy() * 100, showscale=False,
+                contours=dict(start=threshold * 100, end=threshold * 100, size=1, coloring="none"),
+                line=dict(color="black", width=3, dash="dash"), name=f"Seuil ({threshold:.2%})",
+                showlegend=True, hoverinfo="skip"))
+        if not any(_is_sentinel(f, client_data.get(f)) for f in features):
+            fig.add_trace(go.Scatter(
+                x=[client_data.get(feature_x)], y=[client_data.get(feature_y)], mode="markers",
+                marker=dict(color="red", size=14, symbol="star",
+                            line=dict(color="white", width=1)),
+                name="Client Actuel"))
+        fig.update_layout(xaxis_title=_label(feature_x), yaxis_title=_label(feature_y),
+                          title="Probabilité de défaut selon les deux caractéristiques",
+                          legend=dict(orientation="h", y=-0.2))
+    fig.update_layout(height=450)
+    return fig